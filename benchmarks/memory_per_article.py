@@ -0,0 +1,67 @@
+"""
+Per-article memory of in-memory run results: plain entry dicts (the old
+run_pipeline list) versus records.ResultBatch.
+
+Entries are synthetic but shaped like real ones: benchmark articles passed
+through news_fetcher's normalization, with analysis/validation payloads
+round-tripped through JSON so every label is a fresh string, as it is
+after parsing an LLM reply.
+
+Usage:
+    python -m benchmarks.memory_per_article --articles 100000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Callable, Dict, Iterator, Tuple
+
+import news_fetcher
+from benchmarks.mock_servers import _analysis, make_article
+from records import ResultBatch
+
+
+def synthetic_entries(count: int) -> Iterator[Dict]:
+    for i in range(count):
+        article = news_fetcher._normalize_article(make_article(i, count))
+        payload = json.loads(json.dumps({
+            "analysis": _analysis(str(i)),
+            "validation": {"is_valid": i % 10 != 0, "reasoning": "The sentiment matches the article's framing."},
+        }))
+        yield {
+            "article": article,
+            "analysis": payload["analysis"],
+            "validation": payload["validation"],
+            "cluster_id": i,
+            "validation_policy": json.loads('"low_confidence"'),
+            "latency_seconds": {"analysis": 0.8, "validation": 0.4},
+        }
+
+def measure(build: Callable[[Iterator[Dict]], object], count: int) -> Tuple[float, float]:
+    """
+    (retained, peak) bytes per article while building the collection.
+    """
+    gc.collect()
+    tracemalloc.start()
+    held = build(synthetic_entries(count))
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return retained / count, peak / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-article memory of in-memory results.")
+    parser.add_argument("--articles", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    rows = [("list of dicts", measure(list, args.articles)), ("ResultBatch", measure(ResultBatch, args.articles))]
+    baseline = rows[0][1][0]
+    print(f"{args.articles} articles")
+    for name, (retained, peak) in rows:
+        print(f"  {name:>14}: {retained:8.0f} B/article retained | {peak:8.0f} B/article peak | "
+              f"{retained / baseline:6.1%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Local stand-ins for NewsAPI, Gemini (REST) and OpenRouter.
+
+One ThreadingHTTPServer answers all three APIs by path, with configurable
+latency distributions, 5xx error rates and 429 throttling, so the real
+news_fetcher / llm_analyzer / llm_validator code paths can be driven
+offline and reproducibly.
+"""
+import json
+import math
+import multiprocessing
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+from urllib.parse import parse_qs, urlparse
+
+_WORDS = (
+    "government ministry parliament budget reform policy election court minister state "
+    "farmers infrastructure railway rupee inflation growth monsoon defence trade tariff "
+    "digital health education scheme village district opposition cabinet vote bill "
+    "approval protest investment energy solar highway water housing tax welfare"
+).split()
+_SENTIMENTS = ("Positive", "Negative", "Neutral")
+_BATCH_ID = re.compile(r"\[ID (\d+)\]")
+
+
+class ProviderProfile:
+    """
+    Behaviour of one stand-in API.
+
+    Args:
+        latency_ms: Median response latency (log-normal distribution).
+        sigma: Log-normal shape; larger values give heavier tails.
+        error_rate: Probability of answering 500.
+        throttle_rate: Probability of answering 429.
+        retry_after: Retry-After seconds sent with 429s.
+    """
+
+    def __init__(self, latency_ms: float = 5.0, sigma: float = 0.5, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: float = 0.05):
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+
+def make_article(index: int, total: int) -> Dict:
+    """
+    Deterministic, mutually distinct NewsAPI-shaped article (newest first).
+    """
+    rng = random.Random(index)
+    words = [rng.choice(_WORDS) for _ in range(40)]
+    published = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1_700_000_000 + (total - index) * 60))
+    return {
+        "source": {"id": None, "name": f"Source {index % 25}"},
+        "title": f"Benchmark story {index}: {' '.join(words[:6])}",
+        "description": " ".join(words[:20]),
+        "url": f"https://bench.local/article/{index}",
+        "publishedAt": published,
+        "content": f"Story {index}. " + " ".join(words) + f" [+{rng.randint(500, 5000)} chars]",
+    }
+
+
+def _analysis(seed: str) -> Dict:
+    rng = random.Random(seed)
+    return {
+        "gist": "Synthetic summary of the benchmark article.",
+        "sentiment": rng.choice(_SENTIMENTS),
+        "tone": rng.choice(("Analytical", "Urgent", "Neutral")),
+        "confidence_score": round(rng.uniform(0.5, 0.99), 2),
+    }
+
+
+def _make_handler(total_articles: int, profiles: Dict[str, ProviderProfile], seed: int):
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real providers
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, payload, headers: Dict[str, str] = None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _simulate(self, provider: str) -> bool:
+            """
+            Sleeps for a sampled latency; answers 500/429 and returns False when the dice say so.
+            """
+            profile = profiles[provider]
+            with rng_lock:
+                latency = rng.lognormvariate(math.log(max(profile.latency_ms, 0.001) / 1000), profile.sigma)
+                roll = rng.random()
+            time.sleep(latency)
+            if roll < profile.throttle_rate:
+                self._send_json(429, {"error": "rate limited"}, {"Retry-After": str(profile.retry_after)})
+                return False
+            if roll < profile.throttle_rate + profile.error_rate:
+                self._send_json(500, {"error": "internal"})
+                return False
+            return True
+
+        def _read_body(self) -> Dict:
+            length = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path != "/v2/everything":
+                self._send_json(404, {"error": "not found"})
+                return
+            if not self._simulate("newsapi"):
+                return
+            query = parse_qs(parsed.query)
+            page = int(query.get("page", ["1"])[0])
+            page_size = int(query.get("pageSize", ["20"])[0])
+            start = (page - 1) * page_size
+            articles = [make_article(i, total_articles) for i in range(start, min(start + page_size, total_articles))]
+            self._send_json(200, {"status": "ok", "totalResults": total_articles, "articles": articles})
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            if path.endswith(":generateContent"):
+                self._gemini()
+            elif path.endswith("/chat/completions"):
+                self._openrouter()
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def _gemini(self):
+            body = self._read_body()
+            if not self._simulate("gemini"):
+                return
+            prompt = " ".join(
+                part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", [])
+            )
+            system = " ".join(part.get("text", "") for part in (body.get("systemInstruction") or {}).get("parts", []))
+            ids = _BATCH_ID.findall(prompt)
+            if ids:
+                reply = json.dumps([{"id": int(i), **_analysis(i)} for i in ids])
+            else:
+                reply = json.dumps(_analysis(prompt[-200:]))
+            self._send_json(200, {
+                "candidates": [{"content": {"parts": [{"text": reply}], "role": "model"}, "finishReason": "STOP"}],
+                "usageMetadata": {
+                    "promptTokenCount": (len(system) + len(prompt)) // 4,
+                    "candidatesTokenCount": len(reply) // 4,
+                },
+            })
+
+        def _openrouter(self):
+            body = self._read_body()
+            if not self._simulate("openrouter"):
+                return
+            prompt = " ".join(message["content"] for message in body["messages"])
+            with rng_lock:
+                verdict = rng.random() > 0.1
+            content = json.dumps({"is_valid": verdict, "reasoning": "Synthetic verdict."})
+            self._send_json(200, {
+                "choices": [{"message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4},
+            })
+
+    return _Handler
+
+
+def serve(total_articles: int, profiles: Dict[str, ProviderProfile], seed: int = 0,
+          port: int = 0) -> ThreadingHTTPServer:
+    """
+    Starts the stand-in server on a daemon thread and returns it.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(total_articles, profiles, seed))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-apis", daemon=True).start()
+    return server
+
+
+def _serve_forever(total_articles, profile_dicts, seed, port_queue):
+    profiles = {name: ProviderProfile(**values) for name, values in profile_dicts.items()}
+    server = serve(total_articles, profiles, seed)
+    port_queue.put(server.server_address[1])
+    threading.Event().wait()
+
+
+def serve_in_subprocess(total_articles: int, profiles: Dict[str, ProviderProfile],
+                        seed: int = 0) -> Tuple[str, multiprocessing.Process]:
+    """
+    Runs the stand-ins in a separate process so their CPU use and memory
+    don't distort the pipeline's throughput or peak RSS.
+
+    Returns:
+        (base_url, process). Terminate the process when done.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    port_queue = ctx.Queue()
+    process = ctx.Process(
+        target=_serve_forever,
+        args=(total_articles, {name: p.to_dict() for name, p in profiles.items()}, seed, port_queue),
+        daemon=True,
+    )
+    process.start()
+    port = port_queue.get(timeout=30)
+    return f"http://127.0.0.1:{port}", process
@@ -0,0 +1,217 @@
+"""
+Offline throughput benchmark for the full pipeline.
+
+Drives main.run_and_save (real news_fetcher / llm_analyzer / llm_validator
+code, real HTTP) against the local stand-ins in benchmarks/mock_servers.py
+and reports articles/sec, stage tail latencies and peak RSS. Each scale
+runs in a fresh subprocess so peak RSS is per-scale.
+
+Results are appended to benchmarks/results/history.jsonl (one JSON object
+per run, tagged with the git commit) and compared with the previous run of
+the same scale and configuration to surface regressions.
+
+Usage:
+    python -m benchmarks.run_benchmark                       # 10, 1k and 100k articles
+    python -m benchmarks.run_benchmark --scales 10,1000 --gemini-latency-ms 20
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+RESULTS_PATH = Path(__file__).parent / "results" / "history.jsonl"
+DEFAULT_SCALES = "10,1000,100000"
+# Stage spans whose tail latencies are reported
+REPORTED_SPANS = ("stage.analyze", "stage.validate", "gemini.generate", "openrouter.chat", "newsapi.request")
+# Metrics compared against the previous run: (key, higher_is_better)
+TRACKED = (("articles_per_sec", True), ("peak_rss_mb", False))
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark against local mock APIs.")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="Comma-separated article counts.")
+    parser.add_argument("--analyze-workers", type=int, default=8)
+    parser.add_argument("--validate-workers", type=int, default=8)
+    parser.add_argument("--batch-tokens", type=int, default=0, help="ANALYZE_BATCH_TOKENS for the run.")
+    parser.add_argument("--seed", type=int, default=0)
+    for provider, latency in (("newsapi", 20.0), ("gemini", 5.0), ("openrouter", 5.0)):
+        parser.add_argument(f"--{provider}-latency-ms", type=float, default=latency)
+        parser.add_argument(f"--{provider}-sigma", type=float, default=0.5)
+        parser.add_argument(f"--{provider}-error-rate", type=float, default=0.0)
+        parser.add_argument(f"--{provider}-throttle-rate", type=float, default=0.0)
+    parser.add_argument("--no-record", action="store_true", help="Don't append to the results history.")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)  # Internal: run one scale in-process
+    return parser.parse_args(argv)
+
+
+def _profiles(args: argparse.Namespace) -> Dict:
+    from benchmarks.mock_servers import ProviderProfile
+
+    return {
+        provider: ProviderProfile(
+            latency_ms=getattr(args, f"{provider}_latency_ms"),
+            sigma=getattr(args, f"{provider}_sigma"),
+            error_rate=getattr(args, f"{provider}_error_rate"),
+            throttle_rate=getattr(args, f"{provider}_throttle_rate"),
+        )
+        for provider in ("newsapi", "gemini", "openrouter")
+    }
+
+
+def _config(args: argparse.Namespace) -> Dict:
+    return {
+        "analyze_workers": args.analyze_workers,
+        "validate_workers": args.validate_workers,
+        "batch_tokens": args.batch_tokens,
+        "seed": args.seed,
+        "providers": {name: p.to_dict() for name, p in _profiles(args).items()},
+    }
+
+
+def run_single(scale: int, args: argparse.Namespace) -> Dict:
+    """
+    Runs one scale in this process and returns its measurements.
+    """
+    from benchmarks.mock_servers import serve_in_subprocess
+
+    base_url, server = serve_in_subprocess(scale, _profiles(args), seed=args.seed)
+    workdir = Path(tempfile.mkdtemp(prefix="celltron-bench-"))
+    os.environ.update({
+        "NEWSAPI_API_KEY": "bench", "GEMINI_API_KEY": "bench", "OPENROUTER_API_KEY": "bench",
+        "NEWSAPI_BASE_URL": base_url,
+        "GEMINI_API_ENDPOINT": base_url,
+        "OPENROUTER_BASE_URL": f"{base_url}/api/v1",
+        # Provider quotas are not under test: lift them far above what the stand-ins can serve
+        "NEWSAPI_RPM": "10000000", "GEMINI_RPM": "10000000", "GEMINI_TPM": "0", "OPENROUTER_RPM": "10000000",
+    })
+
+    # Imported after the environment is set: limiters and clients read it lazily on first use
+    import main
+    import metrics
+    from dedup_index import DedupIndex
+    from llm_cache import ResultCache
+
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            stream_path = main.run_and_save(
+                "benchmark",
+                scale,
+                output_dir=workdir / "output",
+                analyze_workers=args.analyze_workers,
+                validate_workers=args.validate_workers,
+                batch_token_budget=args.batch_tokens,
+                cache=ResultCache(workdir / "cache.sqlite3", max_entries=max(scale * 2, 1000)),
+                dedup=DedupIndex(workdir / "dedup.sqlite3"),
+            )
+        wall = time.perf_counter() - start
+    finally:
+        server.terminate()
+
+    processed = 0
+    if stream_path is not None:
+        with open(stream_path, "r", encoding="utf-8") as f:
+            processed = sum(1 for _ in f)
+
+    snapshot = metrics.REGISTRY.snapshot()
+    return {
+        "scale": scale,
+        "processed": processed,
+        "wall_seconds": round(wall, 3),
+        "articles_per_sec": round(processed / wall, 2) if wall > 0 else None,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "latency_seconds": {
+            name: {q: snapshot["spans"][name][q] for q in ("p50", "p95", "p99")}
+            for name in REPORTED_SPANS if name in snapshot["spans"]
+        },
+        "counters": snapshot["counters"],
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _previous(scale: int, config: Dict) -> Optional[Dict]:
+    if not RESULTS_PATH.exists():
+        return None
+    previous = None
+    with open(RESULTS_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record["scale"] == scale and record["config"] == config:
+                previous = record
+    return previous
+
+
+def _report(record: Dict, previous: Optional[Dict]):
+    latency = record["latency_seconds"].get("stage.analyze", {})
+    print(
+        f"{record['scale']:>8} articles | {record['processed']:>8} processed | "
+        f"{record['articles_per_sec']:>9} art/s | analyze p50/p95/p99: "
+        f"{latency.get('p50')}/{latency.get('p95')}/{latency.get('p99')}s | "
+        f"peak RSS {record['peak_rss_mb']} MB"
+    )
+    if previous is None:
+        return
+    for key, higher_is_better in TRACKED:
+        old, new = previous.get(key), record.get(key)
+        if not old or new is None:
+            continue
+        change = (new - old) / old * 100
+        worse = change < 0 if higher_is_better else change > 0
+        flag = "⚠️  REGRESSION" if worse and abs(change) > 10 else ""
+        print(f"{'':>10}{key}: {old} -> {new} ({change:+.1f}% vs {previous.get('commit')}) {flag}")
+
+
+def main(argv: Optional[List[str]] = None):
+    args = _parse_args(argv)
+
+    if args.single is not None:
+        print(json.dumps(run_single(args.single, args)))
+        return
+
+    config = _config(args)
+    commit = _git_commit()
+    passthrough = list(argv if argv is not None else sys.argv[1:])
+
+    for scale in (int(s) for s in args.scales.split(",") if s.strip()):
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.run_benchmark", *passthrough, "--single", str(scale)],
+            capture_output=True, text=True, cwd=Path(__file__).parent.parent,
+        )
+        if completed.returncode != 0:
+            print(f"❌ Scale {scale} failed:\n{completed.stderr[-2000:]}")
+            continue
+
+        record = {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "config": config,
+            **json.loads(completed.stdout.strip().splitlines()[-1]),
+        }
+        _report(record, _previous(scale, config))
+
+        if not args.no_record:
+            RESULTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(RESULTS_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Cold-start import budgets for the CLI subcommands.
+
+Each subcommand's imports (cli.load) run in a fresh interpreter under
+`python -X importtime`; the top-level cumulative times are summed into the
+cold-start import cost. A command fails its budget if the best of
+--repeat runs exceeds its limit, or if it loads a heavy dependency it does
+not use (e.g. fetch pulling in google.generativeai, or pyarrow without the
+results archive). `run` imports the whole
+pipeline, as main.py does, and is the baseline the others are compared to.
+
+Usage:
+    python -m benchmarks.startup_budget
+    python -m benchmarks.startup_budget --commands fetch,report --repeat 10
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+# Best-of-N cold-start import time per subcommand (milliseconds)
+DEFAULT_BUDGETS_MS = {"fetch": 120, "report": 80, "validate": 200, "analyze": 800, "run": 1000}
+# Heavy optional dependencies a subcommand must never import (pyarrow is
+# only loaded once the results archive is enabled)
+FORBIDDEN_MODULES = {
+    "fetch": ("google.generativeai", "pydantic", "pyarrow"),
+    "report": ("google.generativeai", "pydantic", "pyarrow"),
+    "validate": ("google.generativeai", "pyarrow"),
+    "analyze": ("pyarrow",),
+    "run": ("pyarrow",),
+}
+HEAVY_MODULES = ("google.generativeai", "pydantic", "pyarrow")
+BASELINE_COMMAND = "run"
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check CLI subcommand import times against budgets.")
+    parser.add_argument("--commands", default=",".join(DEFAULT_BUDGETS_MS), help="Comma-separated subcommands.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per command; the best counts.")
+    return parser.parse_args(argv)
+
+
+def _parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """
+    (total ms, {top-level module: cumulative ms}) from -X importtime output.
+    """
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit() or name.startswith("  "):
+            continue  # Header line, or a nested import already counted in its parent
+        top_level[name.strip()] = int(cumulative) / 1000
+    return sum(top_level.values()), top_level
+
+def measure(command: str) -> Tuple[float, Dict[str, float], List[str]]:
+    """
+    Imports one subcommand's modules in a fresh interpreter.
+
+    Returns:
+        (total import ms, per top-level module ms, HEAVY_MODULES loaded).
+    """
+    probe = (
+        "import json, sys, cli; cli.load(%r); "
+        "print(json.dumps([m for m in %r if m in sys.modules]))" % (command, HEAVY_MODULES)
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    total, modules = _parse_importtime(completed.stderr)
+    return total, modules, json.loads(completed.stdout.strip().splitlines()[-1])
+
+def check(command: str, repeat: int) -> Dict:
+    runs = [measure(command) for _ in range(max(1, repeat))]
+    total, modules, loaded = min(runs, key=lambda run: run[0])
+    forbidden = [m for m in FORBIDDEN_MODULES.get(command, ()) if m in loaded]
+    budget = DEFAULT_BUDGETS_MS.get(command)
+    heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:3]
+    return {
+        "command": command,
+        "import_ms": round(total, 1),
+        "budget_ms": budget,
+        "forbidden_loaded": forbidden,
+        "heaviest": [(name, round(ms, 1)) for name, ms in heaviest],
+        "ok": not forbidden and (budget is None or total <= budget),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    results = [check(command, args.repeat) for command in args.commands.split(",")]
+    baseline = next((r["import_ms"] for r in results if r["command"] == BASELINE_COMMAND), None)
+
+    for r in results:
+        share = f" | {r['import_ms'] / baseline:5.1%} of {BASELINE_COMMAND}" if baseline else ""
+        flag = "✅" if r["ok"] else "❌"
+        print(f"{flag} {r['command']:>8}: {r['import_ms']:7.1f} ms (budget {r['budget_ms']} ms){share}")
+        print(f"{'':>12}heaviest: {', '.join(f'{name} {ms} ms' for name, ms in r['heaviest'])}")
+        if r["forbidden_loaded"]:
+            print(f"{'':>12}loads dependencies it never uses: {', '.join(r['forbidden_loaded'])}")
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
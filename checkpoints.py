@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+# --- Configuration ---
+DEFAULT_CHECKPOINT_PATH = Path("output") / "checkpoints.json"
+
+
+def _newest(articles: Iterable[Dict]) -> Optional[Dict]:
+    dated = [a for a in articles if a and a.get("published_at")]
+    if not dated:
+        return None
+    newest = max(dated, key=lambda a: a["published_at"])
+    return {"published_at": newest["published_at"], "url": newest.get("url")}
+
+def compute_high_water_mark(
+    succeeded: Iterable[Dict],
+    failed: Iterable[Dict],
+    previous: Optional[Dict] = None,
+    exhausted: bool = True,
+    oldest: Optional[str] = None,
+) -> Optional[Dict]:
+    """
+    Picks the checkpoint a run may safely advance to.
+
+    Normally this is the newest successfully processed article. If any
+    article failed, the mark stops at the oldest failure (without a URL) so
+    the next run fetches it again; newer successes are re-seen but are cheap
+    thanks to the dedup index and result cache.
+
+    NewsAPI returns the newest articles first, so a fetch that stopped
+    before running out (limit, error, page cap) skipped everything between
+    the previous mark and the oldest article it fetched. The mark then keeps
+    its lower bound and records the gap as `until` (walked next run with
+    NewsAPI's `to`) plus the `newest` article processed so far, which the
+    mark advances to once a fetch runs out. Without a lower bound (a first
+    run) there is no gap to walk: the topic's history before its first run
+    is never backfilled, so the mark advances as if the fetch had run out.
+
+    Args:
+        succeeded: Articles processed successfully.
+        failed: Articles that failed and must be fetched again.
+        previous: The topic's current mark, if any.
+        exhausted: Whether the fetch ran out of results (see news_fetcher.FetchCoverage).
+        oldest: Oldest published_at the fetch returned.
+
+    Returns:
+        {"published_at", "url"[, "until", "newest"]}, or None to keep the current mark.
+    """
+    failed_times = [a["published_at"] for a in failed if a.get("published_at")]
+    newest = _newest([*succeeded, (previous or {}).get("newest")])
+
+    if exhausted or not (previous or {}).get("published_at"):
+        if failed_times:
+            return {"published_at": min(failed_times), "url": None}
+        return newest
+
+    # Stopped early: keep the lower bound and walk back through the gap next time
+    gap_end = failed_times or ([oldest] if oldest else [])
+    if not gap_end:
+        return None
+    mark = {
+        "published_at": (previous or {}).get("published_at"),
+        "url": (previous or {}).get("url"),
+        "until": max(gap_end),
+    }
+    if newest:
+        mark["newest"] = newest
+    return mark
+
+
+class CheckpointStore:
+    """
+    Per-topic high-water marks (last published_at and URL processed).
+
+    Marks are staged during a run and only written by commit(), which the
+    caller invokes once the run's results are durably saved. Writes are
+    atomic (temp file + rename) so a crash never leaves a torn file.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CHECKPOINT_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._staged: Dict[str, Dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._marks: Dict[str, Dict] = json.load(f)
+        except FileNotFoundError:
+            self._marks = {}
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Unreadable checkpoint file ({e}). Starting without checkpoints.")
+            self._marks = {}
+
+    def get(self, topic: str) -> Optional[Dict]:
+        """
+        Returns the committed mark for a topic, or None on its first run.
+        """
+        with self._lock:
+            mark = self._marks.get(topic)
+            return dict(mark) if mark else None
+
+    def stage(self, topic: str, mark: Optional[Dict]):
+        """
+        Holds a new mark in memory until commit(). Never moves a topic backwards.
+        """
+        if not mark:
+            return
+        with self._lock:
+            current = self._marks.get(topic)
+            if current and current.get("published_at") and (mark["published_at"] or "") < current["published_at"]:
+                return
+            self._staged[topic] = mark
+
+    def commit(self, topic: Optional[str] = None):
+        """
+        Persists staged marks (one topic, or all of them).
+        """
+        with self._lock:
+            topics = [topic] if topic is not None else list(self._staged)
+            changed = False
+            for t in topics:
+                if t in self._staged:
+                    self._marks[t] = self._staged.pop(t)
+                    changed = True
+            if not changed:
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._marks, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,197 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional
+
+import config
+import metrics
+
+# --- Configuration ---
+# The breaker opens when, over the last WINDOW_SECONDS, at least MIN_CALLS
+# calls were made and ERROR_RATE of them failed. It then rejects calls for
+# OPEN_SECONDS before letting HALF_OPEN_PROBES trial calls through.
+# Override with BREAKER_<SETTING>, e.g. BREAKER_OPEN_SECONDS=60.
+DEFAULT_WINDOW_SECONDS = 30.0
+DEFAULT_MIN_CALLS = 5
+DEFAULT_ERROR_RATE = 0.5
+DEFAULT_OPEN_SECONDS = 30.0
+DEFAULT_HALF_OPEN_PROBES = 1
+
+# --- States ---
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a provider whose breaker is open. Nothing was sent.
+    """
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} circuit open; retry in {retry_after:.1f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Thread-safe closed/open/half-open breaker for one provider.
+
+    Closed: calls go through and their outcomes fill a sliding time window.
+    Open: calls fail fast with CircuitOpenError until the cool-down ends.
+    Half-open: a few probe calls go through; one success closes the
+    breaker, one failure re-opens it for another cool-down.
+
+    Only outages count as failures (timeouts, 5xx, connection errors);
+    throttling and bad output mean the provider is up.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        min_calls: int = DEFAULT_MIN_CALLS,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        open_seconds: float = DEFAULT_OPEN_SECONDS,
+        half_open_probes: int = DEFAULT_HALF_OPEN_PROBES,
+    ):
+        self.provider = provider
+        self.window_seconds = window_seconds
+        self.min_calls = max(1, min_calls)
+        self.error_rate = error_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self._outcomes = deque()  # (monotonic time, failed)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self._state
+
+    def retry_after(self) -> float:
+        """
+        Seconds until an open breaker lets probes through (0 unless open).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            return max(0.0, self._opened_at + self.open_seconds - now) if self._state == OPEN else 0.0
+
+    def allow(self):
+        """
+        Admits one call or raises CircuitOpenError. Every admitted call must
+        be followed by record_success() or record_failure().
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            if self._state == OPEN or (self._state == HALF_OPEN and self._probes >= self.half_open_probes):
+                retry_after = max(0.0, self._opened_at + self.open_seconds - now)
+                metrics.incr(f"{self.provider}.circuit_rejected")
+                raise CircuitOpenError(self.provider, retry_after)
+            if self._state == HALF_OPEN:
+                self._probes += 1
+
+    def record_success(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED, time.monotonic())
+            self._add(time.monotonic(), failed=False)
+
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                self._transition(OPEN, now)
+                return
+            if self._state == OPEN:
+                return  # A straggler admitted before the breaker opened
+            self._add(now, failed=True)
+            failures = sum(failed for _, failed in self._outcomes)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.error_rate:
+                self._transition(OPEN, now)
+
+    @contextmanager
+    def guard(self, is_outage: Callable[[BaseException], bool]):
+        """
+        Admits the wrapped call (or raises CircuitOpenError) and records its
+        outcome: an exception counts as a failure only if is_outage(exc).
+        """
+        self.allow()
+        try:
+            yield
+        except BaseException as e:
+            if is_outage(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        self.record_success()
+
+    # --- Internals (caller holds the lock) ---
+
+    def _add(self, now: float, failed: bool):
+        self._outcomes.append((now, failed))
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+
+    def _refresh(self, now: float):
+        if self._state == OPEN and now >= self._opened_at + self.open_seconds:
+            self._transition(HALF_OPEN, now)
+
+    def _transition(self, state: str, now: float):
+        self._state = state
+        self._probes = 0
+        if state == OPEN:
+            self._opened_at = now
+        # A fresh window on every change, so old failures cannot re-trip a recovered provider
+        self._outcomes.clear()
+        metrics.incr(f"{self.provider}.circuit_{state}")
+        print(f"⚡ {self.provider} circuit {state.replace('_', '-')}")
+
+
+# --- Module Globals ---
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """
+    Returns the process-wide breaker for a provider, creating it on first use.
+    """
+    with _BREAKERS_LOCK:
+        if provider not in _BREAKERS:
+            _BREAKERS[provider] = CircuitBreaker(
+                provider,
+                window_seconds=config.env_float("BREAKER_WINDOW_SECONDS", DEFAULT_WINDOW_SECONDS),
+                min_calls=config.env_int("BREAKER_MIN_CALLS", DEFAULT_MIN_CALLS),
+                error_rate=config.env_float("BREAKER_ERROR_RATE", DEFAULT_ERROR_RATE),
+                open_seconds=config.env_float("BREAKER_OPEN_SECONDS", DEFAULT_OPEN_SECONDS),
+                half_open_probes=config.env_int("BREAKER_HALF_OPEN_PROBES", DEFAULT_HALF_OPEN_PROBES),
+            )
+        return _BREAKERS[provider]
+
+def reset_breakers():
+    """
+    Drops all breakers so the next get_breaker() starts closed and re-reads configuration.
+    """
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+def wait_until_allowed(providers: Iterable[str], max_wait: Optional[float] = None) -> float:
+    """
+    Sleeps until every listed provider's breaker would admit a probe (or
+    for max_wait seconds at most). Returns the seconds slept.
+    """
+    delay = max((get_breaker(p).retry_after() for p in providers), default=0.0)
+    if max_wait is not None:
+        delay = min(delay, max_wait)
+    if delay > 0:
+        time.sleep(delay)
+    return delay
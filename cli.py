@@ -0,0 +1,208 @@
+"""
+Command-line entry point with one subcommand per pipeline stage.
+
+    python cli.py fetch --topic '"Indian Government"' --limit 12   # NewsAPI -> output/articles.jsonl
+    python cli.py analyze                                          # Gemini  -> output/analyzed.jsonl
+    python cli.py validate                                         # Mistral -> output/validated.jsonl
+    python cli.py report output/validated.jsonl                    # JSON/Markdown views (+ rolling reports)
+    python cli.py run [--resume RUN_ID]                            # full pipeline, as main.py
+
+Stage modules are imported only by the subcommands that use them (see
+COMMAND_MODULES), so `fetch` and `report` never pay for the Gemini SDK
+or pydantic. benchmarks/startup_budget.py holds each subcommand to an
+import-time budget.
+"""
+import argparse
+import importlib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+import config
+from circuit_breaker import CircuitOpenError
+
+# --- Configuration ---
+DEFAULT_TOPIC = '"Indian Government"'
+DEFAULT_LIMIT = 12
+DEFAULT_OUTPUT_DIR = Path("output")
+ARTICLES_FILE = "articles.jsonl"
+ANALYZED_FILE = "analyzed.jsonl"
+VALIDATED_FILE = "validated.jsonl"
+
+# Modules each subcommand imports on demand, in order. Nothing here is
+# imported at CLI startup; keep provider SDKs out of commands that don't call them.
+COMMAND_MODULES: Dict[str, Tuple[str, ...]] = {
+    "fetch": ("news_fetcher", "result_sink"),
+    "analyze": ("llm_analyzer", "llm_cache", "result_sink"),
+    "validate": ("llm_validator", "llm_cache", "result_sink"),
+    "report": ("result_sink", "report_engine"),
+    "run": ("main",),
+}
+
+
+def load(command: str) -> Tuple[ModuleType, ...]:
+    """
+    Imports and returns the modules a subcommand needs.
+    """
+    return tuple(importlib.import_module(name) for name in COMMAND_MODULES[command])
+
+def _timed(fn: Callable, *args, **kwargs) -> Tuple[object, float]:
+    start = time.perf_counter()
+    return fn(*args, **kwargs), time.perf_counter() - start
+
+def _fresh_sink(result_sink: ModuleType, path: Path):
+    # Sinks append; a subcommand rewrites its output from scratch
+    path.unlink(missing_ok=True)
+    return result_sink.JsonlSink.from_env(path)
+
+
+# --- Subcommands ---
+
+def cmd_fetch(args: argparse.Namespace) -> int:
+    news_fetcher, result_sink = load("fetch")
+    output = args.output or args.output_dir / ARTICLES_FILE
+    with _fresh_sink(result_sink, output) as sink:
+        for article in news_fetcher.stream_articles(args.topic, args.limit):
+            sink.write(article)
+    print(f"💾 {sink.count} articles saved to: {output}")
+    return 0 if sink.count else 1
+
+def cmd_analyze(args: argparse.Namespace) -> int:
+    llm_analyzer, llm_cache, result_sink = load("analyze")
+    source = args.input or args.output_dir / ARTICLES_FILE
+    output = args.output or args.output_dir / ANALYZED_FILE
+    articles = list(result_sink.iter_entries(source))
+    cache = llm_cache.ResultCache.from_env()
+
+    def analyze(article: Dict):
+        try:
+            return _timed(llm_analyzer.analyze_article, article["text"], cache=cache)
+        except CircuitOpenError as e:
+            print(f"⚡ {e}")
+            return None, 0.0
+
+    workers = config.env_int("ANALYZE_WORKERS", config.DEFAULT_ANALYZE_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool, _fresh_sink(result_sink, output) as sink:
+        for article, (analysis, seconds) in zip(articles, pool.map(analyze, articles)):
+            if analysis is None:
+                print(f"❌ Analysis failed: {article['title'][:50]}...")
+                continue
+            sink.write({
+                "article": article,
+                "analysis": analysis.model_dump(),
+                "validation": None,
+                "cluster_id": None,
+                "validation_policy": None,
+                "latency_seconds": {"analysis": seconds, "validation": None},
+            })
+    print(f"💾 {sink.count}/{len(articles)} analyses saved to: {output}")
+    return 0 if sink.count else 1
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    llm_validator, llm_cache, result_sink = load("validate")
+    source = args.input or args.output_dir / ANALYZED_FILE
+    output = args.output or args.output_dir / VALIDATED_FILE
+    entries = list(result_sink.iter_entries(source))
+    cache = llm_cache.ResultCache.from_env()
+
+    def validate(entry: Dict):
+        try:
+            return _timed(llm_validator.validate_analysis, entry["article"]["text"], entry["analysis"], cache=cache)
+        except CircuitOpenError as e:
+            print(f"⚡ {e}")
+            return None, None
+
+    workers = config.env_int("VALIDATE_WORKERS", config.DEFAULT_VALIDATE_WORKERS)
+    validated = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool, _fresh_sink(result_sink, output) as sink:
+        for entry, (validation, seconds) in zip(entries, pool.map(validate, entries)):
+            if validation is not None:
+                validated += 1
+            else:
+                print(f"❓ Validation skipped (Timeout/Error): {entry['article']['title'][:50]}...")
+            latency = entry.get("latency_seconds") or {}
+            sink.write({
+                **entry,
+                "validation": validation.model_dump() if validation is not None else None,
+                "latency_seconds": {"analysis": latency.get("analysis"), "validation": seconds},
+            })
+    print(f"💾 {validated}/{sink.count} validations saved to: {output}")
+    return 0
+
+def cmd_report(args: argparse.Namespace) -> int:
+    result_sink, report_engine = load("report")
+    saved = result_sink.render_views(args.stream, args.output_dir)
+    if args.rolling:
+        reports = report_engine.ReportEngine.from_env()
+        print(f"📚 Added {reports.add(result_sink.iter_entries(args.stream))} articles to: {reports.index_path}")
+    return 0 if saved else 1
+
+def cmd_run(args: argparse.Namespace) -> int:
+    pipeline, = load("run")
+
+    # Optional Prometheus scrape endpoint for the lifetime of the run
+    metrics_port = config.env_int("METRICS_PORT", 0)
+    if metrics_port:
+        pipeline.metrics.REGISTRY.serve(metrics_port)
+        print(f"📈 Prometheus metrics at http://127.0.0.1:{metrics_port}/metrics")
+
+    stream_path = pipeline.run_and_save(
+        args.topic,
+        limit=args.limit,
+        output_dir=args.output_dir,
+        checkpoints=pipeline.CheckpointStore(),
+        run_id=args.resume,
+        archive=pipeline.archive_from_env(),
+        reports=pipeline.ReportEngine.from_env() if config.env_int("REPORTS_INCREMENTAL", 1) else None,
+        **pipeline.pipeline_options_from_env(),
+    )
+    return 0 if stream_path is not None else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Celltron News Analysis Pipeline")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="Fetch articles from NewsAPI into a JSONL file.")
+    fetch.add_argument("--topic", default=DEFAULT_TOPIC)
+    fetch.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    fetch.add_argument("--output", type=Path, help=f"Default: <output-dir>/{ARTICLES_FILE}.")
+    fetch.set_defaults(handler=cmd_fetch)
+
+    analyze = commands.add_parser("analyze", help="Analyze fetched articles with Gemini.")
+    analyze.add_argument("--input", type=Path, help=f"Default: <output-dir>/{ARTICLES_FILE}.")
+    analyze.add_argument("--output", type=Path, help=f"Default: <output-dir>/{ANALYZED_FILE}.")
+    analyze.set_defaults(handler=cmd_analyze)
+
+    validate = commands.add_parser("validate", help="Validate analyses with Mistral via OpenRouter.")
+    validate.add_argument("--input", type=Path, help=f"Default: <output-dir>/{ANALYZED_FILE}.")
+    validate.add_argument("--output", type=Path, help=f"Default: <output-dir>/{VALIDATED_FILE}.")
+    validate.set_defaults(handler=cmd_validate)
+
+    report = commands.add_parser("report", help="Render JSON/Markdown views from a results stream.")
+    report.add_argument("stream", type=Path, help="Results JSONL (a run stream or validated.jsonl).")
+    report.add_argument("--rolling", action="store_true", help="Also fold the entries into the rolling per-day reports.")
+    report.set_defaults(handler=cmd_report)
+
+    run = commands.add_parser("run", help="Run the full pipeline, streaming results to disk.")
+    run.add_argument("--topic", default=DEFAULT_TOPIC)
+    run.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    run.add_argument("--resume", metavar="RUN_ID", help="Resume an interrupted run from its ledger.")
+    run.set_defaults(handler=cmd_run)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    # Load environment variables
+    load_dotenv()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
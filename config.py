@@ -0,0 +1,33 @@
+import os
+
+# --- Pipeline Defaults ---
+DEFAULT_ANALYZE_WORKERS = 4
+DEFAULT_VALIDATE_WORKERS = 4
+# Passes over articles parked by an open circuit breaker before they count as failed,
+# and the longest a pass waits for a breaker to half-open (seconds).
+DEFAULT_RETRY_PASSES = 3
+DEFAULT_PARK_MAX_WAIT = 120.0
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    Reads an integer setting from the environment.
+
+    Falls back to the default when the variable is unset or malformed,
+    so a typo in .env degrades to safe defaults instead of crashing a run.
+    """
+    raw = os.getenv(name)
+    try:
+        return int(raw) if raw is not None else default
+    except (TypeError, ValueError):
+        return default
+
+def env_float(name: str, default: float) -> float:
+    """
+    Reads a float setting from the environment, with the same fallback rules as env_int.
+    """
+    raw = os.getenv(name)
+    try:
+        return float(raw) if raw is not None else default
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,273 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+import config
+import http_client
+import metrics
+
+# --- Configuration ---
+DEFAULT_BODY_CACHE_PATH = Path("output") / "cache" / "article_bodies.sqlite3"
+DEFAULT_WORKERS = 8
+# Concurrent requests to any one publisher; also the per-host connection pool size.
+DEFAULT_PER_HOST = 2
+# Cached bodies younger than this are reused without any request; older ones
+# are revalidated with If-None-Match / If-Modified-Since.
+DEFAULT_MAX_AGE_SECONDS = 24 * 3600
+REQUEST_TIMEOUT = 10
+# Extracted text is capped so one long feature cannot blow up LLM token spend.
+MAX_TEXT_CHARS = 8000
+USER_AGENT = "CelltronNewsAnalyzer/1.0 (+https://github.com/ramdevmurali/celltron-news-analyzer)"
+
+# Containers whose text is never article body
+_SKIPPED_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "iframe"}
+_BLOCK_TAGS = {"p", "h1", "h2", "h3", "li", "blockquote"}
+# Paragraphs shorter than this are usually captions, bylines or share links.
+_MIN_PARAGRAPH_CHARS = 40
+
+
+class _BodyParser(HTMLParser):
+    """
+    Collects paragraph text, separately for inside and outside <article>.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skip_depth = 0
+        self.article_depth = 0
+        # Open block tags, innermost last; end tags are often omitted
+        self.blocks: List[str] = []
+        self.current: List[str] = []
+        self.article_paragraphs: List[str] = []
+        self.page_paragraphs: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif tag == "article":
+            self.article_depth += 1
+        elif tag in _BLOCK_TAGS:
+            if self.blocks:
+                # The text so far is a paragraph of its own, whether or not
+                # the open block was closed
+                self._flush()
+                if self.blocks[-1] == "p" or (tag == "li" and self.blocks[-1] == "li"):
+                    self.blocks.pop()  # Implicit </p> / </li>
+            self.blocks.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == "article":
+            # Blocks left open inside the article end with it
+            self._flush()
+            self.blocks.clear()
+            self.article_depth = max(0, self.article_depth - 1)
+        elif tag in _BLOCK_TAGS and tag in self.blocks:
+            self._flush()
+            # Also closes any unclosed blocks nested inside it
+            del self.blocks[len(self.blocks) - 1 - self.blocks[::-1].index(tag):]
+
+    def handle_data(self, data):
+        if self.blocks and not self.skip_depth:
+            self.current.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def _flush(self):
+        paragraph = " ".join("".join(self.current).split())
+        self.current = []
+        if len(paragraph) < _MIN_PARAGRAPH_CHARS:
+            return
+        self.page_paragraphs.append(paragraph)
+        if self.article_depth:
+            self.article_paragraphs.append(paragraph)
+
+
+def extract_text(html: str) -> str:
+    """
+    Main text of an article page: its <article> paragraphs when the page
+    marks one up, otherwise every substantial paragraph outside nav,
+    header, footer, scripts and forms.
+    """
+    parser = _BodyParser()
+    parser.feed(html)
+    parser.close()
+    paragraphs = parser.article_paragraphs or parser.page_paragraphs
+    return "\n\n".join(paragraphs)[:MAX_TEXT_CHARS]
+
+
+class BodyCache:
+    """
+    SQLite cache of extracted article text keyed by URL, with the validators
+    (ETag / Last-Modified) needed to revalidate it cheaply.
+    """
+
+    def __init__(self, path: Path = DEFAULT_BODY_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bodies (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, etag, last_modified, fetched_at FROM bodies WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"text": row[0], "etag": row[1], "last_modified": row[2], "fetched_at": row[3]}
+
+    def put(self, url: str, text: str, etag: Optional[str], last_modified: Optional[str]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO bodies (url, text, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, text, etag, last_modified, time.time()),
+            )
+            self._conn.commit()
+
+    def touch(self, url: str):
+        # A 304 confirms the cached body is current: restart its freshness window
+        with self._lock:
+            self._conn.execute("UPDATE bodies SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Enricher:
+    """
+    Replaces NewsAPI's ~200-char snippets with the full article text.
+
+    Bodies are downloaded on a bounded thread pool with at most `per_host`
+    concurrent requests per publisher, extracted with html.parser, and
+    cached by URL. Any failure keeps the original snippet.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[BodyCache] = None,
+        workers: int = DEFAULT_WORKERS,
+        per_host: int = DEFAULT_PER_HOST,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.max_age_seconds = max_age_seconds
+        self._session = http_client.create_retry_session(pool_maxsize=self.per_host)
+        self._session.headers["User-Agent"] = USER_AGENT
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "Enricher":
+        """
+        Builds an enricher using ENRICH_WORKERS / ENRICH_PER_HOST / ENRICH_MAX_AGE_SECONDS overrides.
+        """
+        return cls(
+            cache=BodyCache(),
+            workers=config.env_int("ENRICH_WORKERS", DEFAULT_WORKERS),
+            per_host=config.env_int("ENRICH_PER_HOST", DEFAULT_PER_HOST),
+            max_age_seconds=config.env_int("ENRICH_MAX_AGE_SECONDS", DEFAULT_MAX_AGE_SECONDS),
+        )
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    def fetch_body(self, url: str) -> Optional[str]:
+        """
+        Extracted text for one URL, from the cache when fresh or confirmed
+        unchanged (304), else downloaded. None if nothing usable was found.
+        """
+        cached = self.cache.get(url) if self.cache is not None else None
+        if cached is not None and time.time() - cached["fetched_at"] < self.max_age_seconds:
+            metrics.incr("enrich.cache_hits")
+            return cached["text"]
+
+        # Conditional request: an unchanged page costs a 304 and no extraction
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            with self._host_limit(url), metrics.span("enrich.fetch"):
+                response = self._session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            if response.status_code == 304 and cached is not None:
+                metrics.incr("enrich.revalidated")
+                self.cache.touch(url)
+                return cached["text"]
+            response.raise_for_status()
+            if "html" not in response.headers.get("Content-Type", "text/html"):
+                return None
+            text = extract_text(response.text)
+        except requests.exceptions.RequestException as e:
+            metrics.incr("enrich.errors")
+            print(f"   Enrichment Error ({url}): {e}")
+            # A stale body still beats the snippet
+            return cached["text"] if cached is not None else None
+
+        if self.cache is not None and text:
+            self.cache.put(url, text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return text or None
+
+    def _enrich(self, article: Dict) -> Dict:
+        url = article.get("url")
+        if not url:
+            return article
+        body = self.fetch_body(url)
+        # Only swap in bodies that actually add text over the snippet
+        if not body or len(body) <= len(article["text"]):
+            return article
+        metrics.incr("enrich.enriched")
+        return {**article, "text": body, "snippet": article["text"]}
+
+    def enrich(self, articles: List[Dict]) -> List[Dict]:
+        return list(self.stream(articles))
+
+    def stream(self, articles: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Enriches a stream of articles concurrently, yielding them in input
+        order with at most a few per worker fetched ahead.
+        """
+        window: Deque = deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="enrich") as pool:
+            for article in articles:
+                window.append(pool.submit(self._enrich, article))
+                # Hand on finished heads right away; block only when the window is full
+                while window and (window[0].done() or len(window) >= 2 * self.workers):
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
@@ -0,0 +1,54 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# Statuses retried by urllib3. 429 is deliberately absent: rate_limiter owns
+# throttling so every caller backs off together, not just the one that got it.
+RETRY_STATUSES = [500, 502, 503, 504]
+
+
+def create_retry_session(
+    allowed_methods=("HEAD", "GET", "OPTIONS"),
+    pool_maxsize: int = 10,
+    backoff_factor: float = 1,
+    retry_reads: bool = True,
+) -> requests.Session:
+    """
+    Creates a requests Session with automatic retry logic for resilience.
+    
+    Configuration:
+    - Retries: 3 times
+    - Backoff: 1s, 2s, 4s (exponential, scaled by `backoff_factor`)
+    - Triggers: 5xx server errors (not 4xx client errors), and read errors
+      unless `retry_reads` is False. Non-idempotent calls (POST) should not
+      retry reads: a read timeout would be re-sent up to 3 times, and it would
+      surface as a ConnectionError instead of a Timeout
+    - Pool: Up to `pool_maxsize` kept-alive connections per host; extra
+      threads wait for a free connection instead of opening new ones
+    """
+    session = requests.Session()
+    
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=list(allowed_methods),
+        # False (not 0): the read error is raised as-is, so requests reports a Timeout
+        read=None if retry_reads else False,
+    )
+    
+    adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=pool_maxsize, pool_block=True)
+    
+    # Mount handler for both HTTP and HTTPS
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    return session
+
+def retry_count(response) -> int:
+    """
+    Number of automatic urllib3 retries behind a response (0 if unknown).
+    """
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    history = getattr(retries, "history", None)
+    return len(history) if isinstance(history, tuple) else 0
@@ -1,9 +1,45 @@
 import os
+import re
 import json
-from typing import Optional, Literal
+import asyncio
+import datetime
+import threading
+import time
+from typing import Dict, List, Optional, Literal
 import google.generativeai as genai
+from google.generativeai import caching
+from google.api_core import exceptions as google_exceptions
 from pydantic import BaseModel, Field, ValidationError
+
+import circuit_breaker
+import config
+import metrics
+import prompts
+import rate_limiter
+from circuit_breaker import CircuitOpenError
+from llm_cache import ResultCache, make_key
+
 DEFAULT_MODEL_NAME = "gemini-2.5-flash"
+# Texts shorter than this are skipped without a call (garbage or truncated snippets).
+MIN_TEXT_CHARS = 50
+
+# Bump the template versions in prompts.py whenever the prompts change, so
+# cached analyses are not reused across prompts (batch and single share keys).
+PROMPT_VERSION = prompts.ANALYSIS.version
+
+# Server-side context caching of the instruction prefix (opt-in, PROMPT_CONTEXT_CACHE=1).
+DEFAULT_CONTEXT_CACHE_TTL = 3600  # Seconds; override with PROMPT_CONTEXT_CACHE_TTL
+
+# --- Batching ---
+# Estimated tokens (article input + JSON output) allowed in one batched request.
+DEFAULT_BATCH_TOKEN_BUDGET = 6000
+MAX_BATCH_SIZE = 20
+# Rough size of one NewsAnalysis object in the reply, plus its ID/delimiters.
+_OUTPUT_TOKENS_PER_ARTICLE = 90
+
+# --- Streaming ---
+# A streamed single-article reply longer than this is runaway output, not a NewsAnalysis.
+MAX_STREAMED_CHARS = 4000
 
 
 # --- Pydantic Model (Unchanged) ---
@@ -14,64 +50,157 @@ class NewsAnalysis(BaseModel):
     confidence_score: float = Field(ge=0.0, le=1.0, description="Confidence level (0.0-1.0).")
 
 # --- Module Globals ---
-_MODEL = None
+# One model per prompt template, each carrying that template's system instruction
+_MODELS: Dict[str, object] = {}
+# Templates whose instruction prefix lives in a server-side context cache
+_PREFIX_CACHED = set()
+# Guards both: concurrent first calls must not create duplicate models or context caches
+_MODELS_LOCK = threading.Lock()
 
-def _get_model():
+def _get_model(template: prompts.PromptTemplate = prompts.ANALYSIS):
     """
-    Lazy initialization of the Gemini model.
-    Ensures configuration happens only once.
+    Lazy initialization of the Gemini model for a prompt template.
+    Ensures configuration happens only once, even under concurrent first
+    calls (each context cache is created exactly once).
     """
-    global _MODEL
-    if _MODEL is None:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY missing from environment.")
+    with _MODELS_LOCK:
+        if template.name not in _MODELS:
+            api_key = os.getenv("GEMINI_API_KEY")
+            if not api_key:
+                raise ValueError("GEMINI_API_KEY missing from environment.")
         
-        genai.configure(api_key=api_key)
+            if not _MODELS:
+                # Optional endpoint override (e.g. the local benchmark stand-ins);
+                # the REST transport is required for non-Google hosts
+                endpoint = os.getenv("GEMINI_API_ENDPOINT")
+                if endpoint:
+                    genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+                else:
+                    genai.configure(api_key=api_key)
         
-        # Soft-code: Allow env var override, default to flash
-        model_name = os.getenv("GEMINI_MODEL", DEFAULT_MODEL_NAME)
-        _MODEL = genai.GenerativeModel(model_name)
+            model = _cached_prefix_model(template) if os.getenv("PROMPT_CONTEXT_CACHE") == "1" else None
+            if model is None:
+                model = genai.GenerativeModel(get_model_name(), system_instruction=template.system)
+            _MODELS[template.name] = model
         
-    return _MODEL
+        return _MODELS[template.name]
+
+def _cached_prefix_model(template: prompts.PromptTemplate):
+    """
+    Model bound to a Gemini context cache holding the template's instructions.
+    Returns None when the cache cannot be created (e.g. the prefix is below
+    the model's minimum cacheable size); callers then send it inline.
+    Called by _get_model with _MODELS_LOCK held.
+    """
+    ttl = config.env_int("PROMPT_CONTEXT_CACHE_TTL", DEFAULT_CONTEXT_CACHE_TTL)
+    try:
+        cached = caching.CachedContent.create(
+            model=f"models/{get_model_name()}",
+            display_name=f"celltron-{template.name}-{template.version}",
+            system_instruction=template.system,
+            ttl=datetime.timedelta(seconds=ttl),
+        )
+    except Exception as e:
+        print(f"Context cache unavailable for '{template.name}' prompt, sending it inline: {e}")
+        return None
+    _PREFIX_CACHED.add(template.name)
+    return genai.GenerativeModel.from_cached_content(cached)
+
+def _render(template: prompts.PromptTemplate, **fields) -> prompts.Prompt:
+    return template.render(prefix_cached=template.name in _PREFIX_CACHED, **fields)
 
-def analyze_article(text: str) -> Optional[NewsAnalysis]:
+def _is_outage(error: BaseException) -> bool:
+    """
+    Errors that say Gemini is down (counted by its circuit breaker), as
+    opposed to throttling, bad requests or blocked content.
+    """
+    return isinstance(error, (google_exceptions.ServerError, google_exceptions.DeadlineExceeded, OSError))
+
+def _generate(model, prompt: prompts.Prompt):
+    """
+    Calls Gemini under the shared rate limiter and circuit breaker. The
+    model already carries the system prefix, so only the per-call content
+    is sent. Re-attempted only on 429 quota errors; every other error
+    propagates, including CircuitOpenError while Gemini's breaker is open.
+    """
+    limiter = rate_limiter.get_limiter("gemini")
+    breaker = circuit_breaker.get_breaker("gemini")
+    for attempt in range(rate_limiter.MAX_THROTTLE_RETRIES + 1):
+        try:
+            with breaker.guard(_is_outage):
+                limiter.acquire(tokens=prompt.tokens())
+                with metrics.span("gemini.generate"):
+                    response = model.generate_content(prompt.user)
+            limiter.report_ok()
+            _record_usage(response)
+            return response
+        except google_exceptions.ResourceExhausted:
+            metrics.incr("gemini.throttled")
+            limiter.report_throttled()
+            if attempt == rate_limiter.MAX_THROTTLE_RETRIES:
+                raise
+            metrics.incr("gemini.retries")
+        except google_exceptions.DeadlineExceeded:
+            metrics.incr("gemini.timeouts")
+            raise
+
+def _record_usage(response):
+    """
+    Records prompt/completion token counts reported in Gemini's usage metadata.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        metrics.record_tokens(
+            "gemini",
+            getattr(usage, "prompt_token_count", None),
+            getattr(usage, "candidates_token_count", None),
+            getattr(usage, "cached_content_token_count", None),
+        )
+
+def get_model_name() -> str:
+    """
+    Soft-code: Allow env var override, default to flash.
+    """
+    return os.getenv("GEMINI_MODEL", DEFAULT_MODEL_NAME)
+
+def analyze_article(text: str, cache: Optional[ResultCache] = None) -> Optional[NewsAnalysis]:
     """
     Analyzes article text using Gemini Pro.
     
     Args:
         text: Valid article text.
+        cache: Optional result cache; a hit skips the Gemini call entirely.
         
     Returns:
         NewsAnalysis object or None on failure/skipped.
+
+    Raises:
+        CircuitOpenError: Gemini's circuit breaker is open; nothing was sent.
     """
     # 1. Input Validation (Edge Case: Garbage/Short Text)
-    if not text or len(text) < 50:
+    if not text or len(text) < MIN_TEXT_CHARS:
         print(f"Skipping Analysis: Text too short ({len(text) if text else 0} chars).")
         return None
 
+    # Cache Lookup: keyed by text, model and prompt version
+    cache_key = None
+    if cache is not None:
+        cache_key = make_key(text, get_model_name(), PROMPT_VERSION)
+        cached = cache.get("analysis", cache_key)
+        if cached is not None:
+            try:
+                return NewsAnalysis.model_validate(cached)
+            except ValidationError:
+                pass  # Schema drifted since caching; fall through and re-analyze
+
     try:
         # 2. Get Model (Lazy Load)
-        model = _get_model()
-        
-        prompt = f"""
-        You are a strictly logical news analyst.
+        model = _get_model(prompts.ANALYSIS)
         
-        Output Requirements:
-        1. Return ONLY a valid JSON object.
-        2. Do not use Markdown formatting (no ```json blocks).
-        3. Strict Schema:
-           - "gist": (str) 1-2 sentence summary.
-           - "sentiment": (str) Exactly "Positive", "Negative", or "Neutral".
-           - "tone": (str) e.g., "Urgent", "Analytical", "Satirical".
-           - "confidence_score": (float) 0.0 to 1.0.
-
-        Article Text:
-        {text}
-        """
+        prompt = _render(prompts.ANALYSIS, text=text)
 
         # 3. Call API
-        response = model.generate_content(prompt)
+        response = _generate(model, prompt)
         
         # 4. Handle Safety Blocks
         try:
@@ -83,11 +212,331 @@ def analyze_article(text: str) -> Optional[NewsAnalysis]:
         # 5. Clean & Parse
         clean_json = raw_output.strip().replace("```json", "").replace("```", "")
         analysis = NewsAnalysis.model_validate_json(clean_json)
+
+        if cache is not None:
+            cache.put("analysis", cache_key, analysis.model_dump())
         return analysis
 
     except (json.JSONDecodeError, ValidationError) as e:
         print(f"Parsing Error: {e}")
         return None
+    except CircuitOpenError:
+        raise  # Nothing was attempted; the caller decides whether to retry later
+    except Exception as e:
+        print(f"Gemini API Error: {e}")
+        return None
+
+# --- Async Streaming ---
+
+class StreamRejected(ValueError):
+    """
+    Raised as soon as a streamed reply can no longer become a valid NewsAnalysis.
+    """
+
+_SENTIMENT_FIELD = re.compile(r'"sentiment"\s*:\s*"([^"]*)"')
+_CONFIDENCE_FIELD = re.compile(r'"confidence_score"\s*:\s*(-?[0-9.eE+-]+)\s*[,}]')
+
+class _JsonStreamGuard:
+    """
+    Incremental check of a streamed JSON object reply.
+
+    Tracks brace depth (outside strings) to know the moment the object is
+    complete, and rejects the stream early on a non-JSON preamble, an
+    invalid sentiment label, an out-of-range confidence or runaway length.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._scanned = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.complete = False
+
+    def feed(self, chunk: str):
+        self.buffer += chunk
+        if len(self.buffer) > MAX_STREAMED_CHARS:
+            raise StreamRejected(f"Reply exceeded {MAX_STREAMED_CHARS} chars without a complete object.")
+
+        if not self._started:
+            head = self.buffer.lstrip()
+            # Tolerate a Markdown fence despite the prompt, but nothing else before the object
+            if head.startswith("```"):
+                if "\n" not in head:
+                    return
+                head = head.split("\n", 1)[1].lstrip()
+            if not head:
+                return
+            if not head.startswith("{"):
+                raise StreamRejected(f"Reply does not start with a JSON object: {head[:40]!r}")
+            self._started = True
+            self._scanned = len(self.buffer) - len(head)
+
+        for index in range(self._scanned, len(self.buffer)):
+            char = self.buffer[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.complete = True
+                    self.buffer = self.buffer[:index + 1]
+                    break
+        self._scanned = len(self.buffer)
+
+        sentiment = _SENTIMENT_FIELD.search(self.buffer)
+        if sentiment and sentiment.group(1) not in ("Positive", "Negative", "Neutral"):
+            raise StreamRejected(f"Invalid sentiment label: {sentiment.group(1)!r}")
+        confidence = _CONFIDENCE_FIELD.search(self.buffer)
+        if confidence:
+            try:
+                value = float(confidence.group(1))
+            except ValueError:
+                raise StreamRejected(f"Invalid confidence_score: {confidence.group(1)!r}")
+            if not 0.0 <= value <= 1.0:
+                raise StreamRejected(f"confidence_score out of range: {value}")
+
+    def json(self) -> str:
+        head = self.buffer.lstrip()
+        if head.startswith("```"):
+            head = head.split("\n", 1)[1]
+        return head.strip()
+
+async def _generate_streamed(model, prompt: prompts.Prompt) -> str:
+    """
+    Streams a Gemini reply under the shared rate limiter, returning the JSON
+    object text as soon as it is complete. Throttling is re-attempted like
+    _generate; a rejected stream is abandoned without waiting for the rest.
+    """
+    limiter = rate_limiter.get_limiter("gemini")
+    breaker = circuit_breaker.get_breaker("gemini")
+    for attempt in range(rate_limiter.MAX_THROTTLE_RETRIES + 1):
+        guard = _JsonStreamGuard()
+        last_chunk = None
+        try:
+            with breaker.guard(_is_outage):
+                # acquire() sleeps; keep the event loop free while it waits
+                await asyncio.to_thread(limiter.acquire, prompt.tokens())
+                with metrics.span("gemini.generate"):
+                    start = time.perf_counter()
+                    response = await model.generate_content_async(prompt.user, stream=True)
+                    async for chunk in response:
+                        if last_chunk is None:
+                            metrics.observe("gemini.first_chunk", time.perf_counter() - start)
+                        last_chunk = chunk
+                        try:
+                            text = chunk.text
+                        except ValueError:
+                            raise StreamRejected("Content blocked by Gemini Safety Filters.")
+                        guard.feed(text)
+                        if guard.complete:
+                            break
+            limiter.report_ok()
+        except google_exceptions.ResourceExhausted:
+            metrics.incr("gemini.throttled")
+            limiter.report_throttled()
+            if attempt == rate_limiter.MAX_THROTTLE_RETRIES:
+                raise
+            metrics.incr("gemini.retries")
+            continue
+        except google_exceptions.DeadlineExceeded:
+            metrics.incr("gemini.timeouts")
+            raise
+        except StreamRejected:
+            metrics.incr("gemini.stream_rejected")
+            raise
+
+        if last_chunk is not None:
+            _record_usage(last_chunk)
+        if not guard.complete:
+            raise StreamRejected("Stream ended before the JSON object was complete.")
+        return guard.json()
+
+async def analyze_article_async(text: str, cache: Optional[ResultCache] = None) -> Optional[NewsAnalysis]:
+    """
+    Async, streaming counterpart of analyze_article.
+
+    The reply is checked chunk by chunk: parsing finishes the moment the
+    JSON object closes, and a malformed or safety-blocked reply is given up
+    on as soon as it is detected instead of after the full completion.
+
+    Args:
+        text: Valid article text.
+        cache: Optional result cache (shared keys with analyze_article).
+
+    Returns:
+        NewsAnalysis object or None on failure/skipped.
+
+    Raises:
+        CircuitOpenError: Gemini's circuit breaker is open; nothing was sent.
+    """
+    # 1. Input Validation (Edge Case: Garbage/Short Text)
+    if not text or len(text) < MIN_TEXT_CHARS:
+        print(f"Skipping Analysis: Text too short ({len(text) if text else 0} chars).")
+        return None
+
+    cache_key = None
+    if cache is not None:
+        cache_key = make_key(text, get_model_name(), PROMPT_VERSION)
+        cached = cache.get("analysis", cache_key)
+        if cached is not None:
+            try:
+                return NewsAnalysis.model_validate(cached)
+            except ValidationError:
+                pass  # Schema drifted since caching; fall through and re-analyze
+
+    try:
+        raw_json = await _generate_streamed(_get_model(prompts.ANALYSIS), _render(prompts.ANALYSIS, text=text))
+        analysis = NewsAnalysis.model_validate_json(raw_json)
+    except StreamRejected as e:
+        print(f"Analysis Failed: {e}")
+        return None
+    except (json.JSONDecodeError, ValidationError) as e:
+        print(f"Parsing Error: {e}")
+        return None
+    except CircuitOpenError:
+        raise  # Nothing was attempted; the caller decides whether to retry later
     except Exception as e:
         print(f"Gemini API Error: {e}")
-        return None
\ No newline at end of file
+        return None
+
+    if cache is not None:
+        cache.put("analysis", cache_key, analysis.model_dump())
+    return analysis
+
+def plan_batches(
+    texts: List[str],
+    token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+    max_batch_size: int = MAX_BATCH_SIZE,
+) -> List[List[int]]:
+    """
+    Greedily groups text indices so each batch stays within `token_budget`.
+
+    Short NewsAPI snippets pack many to a request; long bodies get smaller
+    batches. A single text larger than the budget still gets its own batch.
+
+    Returns:
+        Lists of indices into `texts`, in input order.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for i, text in enumerate(texts):
+        cost = rate_limiter.estimate_tokens(text) + _OUTPUT_TOKENS_PER_ARTICLE
+        if current and (current_tokens + cost > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+def _parse_batch_reply(raw_output: str, expected_ids: List[int]) -> Dict[int, NewsAnalysis]:
+    """
+    Validates each element of a batched reply independently.
+    Elements with unknown IDs or invalid fields are dropped, not fatal.
+    """
+    clean_json = raw_output.strip().replace("```json", "").replace("```", "")
+    items = json.loads(clean_json)
+    if not isinstance(items, list):
+        raise ValueError("Batch reply is not a JSON array.")
+
+    parsed: Dict[int, NewsAnalysis] = {}
+    for item in items:
+        if not isinstance(item, dict) or item.get("id") not in expected_ids:
+            continue
+        try:
+            parsed[item["id"]] = NewsAnalysis.model_validate(item)
+        except ValidationError as e:
+            print(f"Parsing Error (batch item {item['id']}): {e}")
+    return parsed
+
+def analyze_batch(
+    texts: List[str],
+    cache: Optional[ResultCache] = None,
+    token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+) -> List[Optional[NewsAnalysis]]:
+    """
+    Analyzes many articles with one Gemini request per token-budgeted batch.
+
+    Articles are tagged with numeric IDs and the model returns a JSON array of
+    NewsAnalysis objects. Anything missing from the reply, or failing schema
+    validation, is retried individually via analyze_article().
+
+    Args:
+        texts: Article texts.
+        cache: Optional result cache, consulted per article before batching.
+        token_budget: Estimated tokens allowed per batched request.
+
+    Returns:
+        One NewsAnalysis (or None on failure/skipped) per input text, in order.
+
+    Raises:
+        CircuitOpenError: Gemini's circuit breaker opened; the batch's results are abandoned.
+    """
+    results: List[Optional[NewsAnalysis]] = [None] * len(texts)
+    pending: List[int] = []
+
+    # 1. Serve cache hits; short texts go through analyze_article's guard clause
+    for i, text in enumerate(texts):
+        if not text or len(text) < MIN_TEXT_CHARS:
+            results[i] = analyze_article(text, cache=cache)
+            continue
+        if cache is not None:
+            cached = cache.get("analysis", make_key(text, get_model_name(), PROMPT_VERSION))
+            if cached is not None:
+                try:
+                    results[i] = NewsAnalysis.model_validate(cached)
+                    continue
+                except ValidationError:
+                    pass
+        pending.append(i)
+
+    # 2. One request per batch of cache misses
+    pending_texts = [texts[i] for i in pending]
+    for batch in plan_batches(pending_texts, token_budget):
+        indices = [pending[j] for j in batch]
+
+        # A batch of one gains nothing from the array format
+        if len(indices) == 1:
+            results[indices[0]] = analyze_article(texts[indices[0]], cache=cache)
+            continue
+
+        articles_block = "\n\n".join(f"[ID {i}]\n{texts[i]}" for i in indices)
+        prompt = _render(prompts.BATCH_ANALYSIS, articles=articles_block)
+
+        parsed: Dict[int, NewsAnalysis] = {}
+        try:
+            response = _generate(_get_model(prompts.BATCH_ANALYSIS), prompt)
+            parsed = _parse_batch_reply(response.text, indices)
+        except ValueError as e:
+            # Covers safety blocks (response.text), bad JSON and non-array replies
+            print(f"Batch Analysis Failed ({len(indices)} articles): {e}")
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            print(f"Gemini API Error (batch of {len(indices)}): {e}")
+
+        # 3. Keep valid elements; retry the rest one by one
+        for i in indices:
+            if i in parsed:
+                results[i] = parsed[i]
+                if cache is not None:
+                    cache.put("analysis", make_key(texts[i], get_model_name(), PROMPT_VERSION), parsed[i].model_dump())
+            else:
+                results[i] = analyze_article(texts[i], cache=cache)
+
+    return results
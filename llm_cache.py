@@ -0,0 +1,170 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import config
+
+# --- Configuration ---
+DEFAULT_CACHE_PATH = Path("output") / "cache" / "llm_cache.sqlite3"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+def make_key(*parts: str) -> str:
+    """
+    Content-addressed cache key: SHA-256 over the given parts.
+
+    Callers pass the article text, the model name and the prompt version
+    (plus any other prompt input), so changing any of them is a clean miss.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")  # Unit separator: ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent SQLite cache for validated LLM payloads.
+
+    Entries are grouped by namespace ("analysis", "validation"), expire after
+    `ttl_seconds`, and the least recently used rows are evicted once the cache
+    holds more than `max_entries`. Safe to share across pipeline threads.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+        self._conn.commit()
+        # Row count seeded once at open and tracked on every insert/delete, so
+        # put() never scans the table to decide whether to evict.
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        """
+        Builds a cache using LLM_CACHE_TTL_SECONDS / LLM_CACHE_MAX_ENTRIES overrides.
+        """
+        return cls(
+            ttl_seconds=config.env_int("LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+            max_entries=config.env_int("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+        )
+
+    def get(self, namespace: str, key: str) -> Optional[Dict]:
+        """
+        Returns the cached payload, or None on a miss or an expired entry.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+                self._conn.commit()
+                self.evictions += 1
+                self._rows -= 1
+                row = None
+
+            if row is None:
+                self.misses[namespace] = self.misses.get(namespace, 0) + 1
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key),
+            )
+            self._conn.commit()
+            self.hits[namespace] = self.hits.get(namespace, 0) + 1
+
+        return json.loads(row[0])
+
+    def put(self, namespace: str, key: str, payload: Dict):
+        """
+        Stores a payload and evicts least recently used entries beyond `max_entries`.
+        """
+        now = time.time()
+        with self._lock:
+            text = json.dumps(payload, ensure_ascii=False)
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO entries (namespace, key, payload, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, text, now, now),
+            ).rowcount
+            if inserted:
+                self._rows += 1
+            else:
+                self._conn.execute(
+                    "UPDATE entries SET payload = ?, created_at = ?, accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (text, now, now, namespace, key),
+                )
+
+            excess = self._rows - self.max_entries
+            if excess > 0:
+                removed = self._conn.execute(
+                    "DELETE FROM entries WHERE rowid IN (SELECT rowid FROM entries ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                ).rowcount
+                self.evictions += removed
+                self._rows -= removed
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """
+        Deletes every expired entry. Returns the number of rows removed.
+        """
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM entries WHERE created_at < ?", (cutoff,)).rowcount
+            self._conn.commit()
+            self.evictions += removed
+            self._rows -= removed
+        return removed
+
+    def stats(self) -> Dict:
+        """
+        Hit/miss counters per namespace for this process, plus evictions.
+        """
+        with self._lock:
+            return {
+                "hits": dict(self.hits),
+                "misses": dict(self.misses),
+                "evictions": self.evictions,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
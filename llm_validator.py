@@ -1,11 +1,43 @@
 import os
 import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import requests
 from pydantic import ValidationError, BaseModel, Field
 
+import circuit_breaker
+import config
+import http_client
+import metrics
+import prompts
+import rate_limiter
+from llm_cache import ResultCache, make_key
+
 # --- Configuration ---
 DEFAULT_MODEL_NAME = "mistralai/mistral-7b-instruct"
 
+# Bump the template version in prompts.py whenever the prompt changes, so
+# cached verdicts are not reused across prompts.
+PROMPT_VERSION = prompts.VALIDATION.version
+
+# Soft-code: OPENROUTER_BASE_URL points the validator elsewhere (e.g. benchmark stand-ins)
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Kept-alive connections to openrouter.ai shared by all validation threads.
+DEFAULT_POOL_SIZE = 10
+
+# Per-request timeout (seconds) for a single OpenRouter call.
+REQUEST_TIMEOUT = 10
+
+# Hedging (opt-in, VALIDATOR_HEDGE=1): if a call has not answered by the
+# observed p95 of openrouter.chat, a duplicate is fired (to
+# VALIDATOR_FALLBACK_MODEL if set) and the first answer wins.
+HEDGE_QUANTILE = 0.95
+HEDGE_MIN_SAMPLES = 20       # Below this, the p95 is too noisy; use the fixed delay
+DEFAULT_HEDGE_DELAY = 3.0    # Seconds; override with VALIDATOR_HEDGE_DELAY
+HEDGE_REFRESH_EVERY = 50     # New openrouter.chat samples before the p95 is recomputed
+
 class ValidationResult(BaseModel):
     """
     Structured output for the validation step.
@@ -18,17 +50,200 @@ class ValidationResult(BaseModel):
         description="Concise explanation citing specific quotes or logic from the text to support the validation verdict."
     )
 
-def validate_analysis(original_text: str, analysis: dict) -> ValidationResult | None:
+# --- Module Globals ---
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+_HEDGE_POOL = None
+# Cached hedge p95 and the openrouter.chat count it was computed at
+_HEDGE_P95 = None
+_HEDGE_P95_COUNT = 0
+_HEDGE_LOCK = threading.Lock()
+
+def _get_session() -> requests.Session:
+    """
+    Lazy initialization of the shared OpenRouter session.
+
+    One pooled keep-alive session for every validation call, so concurrent
+    validations reuse TCP+TLS connections instead of handshaking each time,
+    with the same 5xx retry/backoff policy as the fetcher (POST included).
+    Read timeouts are not retried, so a stalled call fails as a Timeout
+    after REQUEST_TIMEOUT.
+    Pool size: VALIDATOR_POOL_SIZE.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = http_client.create_retry_session(
+                allowed_methods=("POST",),
+                pool_maxsize=max(1, config.env_int("VALIDATOR_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                retry_reads=False,
+            )
+    return _SESSION
+
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    """
+    Lazy initialization of the threads that carry hedged calls.
+    Sized for a primary plus a hedge on every pooled connection.
+    """
+    global _HEDGE_POOL
+    with _SESSION_LOCK:
+        if _HEDGE_POOL is None:
+            size = max(1, config.env_int("VALIDATOR_POOL_SIZE", DEFAULT_POOL_SIZE))
+            _HEDGE_POOL = ThreadPoolExecutor(max_workers=2 * size, thread_name_prefix="validate-hedge")
+    return _HEDGE_POOL
+
+def hedge_delay() -> float:
+    """
+    Seconds to wait on a call before hedging it: the observed p95 of
+    openrouter.chat once enough calls have been timed, else the fixed delay.
+    Always leaves room for the hedge to finish within REQUEST_TIMEOUT.
+
+    The p95 is cached and recomputed every HEDGE_REFRESH_EVERY new samples
+    (or after the metrics were reset), not sorted on every call.
+    """
+    global _HEDGE_P95, _HEDGE_P95_COUNT
+    delay = config.env_float("VALIDATOR_HEDGE_DELAY", DEFAULT_HEDGE_DELAY)
+    count = metrics.REGISTRY.span_count("openrouter.chat")
+    if count >= HEDGE_MIN_SAMPLES:
+        with _HEDGE_LOCK:
+            if _HEDGE_P95 is None or not _HEDGE_P95_COUNT <= count < _HEDGE_P95_COUNT + HEDGE_REFRESH_EVERY:
+                _HEDGE_P95 = metrics.REGISTRY.percentile("openrouter.chat", HEDGE_QUANTILE)
+                _HEDGE_P95_COUNT = count
+            delay = _HEDGE_P95
+    return min(delay, REQUEST_TIMEOUT / 2)
+
+def _is_outage(error: BaseException) -> bool:
+    """
+    Errors that say OpenRouter is down (counted by its circuit breaker):
+    timeouts, connection failures and 5xx answers that outlived the retries.
+    The pooled session retries 5xx itself, so exhausted retries surface as
+    RetryError rather than an HTTPError.
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    return isinstance(
+        error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError, requests.exceptions.RetryError)
+    )
+
+def _request_validation(url: str, headers: dict, payload: dict, prompt: prompts.Prompt) -> ValidationResult:
+    """
+    One OpenRouter round trip (with 429 re-attempts), parsed into a ValidationResult.
+    Raises on timeout, HTTP errors and unparseable replies, and
+    CircuitOpenError (without sending) while OpenRouter's breaker is open.
+    """
+    # Shared OpenRouter budget; re-attempted only when throttled (429)
+    limiter = rate_limiter.get_limiter("openrouter")
+    breaker = circuit_breaker.get_breaker("openrouter")
+    for attempt in range(rate_limiter.MAX_THROTTLE_RETRIES + 1):
+        with breaker.guard(_is_outage):
+            limiter.acquire(tokens=prompt.tokens())
+
+            # Timeout=10s is strict but necessary for a secondary step
+            start = time.perf_counter()
+            try:
+                response = _get_session().post(url, headers=headers, json=payload, timeout=REQUEST_TIMEOUT)
+            except BaseException:
+                metrics.observe("openrouter.chat", time.perf_counter() - start, error=True)
+                raise
+            # Throttled round trips are not call latency; kept out of the hedge p95
+            if response.status_code != 429:
+                metrics.observe("openrouter.chat", time.perf_counter() - start)
+            metrics.incr("openrouter.retries", http_client.retry_count(response))
+            if response.status_code >= 500:
+                response.raise_for_status()
+        if response.status_code != 429:
+            limiter.report_ok()
+            break
+        metrics.incr("openrouter.throttled")
+        limiter.report_throttled(rate_limiter.parse_retry_after(response.headers.get("Retry-After")))
+
+    response.raise_for_status()
+
+    # Parse OpenRouter response structure
+    result_json = response.json()
+    usage = result_json.get("usage") or {}
+    metrics.record_tokens(
+        "openrouter",
+        usage.get("prompt_tokens"),
+        usage.get("completion_tokens"),
+        (usage.get("prompt_tokens_details") or {}).get("cached_tokens"),
+    )
+    content = result_json['choices'][0]['message']['content']
+
+    # Cleaning: Remove markdown backticks or conversational filler
+    clean_content = content.strip()
+    if clean_content.startswith("```json"):
+        clean_content = clean_content[7:]
+    if clean_content.endswith("```"):
+        clean_content = clean_content[:-3]
+
+    # Validation: Enforce schema
+    return ValidationResult.model_validate_json(clean_content.strip())
+
+def _hedged_request(url: str, headers: dict, payload: dict, prompt: prompts.Prompt) -> ValidationResult:
+    """
+    Runs the call, firing one duplicate if it outlives hedge_delay().
+
+    The first successful answer wins; if one attempt fails the other is
+    still awaited, and only when both fail is the primary's error raised.
+    A loser that has not started is cancelled; one already in flight is
+    left to finish and its answer discarded (requests cannot abort a send).
+    """
+    pool = _get_hedge_pool()
+    primary = pool.submit(_request_validation, url, headers, payload, prompt)
+    done, _ = wait([primary], timeout=hedge_delay())
+    if done:
+        return primary.result()
+
+    fallback_model = os.getenv("VALIDATOR_FALLBACK_MODEL")
+    hedge_payload = {**payload, "model": fallback_model} if fallback_model else payload
+    metrics.incr("openrouter.hedged")
+    hedge = pool.submit(_request_validation, url, headers, hedge_payload, prompt)
+
+    pending = {primary, hedge}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    metrics.incr("openrouter.hedge_wins")
+                for loser in pending:
+                    loser.cancel()
+                return future.result()
+    return primary.result()  # Both failed: surface the primary's error
+
+def validate_analysis(
+    original_text: str, analysis: dict, cache: ResultCache | None = None, model: str | None = None
+) -> ValidationResult | None:
     """
     Validates the analysis using a secondary LLM (Mistral via OpenRouter).
     
     Args:
         original_text: The raw article text.
         analysis: The dictionary output from Gemini (gist, sentiment, etc.).
+        cache: Optional result cache; a hit skips the OpenRouter call entirely.
+        model: Optional OpenRouter model overriding VALIDATOR_MODEL (e.g. for escalation).
         
     Returns:
         ValidationResult object or None if validation fails/times out.
+
+    Raises:
+        CircuitOpenError: OpenRouter's circuit breaker is open; nothing was sent.
     """
+    # Soft-code: Allow env var override
+    model_name = model or os.getenv("VALIDATOR_MODEL", DEFAULT_MODEL_NAME)
+
+    # Cache Lookup: the verdict depends on both the text and the analysis under review
+    cache_key = None
+    if cache is not None:
+        cache_key = make_key(original_text, json.dumps(analysis, sort_keys=True), model_name, PROMPT_VERSION)
+        cached = cache.get("validation", cache_key)
+        if cached is not None:
+            try:
+                return ValidationResult.model_validate(cached)
+            except ValidationError:
+                pass  # Schema drifted since caching; fall through and re-validate
+
     api_key = os.getenv("OPENROUTER_API_KEY")
     if not api_key:
         print("Warning: OPENROUTER_API_KEY missing. Skipping validation.")
@@ -38,7 +253,7 @@ def validate_analysis(original_text: str, analysis: dict) -> ValidationResult |
     # Mistral-7B is capable, but 1000 chars is enough to verify sentiment.
     truncated_text = original_text[:1000] + "..." if len(original_text) > 1000 else original_text
 
-    url = "https://openrouter.ai/api/v1/chat/completions"
+    url = os.getenv("OPENROUTER_BASE_URL", DEFAULT_BASE_URL).rstrip("/") + "/chat/completions"
     
     # --- PRO UPDATE: Identity Headers ---
     headers = {
@@ -48,53 +263,31 @@ def validate_analysis(original_text: str, analysis: dict) -> ValidationResult |
         "Content-Type": "application/json"
     }
 
-    # Soft-code: Allow env var override
-    model_name = os.getenv("VALIDATOR_MODEL", DEFAULT_MODEL_NAME)
-
-    prompt = f"""
-    Task: Validate if the following analysis accurately reflects the article text.
-    
-    Article Text (Truncated):
-    "{truncated_text}"
-    
-    Analysis to Check:
-    {json.dumps(analysis, indent=2)}
-    
-    Output Instructions:
-    1. Respond ONLY with valid JSON.
-    2. Format: {{"is_valid": boolean, "reasoning": "string"}}
-    3. Check for hallucinations or wrong sentiment labels.
-    """
+    # Static instructions first, as the system message, so providers that
+    # cache repeated prompt prefixes can reuse them across calls
+    prompt = prompts.VALIDATION.render(text=truncated_text, analysis=analysis)
 
     payload = {
         "model": model_name,
         "messages": [
-            {"role": "user", "content": prompt}
+            {"role": "system", "content": prompt.system},
+            {"role": "user", "content": prompt.user}
         ],
         "temperature": 0.1 # Low temp for strict logic
     }
 
     try:
-        # Timeout=10s is strict but necessary for a secondary step
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
-        response.raise_for_status()
-        
-        # Parse OpenRouter response structure
-        result_json = response.json()
-        content = result_json['choices'][0]['message']['content']
-        
-        # Cleaning: Remove markdown backticks or conversational filler
-        clean_content = content.strip()
-        if clean_content.startswith("```json"):
-            clean_content = clean_content[7:]
-        if clean_content.endswith("```"):
-            clean_content = clean_content[:-3]
-            
-        # Validation: Enforce schema
-        validation = ValidationResult.model_validate_json(clean_content.strip())
+        if os.getenv("VALIDATOR_HEDGE") == "1":
+            validation = _hedged_request(url, headers, payload, prompt)
+        else:
+            validation = _request_validation(url, headers, payload, prompt)
+
+        if cache is not None:
+            cache.put("validation", cache_key, validation.model_dump())
         return validation
 
     except requests.exceptions.Timeout:
+        metrics.incr("openrouter.timeouts")
         print("Validation Skipped: OpenRouter API timed out.")
         return None
     except (requests.exceptions.RequestException, json.JSONDecodeError, ValidationError, KeyError) as e:
@@ -1,180 +1,724 @@
+import argparse
 import time
-from typing import List, Dict
-import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Dict, Optional, Tuple
 import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Internal Modules
+import circuit_breaker
+import config
+import metrics
 import news_fetcher
 import llm_analyzer
 import llm_validator
+from circuit_breaker import CircuitOpenError
+from llm_cache import ResultCache
+from dedup_index import DedupIndex
+from checkpoints import CheckpointStore, compute_high_water_mark
+from result_sink import JsonlSink, iter_entries, render_views
+from run_ledger import RunLedger, article_key, ANALYZED, VALIDATED
+from triage import Triager, DROP, ACCEPT
+from enricher import Enricher
+from report_engine import ReportEngine
+from records import ResultBatch
+from validation_policy import ValidationPolicy, SKIP
 
-def run_pipeline(topic: str, limit: int) -> List[Dict]:
+if TYPE_CHECKING:
+    from results_archive import ResultArchive
+
+def _validate(
+    text: str,
+    analysis: Dict,
+    cache: Optional[ResultCache] = None,
+    policy: Optional[ValidationPolicy] = None,
+    decision: Optional[str] = None,
+) -> Tuple[Any, float]:
     """
-    Orchestrates the News Analysis Pipeline: Fetch -> Analyze -> Validate.
-    
-    Args:
-        topic: The search topic for NewsAPI.
-        limit: Max number of articles to process.
-        
+    Validation task run on the Mistral pool.
+
+    Under a policy with an escalation model, a flagged verdict is re-checked
+    by that model and its verdict kept; the outcome is reported to the policy.
+
     Returns:
-        List of dictionaries containing raw data, analysis, and validation results.
+        (ValidationResult or None, seconds spent).
     """
-    print(f"\n🚀 Starting Pipeline | Topic: '{topic}' | Limit: {limit}")
-    
-    # 1. Fetch Phase
-    print("Step 1: Fetching articles from NewsAPI...")
-    articles = news_fetcher.fetch_articles(topic, limit)
-    total_found = len(articles)
-    
-    if total_found == 0:
-        print("❌ No articles found. Aborting.")
-        return []
-        
-    print(f"✅ Found {total_found} valid articles. Beginning analysis loop.\n")
-    
-    results = []
-    
-    # 2. Processing Phase
-    for i, article in enumerate(articles, 1):
-        title_snippet = article['title'][:50] + "..."
-        print(f"[{i}/{total_found}] Processing: {title_snippet}")
-        
-        # A. Analyze (Gemini)
-        print("   Running Gemini Analysis...", end=" ", flush=True)
-        analysis_model = llm_analyzer.analyze_article(article['text'])
-        
+    start = time.perf_counter()
+    with metrics.span("stage.validate"):
+        validation = llm_validator.validate_analysis(text, analysis, cache=cache)
+        if policy is not None and validation is not None:
+            escalation = None
+            if not validation.is_valid and policy.escalation_model:
+                escalation = llm_validator.validate_analysis(text, analysis, cache=cache, model=policy.escalation_model)
+            policy.record(
+                decision,
+                (escalation or validation).is_valid,
+                escalated=escalation is not None,
+                overturned=escalation is not None and escalation.is_valid,
+            )
+            validation = escalation or validation
+    return validation, time.perf_counter() - start
+
+def _submit_validation(
+    validate_pool: ThreadPoolExecutor,
+    article: Dict,
+    analysis: Dict,
+    cache: Optional[ResultCache] = None,
+    policy: Optional[ValidationPolicy] = None,
+) -> Tuple[Optional[Future], Optional[str]]:
+    """
+    Queues an analysis for validation unless the policy skips it.
+
+    Returns:
+        (validation_future, policy_decision); the future is None when skipped.
+    """
+    if policy is None:
+        return validate_pool.submit(_validate, article['text'], analysis, cache), None
+    decision = policy.decide(article, analysis)
+    if decision == SKIP:
+        return None, decision
+    return validate_pool.submit(_validate, article['text'], analysis, cache, policy, decision), decision
+
+def _analyze_then_validate(
+    articles: List[Dict],
+    validate_pool: ThreadPoolExecutor,
+    cache: Optional[ResultCache] = None,
+    batch_token_budget: int = 0,
+    ledger: Optional[RunLedger] = None,
+    policy: Optional[ValidationPolicy] = None,
+) -> List[Tuple[Optional[Dict], Optional[Future], Optional[float], Optional[str]]]:
+    """
+    Analysis task run on the Gemini pool for one article or one batch.
+
+    Hands each article to the Mistral pool as soon as its analysis is done
+    (if the validation policy wants it checked), so validation never waits
+    on slower articles ahead of it.
+
+    Returns:
+        One (analysis_dict, validation_future, analysis_seconds, policy_decision)
+        per article, or all None where analysis failed. A batch's time is
+        split evenly across its articles.
+    """
+    texts = [article['text'] for article in articles]
+    start = time.perf_counter()
+    with metrics.span("stage.analyze"):
+        if batch_token_budget > 0 and len(texts) > 1:
+            analysis_models = llm_analyzer.analyze_batch(texts, cache=cache, token_budget=batch_token_budget)
+        else:
+            analysis_models = [llm_analyzer.analyze_article(text, cache=cache) for text in texts]
+
+    analysis_seconds = (time.perf_counter() - start) / len(texts)
+
+    outcomes = []
+    for article, analysis_model in zip(articles, analysis_models):
         if not analysis_model:
-            print("FAILED (Skipping)")
+            outcomes.append((None, None, None, None))
             continue
-        print("DONE")
-        
+
         # Convert Pydantic model to dict for usage
         analysis_dict = analysis_model.model_dump()
-        
-        # B. Validate (Mistral)
-        print("   Running Mistral Validation...", end=" ", flush=True)
+        if ledger is not None:
+            ledger.record_analyzed(article, analysis_dict)
+
         # Note: Mistral requires a dict, not the Pydantic object
-        validation_model = llm_validator.validate_analysis(article['text'], analysis_dict)
-        
-        if validation_model:
-            print(f"DONE (Valid: {validation_model.is_valid})")
-            validation_dict = validation_model.model_dump()
-        else:
-            print("SKIPPED (Timeout/Error)")
-            validation_dict = None
-
-        # C. Aggregate
-        entry = {
-            "article": article,
-            "analysis": analysis_dict,
-            "validation": validation_dict
-        }
-        results.append(entry)
-        
-        # Rate Limit Courtesy: Brief pause between heavy LLM calls
-        time.sleep(1) 
+        validation_future, decision = _submit_validation(validate_pool, article, analysis_dict, cache, policy)
+        outcomes.append((analysis_dict, validation_future, analysis_seconds, decision))
+    return outcomes
 
-    print(f"\n🎉 Pipeline Complete. Processed {len(results)}/{total_found} articles successfully.")
-    return results
+def _completed(value: Any) -> Future:
+    """
+    An already-resolved future, used for stages reused from a run ledger.
+    """
+    future = Future()
+    future.set_result(value)
+    return future
 
-def save_results(results: List[Dict]):
+def _article_source(
+    topic: str,
+    limit: int,
+    since: Optional[Dict],
+    ledger: Optional[RunLedger],
+    enricher: Optional[Enricher] = None,
+    coverage: Optional[news_fetcher.FetchCoverage] = None,
+) -> Iterator[Tuple[Dict, Optional[Dict]]]:
     """
-    Saves:
-    1. Raw articles to output/raw_articles.json (REQUIRED BY PDF)
-    2. Full analysis to output/analysis_results.json
-    3. Human-readable report to output/final_report.md
+    Yields (article, ledger_record) pairs: first every article already in the
+    ledger (when resuming), then fresh articles from NewsAPI until `limit`,
+    with full bodies swapped in by the enricher if one is given.
+    Whether the fetch ran out of results is recorded in `coverage`.
     """
-    # Ensure output directory exists
-    output_dir = Path("output")
-    output_dir.mkdir(exist_ok=True)
+    known = set()
+    if ledger is not None:
+        for record in ledger.records():
+            known.add(article_key(record["article"]))
+            yield record["article"], record
+        if ledger.get_meta("fetch_complete", False):
+            if coverage is not None:
+                coverage.exhausted = ledger.get_meta("fetch_exhausted", False)
+            return
 
-    # --- CHANGE 1: Save Raw Articles Separately ---
-    raw_articles = [item["article"] for item in results]
-    raw_path = output_dir / "raw_articles.json"
-    try:
-        with open(raw_path, "w", encoding="utf-8") as f:
-            json.dump(raw_articles, f, indent=2, ensure_ascii=False)
-        print(f"💾 Raw articles saved to: {raw_path}")
-    except IOError as e:
-        print(f"❌ Error saving raw JSON: {e}")
+    def fresh() -> Iterator[Dict]:
+        count = len(known)
+        for article in news_fetcher.stream_articles(topic, limit, since=since, coverage=coverage):
+            if article_key(article) in known:
+                continue
+            if count >= limit:
+                break
+            count += 1
+            yield article
 
-    # --- End CHANGE 1 ---
+    articles = fresh() if enricher is None else enricher.stream(fresh())
+    for article in articles:
+        yield article, None
 
-    # 2. Save Analysis Results (Same as before)
-    json_path = output_dir / "analysis_results.json"
-    try:
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        print(f"💾 Analysis results saved to: {json_path}")
-    except IOError as e:
-        print(f"❌ Error saving analysis JSON: {e}")
-
-    # 3. Generate Markdown Report (Same as before)
-    md_path = output_dir / "final_report.md"
-    
-    # Calculate Stats
-    total = len(results)
-    stats = {"Positive": 0, "Negative": 0, "Neutral": 0}
-    for item in results:
-        sentiment = item["analysis"]["sentiment"]
-        if sentiment in stats:
-            stats[sentiment] += 1
-
-    # Build Report Content
-    current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+    if ledger is not None:
+        ledger.set_meta("fetch_exhausted", coverage is not None and coverage.exhausted)
+        ledger.set_meta("fetch_complete", True)
+
+def _is_ready(slot: Tuple[Future, int]) -> bool:
+    """
+    True once an article's analysis and (if any) validation have both finished.
+    """
+    future, pos = slot
+    if not future.done():
+        return False
+    if future.exception() is not None:
+        return True
+    _, validation_future, _, _ = future.result()[pos]
+    return validation_future is None or validation_future.done()
+
+def iter_pipeline(
+    topic: str,
+    limit: int,
+    analyze_workers: int = config.DEFAULT_ANALYZE_WORKERS,
+    validate_workers: int = config.DEFAULT_VALIDATE_WORKERS,
+    cache: Optional[ResultCache] = None,
+    batch_token_budget: int = 0,
+    dedup: Optional[DedupIndex] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+    max_in_flight: Optional[int] = None,
+    ledger: Optional[RunLedger] = None,
+    triage: Optional[Triager] = None,
+    enricher: Optional[Enricher] = None,
+    source: Optional[Iterable[Tuple[Dict, Optional[Dict]]]] = None,
+    coverage: Optional[Dict[str, news_fetcher.FetchCoverage]] = None,
+    policy: Optional[ValidationPolicy] = None,
+    retry_passes: int = config.DEFAULT_RETRY_PASSES,
+    park_max_wait: float = config.DEFAULT_PARK_MAX_WAIT,
+) -> Iterator[Dict]:
+    """
+    Orchestrates the News Analysis Pipeline: Fetch -> Analyze -> Validate.
+
+    Analysis (Gemini) and validation (Mistral) run on separate bounded thread
+    pools. Each article is validated as soon as its own analysis finishes;
+    entries are yielded in the order the articles were fetched, as soon as
+    they (and everything before them) are done.
+    Setting both worker counts to 1 reproduces the sequential behaviour.
+
+    With a positive `batch_token_budget`, articles are packed into batched
+    Gemini requests (see llm_analyzer.analyze_batch); each batch is one task.
+
+    Fetching pauses while `max_in_flight` articles are unfinished, so memory
+    stays bounded however many articles the topic yields.
+
+    An article whose Gemini or Mistral call is refused by an open circuit
+    breaker is parked rather than dropped. Once the fetch is drained, each
+    retry pass waits for the breakers to half-open and resubmits the parked
+    articles (their entries follow the rest); whatever the last pass still
+    cannot get through is treated as an ordinary failure.
     
-    lines = [
-        "# News Analysis Report",
-        f"**Date:** {current_time}",
-        f"**Articles Analyzed:** {total}",
-        "**Source:** NewsAPI",
-        "",
-        "## Summary",
-        f"- Positive: {stats['Positive']} articles",
-        f"- Negative: {stats['Negative']} articles",
-        f"- Neutral: {stats['Neutral']} articles",
-        "",
-        "## Detailed Analysis"
-    ]
-
-    for i, item in enumerate(results, 1):
-        art = item["article"]
-        anl = item["analysis"]
-        val = item["validation"]
-
-        lines.append(f"### Article {i}: \"{art['title']}\"")
-        lines.append(f"- **Source:** {art['source']} ([Link]({art['url']}))")
-        lines.append(f"- **Gist:** {anl['gist']}")
-        lines.append(f"- **Tone:** {anl['tone']}")
-        lines.append(f"- **LLM#1 Sentiment:** {anl['sentiment']} (Conf: {anl['confidence_score']})")
+    Args:
+        topic: The search topic for NewsAPI.
+        limit: Max number of articles to process.
+        analyze_workers: Concurrent Gemini calls.
+        validate_workers: Concurrent Mistral calls.
+        cache: Optional persistent cache shared by both LLM stages.
+        batch_token_budget: Estimated tokens per batched Gemini request (0 = one request per article).
+        dedup: Optional cross-run duplicate index. Duplicates (same URL, same
+            text, or near-identical syndicated copies) are dropped before
+            analysis, and each result records its `cluster_id`. New entries
+            are staged; the caller commits them once results are saved.
+        checkpoints: Optional per-topic high-water marks. Only articles newer
+            than the topic's mark are fetched; the new mark is staged, and the
+            caller commits it once results are saved.
+        max_in_flight: Fetched-but-unfinished articles allowed at once
+            (defaults to a few per worker, plus one full batch).
+        ledger: Optional run ledger. Every stage transition is recorded; if
+            it already holds articles (a resumed run), validated entries are
+            reused, analyzed ones only re-validated, and failed or missing
+            ones processed again.
+        triage: Optional local pre-classifier. Junk (boilerplate, empty
+            stubs) is dropped before dedup and analysis; articles it is
+            confident about skip Gemini and go straight to validation.
+        enricher: Optional full-body retrieval. Fresh articles get their
+            page text in place of the NewsAPI snippet (kept as `snippet`)
+            before triage, dedup and analysis.
+        source: Optional (article, ledger_record) stream replacing the
+            NewsAPI fetch, e.g. several topics merged by the scheduler.
+            Articles carrying a `topics` list stage a checkpoint for each
+            of those topics instead of `topic`.
+        coverage: Per-topic FetchCoverage of `source`, so checkpoints only
+            advance past what was actually fetched. Topics without one are
+            treated as fully fetched.
+        policy: Optional validation policy. Only analyses it selects (low
+            confidence, risky source, audit sample) go to Mistral; the rest
+            are kept unvalidated, with the decision in `validation_policy`.
+        retry_passes: Retry passes over parked articles (0 = no parking).
+        park_max_wait: Longest a retry pass waits for a breaker (seconds).
         
-        if val:
-            icon = "✓" if val["is_valid"] else "⚠️"
-            status = "Correct" if val["is_valid"] else "Flagged"
-            lines.append(f"- **LLM#2 Validation:** {icon} {status}. {val['reasoning']}")
-        else:
-            lines.append("- **LLM#2 Validation:** ❓ Skipped (Timeout/Error)")
-            
-        lines.append("")
+    Yields:
+        Dictionaries containing raw data, analysis, and validation results.
+    """
+    print(f"\n🚀 Starting Pipeline | Topic: '{topic}' | Limit: {limit}")
+    print(f"Step 1: Streaming articles from NewsAPI into analysis "
+          f"(Gemini workers: {analyze_workers}, Mistral workers: {validate_workers})...")
+
+    if source is None:
+        since = checkpoints.get(topic) if checkpoints is not None else None
+        if since:
+            gap = f" (catching up before {since['until']})" if since.get("until") else ""
+            print(f"   Resuming after checkpoint: {since['published_at'] or 'start'}{gap}")
+        coverage = {topic: news_fetcher.FetchCoverage()}
+        source = _article_source(topic, limit, since, ledger, enricher, coverage[topic])
+
+    if max_in_flight is None:
+        max_in_flight = 4 * (analyze_workers + validate_workers) + llm_analyzer.MAX_BATCH_SIZE
+
+    # Per-article state keyed by fetch position; released once the entry is yielded
+    articles: Dict[int, Dict] = {}
+    cluster_ids: Dict[int, Optional[int]] = {}
+    # Each article maps to (its task's future, its position within that task)
+    slots: Dict[int, Tuple[Future, int]] = {}
+    pending: List[int] = []
+    # Refused by an open breaker: (article, cluster_id, analysis or None, policy decision, provider)
+    parked: List[Tuple[Dict, Optional[int], Optional[Dict], Optional[str], str]] = []
+
+    # Checkpoint inputs, per topic
+    failed_articles: Dict[str, List[Dict]] = {}
+    newest_success: Dict[str, Dict] = {}
+    oldest_fetched: Dict[str, str] = {}
+    fetched = 0
+    duplicates = 0
+    triaged_out = 0
+    processed = 0
+    
+    # Fetch and Processing Phases overlap.
+    # The validation pool is entered first so it outlives the analysis pool,
+    # which keeps submitting into it until the last analysis completes.
+    with ThreadPoolExecutor(max_workers=validate_workers, thread_name_prefix="mistral") as validate_pool, \
+         ThreadPoolExecutor(max_workers=analyze_workers, thread_name_prefix="gemini") as analyze_pool:
+
+        def submit(batch: List[int]):
+            future = analyze_pool.submit(
+                _analyze_then_validate,
+                [articles[i] for i in batch], validate_pool, cache, batch_token_budget, ledger, policy,
+            )
+            for pos, i in enumerate(batch):
+                slots[i] = (future, pos)
+
+        def collect(i: int, park: bool) -> Optional[Dict]:
+            """
+            C. Aggregate: waits for article i and builds its entry (None if
+            analysis failed or, with `park`, the article was parked).
+            """
+            nonlocal processed
+            article = articles.pop(i)
+            cluster_id = cluster_ids.pop(i)
+            analysis_future, pos = slots.pop(i)
+            title_snippet = article['title'][:50] + "..."
+
+            failure_reason = "analysis returned no result"
+            try:
+                analysis_dict, validation_future, analysis_seconds, decision = analysis_future.result()[pos]
+            except CircuitOpenError as e:
+                if park:
+                    print(f"[{i + 1}] {title_snippet} | Gemini: UNAVAILABLE (Parked for retry)")
+                    metrics.incr("pipeline.parked")
+                    parked.append((article, cluster_id, None, None, e.provider))
+                    return None
+                print(f"   Gemini Error: {e}")
+                failure_reason = f"analysis error: {e}"
+                analysis_dict, validation_future, analysis_seconds, decision = None, None, None, None
+            except Exception as e:
+                print(f"   Gemini Error: {e}")
+                failure_reason = f"analysis error: {e}"
+                analysis_dict, validation_future, analysis_seconds, decision = None, None, None, None
+
+            if not analysis_dict:
+                print(f"[{i + 1}] {title_snippet} | Gemini: FAILED (Skipping)")
+                metrics.incr("pipeline.analysis_failed")
+                for t in article.get("topics", [topic]):
+                    failed_articles.setdefault(t, []).append(article)
+                if ledger is not None:
+                    ledger.record_failed(article, failure_reason)
+                # Let the next run pick this story up again
+                if dedup is not None:
+                    dedup.discard(cluster_id)
+                return None
+
+            validation_model, validation_seconds = None, None
+            if validation_future is not None:
+                try:
+                    validation_model, validation_seconds = validation_future.result()
+                except CircuitOpenError as e:
+                    if park:
+                        print(f"[{i + 1}] {title_snippet} | Gemini: DONE | Mistral: UNAVAILABLE (Parked for retry)")
+                        metrics.incr("pipeline.parked")
+                        parked.append((article, cluster_id, analysis_dict, decision, e.provider))
+                        return None
+                    print(f"   Validation Error: {e}")
+                except Exception as e:
+                    print(f"   Validation Error: {e}")
+
+            if validation_future is None:
+                print(f"[{i + 1}] {title_snippet} | Gemini: DONE | Mistral: NOT NEEDED (Policy)")
+                validation_dict = None
+                if ledger is not None:
+                    ledger.record_validation_skipped(article, "validation not required by policy", decision)
+            elif validation_model:
+                print(f"[{i + 1}] {title_snippet} | Gemini: DONE | Mistral: DONE (Valid: {validation_model.is_valid})")
+                validation_dict = validation_model.model_dump()
+                if ledger is not None:
+                    ledger.record_validated(article, validation_dict, decision)
+            else:
+                print(f"[{i + 1}] {title_snippet} | Gemini: DONE | Mistral: SKIPPED (Timeout/Error)")
+                metrics.incr("pipeline.validation_skipped")
+                validation_dict = None
+                if ledger is not None:
+                    ledger.record_validation_skipped(article, "validation skipped (timeout/error)", decision)
+
+            processed += 1
+            metrics.incr("pipeline.processed")
+            if article.get("published_at"):
+                for t in article.get("topics", [topic]):
+                    if t not in newest_success or article["published_at"] > newest_success[t]["published_at"]:
+                        newest_success[t] = article
+
+            return {
+                "article": article,
+                "analysis": analysis_dict,
+                "validation": validation_dict,
+                "cluster_id": cluster_id,
+                "validation_policy": decision,
+                # Time this run spent on each stage (None when reused from a ledger)
+                "latency_seconds": {"analysis": analysis_seconds, "validation": validation_seconds},
+            }
+
+        next_out = 0
+
+        # 1. Fetch -> A. Analyze (Gemini) -> B. Validate (Mistral)
+        # Articles are submitted as they arrive; in batch mode they are held
+        # back only until the next one would overflow the token budget.
+        for article, record in source:
+            if article.get("published_at"):
+                for t in article.get("topics", [topic]):
+                    if t not in oldest_fetched or article["published_at"] < oldest_fetched[t]:
+                        oldest_fetched[t] = article["published_at"]
+
+            if record is not None:
+                # Already deduplicated when the interrupted run fetched it; this run commits it
+                cluster_id = record["cluster_id"]
+                if dedup is not None and cluster_id is not None:
+                    dedup.adopt(cluster_id)
+            else:
+                verdict = None
+                if triage is not None:
+                    verdict = triage.classify([article['text']])[0]
+                    if verdict.verdict == DROP:
+                        triaged_out += 1
+                        metrics.incr("pipeline.triage_dropped")
+                        print(f"   Low-quality text (score {verdict.quality}) dropped: {article['title'][:50]}...")
+                        continue
+
+                cluster_id = None
+                if dedup is not None:
+                    cluster_id, duplicate_kind = dedup.assign(article['url'], article['text'])
+                    if duplicate_kind:
+                        duplicates += 1
+                        metrics.incr("pipeline.duplicates")
+                        print(f"   Duplicate ({duplicate_kind} match, cluster {cluster_id}) dropped: {article['title'][:50]}...")
+                        continue
+
+            i = fetched
+            fetched += 1
+            articles[i] = article
+            cluster_ids[i] = cluster_id
+
+            if ledger is not None and record is None:
+                ledger.record_fetched(article, i, cluster_id)
+
+            if record is not None and record["stage"] in (ANALYZED, VALIDATED):
+                # Reuse finished stages (and the policy decision made for them);
+                # an analyzed article only needs validating
+                decision = record["decision"]
+                if record["stage"] == VALIDATED:
+                    validation_future = _completed((llm_validator.ValidationResult.model_validate(record["validation"]), None))
+                elif decision == SKIP:
+                    validation_future = None  # Not re-rolled: the policy already skipped it
+                elif decision is not None:
+                    # Validation only, under the decision already made for it
+                    validation_future = validate_pool.submit(
+                        _validate, article['text'], record["analysis"], cache, policy, decision
+                    )
+                else:
+                    validation_future, decision = _submit_validation(
+                        validate_pool, article, record["analysis"], cache, policy
+                    )
+                slots[i] = (_completed([(record["analysis"], validation_future, None, decision)]), 0)
+            elif record is None and verdict is not None and verdict.verdict == ACCEPT:
+                # Confident local sentiment stands in for Gemini; Mistral still checks it
+                analysis_dict = Triager.local_analysis(article['text'], verdict)
+                metrics.incr("pipeline.triage_accepted")
+                if ledger is not None:
+                    ledger.record_analyzed(article, analysis_dict)
+                # Not left to the validation policy: a local guess is always checked
+                validation_future, _ = _submit_validation(validate_pool, article, analysis_dict, cache)
+                slots[i] = (_completed([(analysis_dict, validation_future, 0.0, None)]), 0)
+            elif batch_token_budget <= 0:
+                submit([i])
+            else:
+                pending.append(i)
+                planned = llm_analyzer.plan_batches([articles[j]['text'] for j in pending], batch_token_budget)
+                if len(planned) > 1:
+                    submit([pending[j] for j in planned[0]])
+                    pending = [pending[j] for batch in planned[1:] for j in batch]
+
+            # Emit finished entries in order; block on the oldest when too many are in flight
+            while next_out in slots and (fetched - next_out >= max_in_flight or _is_ready(slots[next_out])):
+                entry = collect(next_out, park=retry_passes > 0)
+                next_out += 1
+                if entry:
+                    yield entry
+
+        if pending:
+            for batch in llm_analyzer.plan_batches([articles[i]['text'] for i in pending], batch_token_budget):
+                submit([pending[j] for j in batch])
+
+        if fetched == 0:
+            print("❌ No new articles found. Aborting.")
+            return
+
+        print(f"✅ Fetched {fetched} valid articles ({duplicates} duplicates, {triaged_out} low-quality dropped).")
+
+        while next_out < fetched:
+            entry = collect(next_out, park=retry_passes > 0)
+            next_out += 1
+            if entry:
+                yield entry
+
+        # 2. Retry passes over articles parked while a provider's breaker was open
+        end = fetched
+        for retry_pass in range(1, retry_passes + 1):
+            if not parked:
+                break
+            retry, parked = parked, []
+            providers = sorted({provider for *_, provider in retry})
+            waited = circuit_breaker.wait_until_allowed(providers, max_wait=park_max_wait)
+            print(f"🔁 Retry pass {retry_pass}/{retry_passes}: {len(retry)} parked articles "
+                  f"(waited {waited:.0f}s for {', '.join(providers)})")
+
+            to_analyze = []
+            for article, cluster_id, analysis_dict, decision, _ in retry:
+                i = end
+                end += 1
+                articles[i] = article
+                cluster_ids[i] = cluster_id
+                if analysis_dict is None:
+                    to_analyze.append(i)
+                else:
+                    # Validation only, under the decision already made for it
+                    validation_future = validate_pool.submit(
+                        _validate, article['text'], analysis_dict, cache, policy if decision else None, decision
+                    )
+                    slots[i] = (_completed([(analysis_dict, validation_future, None, decision)]), 0)
+            if batch_token_budget > 0:
+                for batch in llm_analyzer.plan_batches([articles[i]['text'] for i in to_analyze], batch_token_budget):
+                    submit([to_analyze[j] for j in batch])
+            else:
+                for i in to_analyze:
+                    submit([i])
+
+            while next_out < end:
+                entry = collect(next_out, park=retry_pass < retry_passes)
+                next_out += 1
+                if entry:
+                    yield entry
+
+    print(f"\n🎉 Pipeline Complete. Processed {processed}/{fetched} articles successfully.")
+    if checkpoints is not None:
+        for t in {topic, *newest_success, *failed_articles}:
+            succeeded = [newest_success[t]] if t in newest_success else []
+            fetch = (coverage or {}).get(t)
+            checkpoints.stage(t, compute_high_water_mark(
+                succeeded,
+                failed_articles.get(t, []),
+                previous=checkpoints.get(t),
+                exhausted=fetch is None or fetch.exhausted,
+                oldest=oldest_fetched.get(t),
+            ))
+    if policy is not None:
+        summary = policy.summary()
+        rate = summary["skipped_disagreement_rate"]
+        print(f"🎯 Validation policy | Validated: {summary['validated']} | Skipped: {summary[SKIP]} | "
+              f"Escalated: {summary['escalated']} | Audit flag rate: {'n/a' if rate is None else f'{rate:.1%}'}"
+              f" (~{summary['estimated_missed_flags'] or 0} flags missed by skipping)")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"🗃️  Cache | Hits: {stats['hits']} | Misses: {stats['misses']} | Evictions: {stats['evictions']}")
+
+def run_pipeline(topic: str, limit: int, **options) -> ResultBatch:
+    """
+    Runs the pipeline and collects every entry in memory, packed as compact
+    records (see records.ResultBatch).
+    Accepts the same options as iter_pipeline; prefer run_and_save for large runs.
+
+    Returns:
+        Sequence of dictionaries containing raw data, analysis, and validation results.
+    """
+    return ResultBatch(iter_pipeline(topic, limit, **options))
+
+def run_and_save(
+    topic: str,
+    limit: int,
+    output_dir: Path = Path("output"),
+    checkpoints: Optional[CheckpointStore] = None,
+    run_id: Optional[str] = None,
+    archive: Optional["ResultArchive"] = None,
+    reports: Optional[ReportEngine] = None,
+    **options,
+) -> Optional[Path]:
+    """
+    Runs the pipeline, streaming each entry to output/runs/<run-id>.jsonl as
+    it is produced, then derives the JSON/Markdown views from that stream.
+
+    Every article's stage is recorded in output/runs/<run-id>.ledger.sqlite3.
+    Passing the `run_id` of an earlier run resumes it: its topic and limit
+    come from the ledger, finished stages are reused and only failed or
+    missing work is retried.
+
+    The topic checkpoint and the dedup index entries are committed only
+    after the stream is closed and fsynced. If the run crashes, the partial stream and ledger are kept on disk.
+    With an `archive`, the finished run is also appended to the columnar
+    history (see results_archive); with `reports`, its articles are folded
+    into the rolling per-day reports (see report_engine).
+
+    Returns:
+        Path of the results stream, or None if nothing was produced.
+    """
+    runs_dir = output_dir / "runs"
+    resuming = run_id is not None
+    if not resuming:
+        run_id = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    ledger_path = runs_dir / f"{run_id}.ledger.sqlite3"
+    stream_path = runs_dir / f"{run_id}.jsonl"
+
+    if resuming and not ledger_path.exists():
+        raise ValueError(f"No ledger found for run '{run_id}' at {ledger_path}.")
+
+    ledger = RunLedger(ledger_path)
+    if resuming:
+        topic = ledger.get_meta("topic", topic)
+        limit = ledger.get_meta("limit", limit)
+        print(f"♻️  Resuming run {run_id} | Stages so far: {ledger.stage_counts()}")
+        # The ledger holds every finished payload; the stream is rebuilt from it in order
+        stream_path.unlink(missing_ok=True)
+    else:
+        ledger.set_meta("topic", topic)
+        ledger.set_meta("limit", limit)
+        print(f"🆔 Run ID: {run_id} (resume with --resume {run_id})")
 
     try:
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines))
-        print(f"📄 Report generated at: {md_path}")
-    except IOError as e:
-        print(f"❌ Error saving Markdown: {e}")
-        # --- ADD THIS AT THE VERY BOTTOM ---
+        with JsonlSink.from_env(stream_path) as sink:
+            for entry in iter_pipeline(topic, limit, checkpoints=checkpoints, ledger=ledger, **options):
+                sink.write(entry)
+    finally:
+        ledger.close()
+        # Exported even for crashed runs: that is when the numbers matter most
+        metrics_path = runs_dir / f"{run_id}.metrics.json"
+        metrics.REGISTRY.write_json(metrics_path)
+        print(f"📊 Metrics saved to: {metrics_path}")
+
+    if sink.count == 0:
+        stream_path.unlink(missing_ok=True)
+        return None
+
+    print(f"💾 Results stream saved to: {stream_path}")
+    if checkpoints is not None:
+        checkpoints.commit(topic)
+    if options.get("dedup") is not None:
+        options["dedup"].commit()
+
+    render_views(stream_path, output_dir)
+    if archive is not None:
+        print(f"🗄️  Archived {archive.append_stream(stream_path, run_id)} rows to: {archive.root}")
+    if reports is not None:
+        print(f"📚 Added {reports.add(iter_entries(stream_path))} articles to: {reports.index_path}")
+    return stream_path
+
+def pipeline_options_from_env() -> Dict[str, Any]:
+    """
+    iter_pipeline options configured by environment variables (see .env),
+    shared by every entry point that runs the full pipeline.
+    """
+    return dict(
+        analyze_workers=config.env_int("ANALYZE_WORKERS", config.DEFAULT_ANALYZE_WORKERS),
+        validate_workers=config.env_int("VALIDATE_WORKERS", config.DEFAULT_VALIDATE_WORKERS),
+        cache=ResultCache.from_env(),
+        batch_token_budget=config.env_int("ANALYZE_BATCH_TOKENS", 0),
+        dedup=DedupIndex(),
+        triage=Triager.from_env(),
+        enricher=Enricher.from_env() if config.env_int("ENRICH_BODIES", 0) else None,
+        policy=ValidationPolicy.from_env() if config.env_int("VALIDATION_POLICY", 0) else None,
+        retry_passes=config.env_int("PARK_RETRY_PASSES", config.DEFAULT_RETRY_PASSES),
+        park_max_wait=config.env_float("PARK_MAX_WAIT", config.DEFAULT_PARK_MAX_WAIT),
+    )
+
+def archive_from_env() -> Optional["ResultArchive"]:
+    """
+    The columnar results archive if RESULTS_ARCHIVE=1, else None. Imported
+    only when enabled, so pyarrow stays out of ordinary runs.
+    """
+    if not config.env_int("RESULTS_ARCHIVE", 0):
+        return None
+    from results_archive import ResultArchive
+    return ResultArchive()
+
+def save_results(results: Iterable[Dict]) -> bool:
+    """
+    Saves:
+    1. Raw articles to output/raw_articles.json (REQUIRED BY PDF)
+    2. Full analysis to output/analysis_results.json
+    3. Human-readable report to output/final_report.md
+
+    Returns:
+        True only if every file was written.
+    """
+    return render_views(results, Path("output"))
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Celltron News Analysis Pipeline")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Resume an interrupted run from its ledger.")
+    args = parser.parse_args()
+
     # Load environment variables
     load_dotenv()
+
+    # Optional Prometheus scrape endpoint for the lifetime of the run
+    metrics_port = config.env_int("METRICS_PORT", 0)
+    if metrics_port:
+        metrics.REGISTRY.serve(metrics_port)
+        print(f"📈 Prometheus metrics at http://127.0.0.1:{metrics_port}/metrics")
     
-    # Run the pipeline
+    # Run the pipeline; results stream to disk and the reports are derived from them
     # Topic is specific to the assignment requirement
-    final_data = run_pipeline('"Indian Government"', limit=12)
-    
-    # Save output only if we have data
-    if final_data:
-        save_results(final_data)
\ No newline at end of file
+    run_and_save(
+        '"Indian Government"',
+        limit=12,
+        checkpoints=CheckpointStore(),
+        run_id=args.resume,
+        archive=archive_from_env(),
+        reports=ReportEngine.from_env() if config.env_int("REPORTS_INCREMENTAL", 1) else None,
+        **pipeline_options_from_env(),
+    )
@@ -0,0 +1,275 @@
+import json
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import config
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# --- Configuration ---
+# Prometheus histogram buckets (seconds), spanning cache hits to slow LLM calls.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUANTILES = (0.5, 0.95, 0.99)
+# Samples kept per span for percentiles; beyond this a uniform reservoir is kept.
+MAX_SAMPLES = 10_000
+
+# USD per million tokens as (prompt, completion). Free tiers default to 0;
+# override with <PROVIDER>_PRICE_IN_PER_MTOK / <PROVIDER>_PRICE_OUT_PER_MTOK.
+DEFAULT_PRICES: Dict[str, Tuple[float, float]] = {
+    "gemini": (0.0, 0.0),
+    "openrouter": (0.0, 0.0),
+}
+
+
+class Histogram:
+    """
+    Latency distribution for one span: bucket counts for Prometheus plus a
+    bounded sample reservoir for p50/p95/p99.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self._samples: List[float] = []
+        self._rng = random.Random(0)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+        if len(self._samples) < MAX_SAMPLES:
+            self._samples.append(seconds)
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < MAX_SAMPLES:
+                self._samples[slot] = seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Nearest-rank percentile over the sampled latencies, or None before any sample.
+        """
+        return _nearest_rank(self._samples, q)
+
+    def samples(self) -> List[float]:
+        return list(self._samples)
+
+
+def _nearest_rank(samples: List[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class MetricsRegistry:
+    """
+    Thread-safe per-process store of span latencies, event counters and
+    LLM token usage, exportable as JSON or Prometheus text.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[str, Histogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._tokens: Dict[str, Dict[str, int]] = {}
+
+    # --- Recording ---
+
+    def observe(self, name: str, seconds: float, error: bool = False):
+        with self._lock:
+            histogram = self._spans.setdefault(name, Histogram())
+            histogram.observe(seconds)
+            if error:
+                histogram.errors += 1
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        Times the enclosed block; an exception counts as an error on the span and is re-raised.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.observe(name, time.perf_counter() - start, error=True)
+            raise
+        self.observe(name, time.perf_counter() - start)
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def record_tokens(self, provider: str, prompt_tokens, completion_tokens, cached_tokens=None):
+        """
+        Adds provider-reported token usage. Non-integer values (missing usage) are ignored.
+        `cached_tokens` is the part of the prompt the provider served from its context cache.
+        """
+        prompt_tokens = prompt_tokens if isinstance(prompt_tokens, int) else 0
+        completion_tokens = completion_tokens if isinstance(completion_tokens, int) else 0
+        cached_tokens = cached_tokens if isinstance(cached_tokens, int) else 0
+        with self._lock:
+            usage = self._tokens.setdefault(provider, {"prompt": 0, "completion": 0, "cached": 0, "calls": 0})
+            usage["prompt"] += prompt_tokens
+            usage["completion"] += completion_tokens
+            usage["cached"] += cached_tokens
+            usage["calls"] += 1
+
+    # --- Queries ---
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        # Only the copy happens under the lock; recording never waits on the sort
+        with self._lock:
+            histogram = self._spans.get(name)
+            samples = histogram.samples() if histogram else []
+        return _nearest_rank(samples, q)
+
+    def span_count(self, name: str) -> int:
+        with self._lock:
+            histogram = self._spans.get(name)
+            return histogram.count if histogram else 0
+
+    @staticmethod
+    def _cost(provider: str, usage: Dict[str, int]) -> float:
+        default_in, default_out = DEFAULT_PRICES.get(provider, (0.0, 0.0))
+        price_in = config.env_float(f"{provider.upper()}_PRICE_IN_PER_MTOK", default_in)
+        price_out = config.env_float(f"{provider.upper()}_PRICE_OUT_PER_MTOK", default_out)
+        return (usage["prompt"] * price_in + usage["completion"] * price_out) / 1_000_000
+
+    def snapshot(self) -> Dict:
+        """
+        Point-in-time view of every metric as plain data.
+        """
+        with self._lock:
+            spans = {
+                name: {
+                    "count": h.count,
+                    "errors": h.errors,
+                    "total_seconds": round(h.total, 6),
+                    **{f"p{int(q * 100)}": h.percentile(q) for q in QUANTILES},
+                }
+                for name, h in sorted(self._spans.items())
+            }
+            counters = dict(sorted(self._counters.items()))
+            tokens = {
+                provider: {**usage, "cost_usd": round(self._cost(provider, usage), 6)}
+                for provider, usage in sorted(self._tokens.items())
+            }
+        return {"spans": spans, "counters": counters, "tokens": tokens}
+
+    # --- Export ---
+
+    def write_json(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"generated_at": time.time(), **self.snapshot()}, f, indent=2)
+
+    def render_prometheus(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        lines = [
+            "# HELP celltron_span_duration_seconds Latency of pipeline spans.",
+            "# TYPE celltron_span_duration_seconds histogram",
+        ]
+        with self._lock:
+            spans = sorted(self._spans.items())
+            for name, h in spans:
+                for bound, count in zip(LATENCY_BUCKETS, h.bucket_counts):
+                    lines.append(f'celltron_span_duration_seconds_bucket{{span="{name}",le="{bound}"}} {count}')
+                lines.append(f'celltron_span_duration_seconds_bucket{{span="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'celltron_span_duration_seconds_sum{{span="{name}"}} {h.total}')
+                lines.append(f'celltron_span_duration_seconds_count{{span="{name}"}} {h.count}')
+
+            lines += [
+                "# HELP celltron_span_quantile_seconds Sampled latency quantiles of pipeline spans.",
+                "# TYPE celltron_span_quantile_seconds gauge",
+            ]
+            for name, h in spans:
+                for q in QUANTILES:
+                    value = h.percentile(q)
+                    if value is not None:
+                        lines.append(f'celltron_span_quantile_seconds{{span="{name}",quantile="{q}"}} {value}')
+
+            lines += [
+                "# HELP celltron_span_errors_total Spans that ended in an exception.",
+                "# TYPE celltron_span_errors_total counter",
+            ]
+            lines += [f'celltron_span_errors_total{{span="{name}"}} {h.errors}' for name, h in spans]
+
+            lines += [
+                "# HELP celltron_events_total Retries, timeouts, throttles and other pipeline events.",
+                "# TYPE celltron_events_total counter",
+            ]
+            lines += [f'celltron_events_total{{event="{name}"}} {value}' for name, value in sorted(self._counters.items())]
+
+            lines += [
+                "# HELP celltron_tokens_total LLM tokens reported by providers.",
+                "# TYPE celltron_tokens_total counter",
+            ]
+            costs = []
+            for provider, usage in sorted(self._tokens.items()):
+                lines.append(f'celltron_tokens_total{{provider="{provider}",kind="prompt"}} {usage["prompt"]}')
+                lines.append(f'celltron_tokens_total{{provider="{provider}",kind="completion"}} {usage["completion"]}')
+                lines.append(f'celltron_tokens_total{{provider="{provider}",kind="cached"}} {usage["cached"]}')
+                costs.append(f'celltron_cost_usd_total{{provider="{provider}"}} {self._cost(provider, usage)}')
+
+        lines += [
+            "# HELP celltron_cost_usd_total Estimated LLM spend.",
+            "# TYPE celltron_cost_usd_total counter",
+            *costs,
+        ]
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        """
+        Serves /metrics in Prometheus format from a daemon thread.
+        """
+        # Imported here: http.server (and ssl) would otherwise load with every CLI command
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrape noise out of the pipeline output
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self._tokens.clear()
+
+
+# --- Module Globals ---
+# One registry per process, shared by the fetcher, analyzer, validator and pipeline.
+REGISTRY = MetricsRegistry()
+
+span = REGISTRY.span
+incr = REGISTRY.incr
+observe = REGISTRY.observe
+record_tokens = REGISTRY.record_tokens
@@ -1,34 +1,52 @@
 import os
+import sys
+import threading
 import requests
-from typing import List, Dict, Optional
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+from typing import Iterator, List, Dict, Optional
+
+import http_client
+import metrics
+import rate_limiter
+
+# NewsAPI rejects pageSize values above 100
+MAX_PAGE_SIZE = 100
+
+# Soft-code: NEWSAPI_BASE_URL points the fetcher elsewhere (e.g. benchmark stand-ins)
+DEFAULT_BASE_URL = "https://newsapi.org"
 
 def _create_retry_session() -> requests.Session:
     """
-    Creates a requests Session with automatic retry logic for resilience.
-    
-    Configuration:
-    - Retries: 3 times
-    - Backoff: 1s, 2s, 4s (exponential)
-    - Triggers: 5xx server errors (not 4xx client errors)
+    Creates a requests Session with automatic retry logic for resilience
+    (3 retries, 1s/2s/4s backoff on 5xx; see http_client).
     """
-    session = requests.Session()
-    
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"]
-    )
-    
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    
-    # Mount handler for both HTTP and HTTPS
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-    
-    return session
+    return http_client.create_retry_session()
+
+# --- Module Globals ---
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def _get_session() -> requests.Session:
+    """
+    Lazy initialization of the NewsAPI session, shared by every stream
+    (and every topic) in the process so connections are reused.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = _create_retry_session()
+    return _SESSION
+
+class FetchCoverage:
+    """
+    Filled in by stream_articles: `exhausted` is True only if the walk ran
+    out of results, i.e. it reached back to `since`. Stopping at the limit,
+    on an error or at the plan's page cap leaves it False, because NewsAPI
+    returns the newest articles first and the older ones were never seen.
+    """
+    __slots__ = ("exhausted",)
+
+    def __init__(self):
+        self.exhausted = False
 
 def _normalize_article(article: Dict) -> Optional[Dict]:
     """
@@ -54,6 +72,9 @@ def _normalize_article(article: Dict) -> Optional[Dict]:
     # Extraction: Safely get source name
     source_obj = article.get("source", {})
     source_name = source_obj.get("name", "Unknown")
+    if isinstance(source_name, str):
+        # Interned: a run sees the same few dozen outlets over and over
+        source_name = sys.intern(source_name)
 
     return {
         "title": title.strip(),
@@ -63,20 +84,54 @@ def _normalize_article(article: Dict) -> Optional[Dict]:
         "text": text_payload.strip()
     }
 
-def fetch_articles(topic: str, limit: int = 10) -> List[Dict]:
+def _is_before_mark(article: Dict, since: Dict) -> bool:
     """
-    Fetches and validates news articles from NewsAPI.
+    True if the article was already covered by the checkpoint.
+    NewsAPI's `from` is inclusive, so the checkpointed article itself comes back.
+    """
+    published_at = article.get("published_at")
+    if not published_at:
+        return False
+    if published_at < since["published_at"]:
+        return True
+    return published_at == since["published_at"] and article["url"] == since.get("url")
+
+def stream_articles(
+    topic: str,
+    limit: int = 10,
+    page_size: Optional[int] = None,
+    since: Optional[Dict] = None,
+    coverage: Optional[FetchCoverage] = None,
+) -> Iterator[Dict]:
+    """
+    Lazily yields validated articles from NewsAPI, walking `page` as needed.
+
+    Each article is yielded as soon as it passes _normalize_article, so the
+    caller can start analysis before the remaining pages are downloaded.
+    Stops at `limit` valid articles, an empty page, or the end of totalResults.
+
+    Args:
+        topic: The search query.
+        limit: Max number of valid articles to yield.
+        page_size: Articles per request (defaults to 2x the limit, capped at 100).
+        since: Optional high-water mark {"published_at", "url"} from a previous
+            run. Sent as NewsAPI's `from`; older articles and the exact
+            checkpointed URL are skipped. A mark carrying `until` (a gap
+            left by an earlier walk that stopped early) also sends it as `to`.
+        coverage: Optional FetchCoverage recording whether the walk ran out.
     """
     api_key = os.getenv("NEWSAPI_API_KEY")
     if not api_key:
         raise ValueError("NEWSAPI_API_KEY not found in environment variables.")
 
-    session = _create_retry_session()
-    url = "https://newsapi.org/v2/everything"
+    session = _get_session()
+    url = os.getenv("NEWSAPI_BASE_URL", DEFAULT_BASE_URL).rstrip("/") + "/v2/everything"
     
     # Strategy: Fetch 2x the limit to account for filtered/removed articles
-    page_size = min(100, limit * 2) 
-    
+    if page_size is None:
+        page_size = min(MAX_PAGE_SIZE, limit * 2)
+    page_size = max(1, min(MAX_PAGE_SIZE, page_size))
+
     params = {
         "q": topic,
         "apiKey": api_key,
@@ -84,27 +139,70 @@ def fetch_articles(topic: str, limit: int = 10) -> List[Dict]:
         "sortBy": "publishedAt",
         "pageSize": page_size
     }
+    since_time = since.get("published_at") if since else None
+    if since_time:
+        params["from"] = since_time
+    if since_time and since.get("until"):
+        # Only a gap above a lower bound is walked back
+        params["to"] = since["until"]
+
+    yielded = 0
+    page = 1
+    # New stories shift results between pages mid-walk; don't yield them twice
+    seen_urls = set()
+
+    while True:
+        try:
+            # Shared NewsAPI budget; a 429 pauses every caller for Retry-After,
+            # then the same page is requested again
+            limiter = rate_limiter.get_limiter("newsapi")
+            for attempt in range(rate_limiter.MAX_THROTTLE_RETRIES + 1):
+                limiter.acquire()
 
-    try:
-        # TIMEOUT=10 is critical to prevent hanging processes
-        response = session.get(url, params=params, timeout=10)
-        response.raise_for_status() 
-        
-        data = response.json()
-        raw_articles = data.get("articles", [])
-        
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching news: {e}")
-        return []
-
-    valid_articles = []
-    for art in raw_articles:
-        normalized = _normalize_article(art)
-        if normalized:
-            valid_articles.append(normalized)
+                # TIMEOUT=10 is critical to prevent hanging processes
+                with metrics.span("newsapi.request"):
+                    response = session.get(url, params={**params, "page": page}, timeout=10)
+                metrics.incr("newsapi.retries", http_client.retry_count(response))
+                if response.status_code != 429:
+                    limiter.report_ok()
+                    break
+                metrics.incr("newsapi.throttled")
+                limiter.report_throttled(rate_limiter.parse_retry_after(response.headers.get("Retry-After")))
+            response.raise_for_status() 
             
+            data = response.json()
+            raw_articles = data.get("articles", [])
+            
+        except requests.exceptions.RequestException as e:
+            if isinstance(e, requests.exceptions.Timeout):
+                metrics.incr("newsapi.timeouts")
+            # Includes NewsAPI's plan cap on deep pages; keep what we already yielded
+            print(f"Error fetching news (page {page}): {e}")
+            return
+
+        for art in raw_articles:
+            normalized = _normalize_article(art)
+            if not normalized or normalized["url"] in seen_urls:
+                continue
+            if since_time and _is_before_mark(normalized, since):
+                continue
+            seen_urls.add(normalized["url"])
+            yield normalized
+            yielded += 1
+
             # Stop exactly when we hit the requested limit
-            if len(valid_articles) >= limit:
-                break
-                
-    return valid_articles
\ No newline at end of file
+            if yielded >= limit:
+                return
+
+        total_results = data.get("totalResults", 0)
+        if not raw_articles or page * page_size >= total_results:
+            if coverage is not None:
+                coverage.exhausted = True
+            return
+        page += 1
+
+def fetch_articles(topic: str, limit: int = 10) -> List[Dict]:
+    """
+    Fetches and validates news articles from NewsAPI.
+    """
+    return list(stream_articles(topic, limit))
@@ -0,0 +1,155 @@
+import json
+from string import Template
+from typing import Any, NamedTuple
+
+import metrics
+import rate_limiter
+
+
+class Prompt(NamedTuple):
+    """
+    A rendered prompt: the static instruction prefix and the per-call content.
+    """
+    system: str
+    user: str
+
+    def tokens(self) -> int:
+        """
+        Estimated input tokens for the whole request (prefix included).
+        """
+        return rate_limiter.estimate_tokens(self.system) + rate_limiter.estimate_tokens(self.user)
+
+
+class PromptTemplate:
+    """
+    A versioned prompt, split into a static system prefix and a compiled
+    per-call template.
+
+    The prefix is identical on every call, so it is sent as the provider's
+    system instruction where it can be cached server-side. `baseline` is
+    the previous single-string prompt, kept only so render() can account
+    the tokens each call saves against it.
+    """
+
+    def __init__(self, name: str, version: str, system: str, user: str, baseline: str):
+        self.name = name
+        self.version = version
+        self.system = system
+        self._user = Template(user)
+        self._baseline = Template(baseline)
+
+    def render(self, prefix_cached: bool = False, **fields: Any) -> Prompt:
+        """
+        Fills the per-call template and records prompt.<name>.* counters:
+        calls, estimated tokens sent, and tokens saved versus the baseline
+        (with prefix_cached, the cached system prefix counts as saved too).
+
+        Non-string fields are embedded as compact JSON; the baseline
+        rendered them indented, as the old prompts did.
+        """
+        prompt = Prompt(self.system, self._user.substitute(
+            {k: v if isinstance(v, str) else compact_json(v) for k, v in fields.items()}
+        ))
+        sent = rate_limiter.estimate_tokens(prompt.user) if prefix_cached else prompt.tokens()
+        baseline = rate_limiter.estimate_tokens(self._baseline.substitute(
+            {k: v if isinstance(v, str) else json.dumps(v, indent=2) for k, v in fields.items()}
+        ))
+        metrics.incr(f"prompt.{self.name}.calls")
+        metrics.incr(f"prompt.{self.name}.tokens_sent", sent)
+        metrics.incr(f"prompt.{self.name}.tokens_saved", max(0, baseline - sent))
+        return prompt
+
+
+def compact_json(value: Any) -> str:
+    """
+    JSON without indentation or spaces after separators, for payloads embedded in prompts.
+    """
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+# --- Templates ---
+
+ANALYSIS = PromptTemplate(
+    name="analysis",
+    version="v2",
+    system=(
+        "You are a strictly logical news analyst.\n"
+        "Return ONLY a valid JSON object, without Markdown formatting.\n"
+        'Schema: {"gist": 1-2 sentence summary, '
+        '"sentiment": exactly "Positive", "Negative" or "Neutral", '
+        '"tone": e.g. "Urgent", "Analytical", "Satirical", '
+        '"confidence_score": float 0.0-1.0}'
+    ),
+    user="Article Text:\n$text",
+    baseline="""
+        You are a strictly logical news analyst.
+
+        Output Requirements:
+        1. Return ONLY a valid JSON object.
+        2. Do not use Markdown formatting (no ```json blocks).
+        3. Strict Schema:
+           - "gist": (str) 1-2 sentence summary.
+           - "sentiment": (str) Exactly "Positive", "Negative", or "Neutral".
+           - "tone": (str) e.g., "Urgent", "Analytical", "Satirical".
+           - "confidence_score": (float) 0.0 to 1.0.
+
+        Article Text:
+        $text
+        """,
+)
+
+BATCH_ANALYSIS = PromptTemplate(
+    name="batch_analysis",
+    version="v2",
+    system=(
+        "You are a strictly logical news analyst.\n"
+        "Return ONLY a valid JSON array with exactly one object per article, without Markdown formatting.\n"
+        'Schema of each object: {"id": the article\'s ID exactly as given, '
+        '"gist": 1-2 sentence summary, '
+        '"sentiment": exactly "Positive", "Negative" or "Neutral", '
+        '"tone": e.g. "Urgent", "Analytical", "Satirical", '
+        '"confidence_score": float 0.0-1.0}'
+    ),
+    user="Articles:\n$articles",
+    baseline="""
+        You are a strictly logical news analyst.
+
+        Output Requirements:
+        1. Return ONLY a valid JSON array with exactly one object per article below.
+        2. Do not use Markdown formatting (no ```json blocks).
+        3. Strict Schema for each object:
+           - "id": (int) The article's ID exactly as given.
+           - "gist": (str) 1-2 sentence summary.
+           - "sentiment": (str) Exactly "Positive", "Negative", or "Neutral".
+           - "tone": (str) e.g., "Urgent", "Analytical", "Satirical".
+           - "confidence_score": (float) 0.0 to 1.0.
+
+        Articles:
+        $articles
+        """,
+)
+
+VALIDATION = PromptTemplate(
+    name="validation",
+    version="v2",
+    system=(
+        "Task: Validate if the given analysis accurately reflects the article text. "
+        "Check for hallucinations or wrong sentiment labels.\n"
+        'Respond ONLY with valid JSON: {"is_valid": boolean, "reasoning": "string"}'
+    ),
+    user='Article Text (Truncated):\n"$text"\nAnalysis to Check:\n$analysis',
+    baseline="""
+    Task: Validate if the following analysis accurately reflects the article text.
+
+    Article Text (Truncated):
+    "$text"
+
+    Analysis to Check:
+    $analysis
+
+    Output Instructions:
+    1. Respond ONLY with valid JSON.
+    2. Format: {"is_valid": boolean, "reasoning": "string"}
+    3. Check for hallucinations or wrong sentiment labels.
+    """,
+)
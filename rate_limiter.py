@@ -0,0 +1,169 @@
+import email.utils
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import config
+
+# --- Configuration ---
+# Per-provider defaults as (requests per minute, tokens per minute).
+# A tokens-per-minute value of 0 disables token accounting for that provider.
+# Override with <PROVIDER>_RPM / <PROVIDER>_TPM, e.g. GEMINI_RPM=15.
+PROVIDER_DEFAULTS: Dict[str, Tuple[int, int]] = {
+    "newsapi": (30, 0),
+    "gemini": (10, 250_000),
+    "openrouter": (20, 0),
+}
+
+# How many times a call is re-attempted after the provider answers 429.
+MAX_THROTTLE_RETRIES = 2
+
+# Adaptive backoff bounds (seconds) used when no Retry-After is supplied.
+_BASE_BACKOFF = 1.0
+_MAX_BACKOFF = 60.0
+
+# Share of the configured rate kept after a 429 (multiplicative decrease),
+# and the share regained after each successful call (additive increase).
+_THROTTLE_DECREASE = 0.5
+_RECOVERY_STEP = 0.05
+_MIN_RATE_FACTOR = 0.1
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate_per_minute`.
+
+    Callers reserve tokens up front and are told how long to wait, which lets
+    many threads queue fairly without holding the lock while they sleep.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_minute = float(rate_per_minute)
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0, rate_factor: float = 1.0) -> float:
+        """
+        Deducts `amount` tokens and returns the seconds to wait before using them.
+
+        The balance may go negative; later callers then wait for the debt to refill.
+        Requests larger than the bucket capacity are clamped so they can still proceed.
+        """
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            rate_per_second = self.rate_per_minute * rate_factor / 60.0
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * rate_per_second)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / rate_per_second
+
+
+class ProviderLimiter:
+    """
+    Request and token budgets for one provider, with adaptive 429 backoff.
+
+    On a 429 the limiter pauses all callers (honouring Retry-After when given)
+    and halves its effective rate; successful calls restore it gradually.
+    """
+
+    def __init__(self, name: str, requests_per_minute: int, tokens_per_minute: int = 0):
+        self.name = name
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._backoff = 0.0
+        self._rate_factor = 1.0
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Blocks until one request (and `tokens` tokens) fit within the budget.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        with self._lock:
+            rate_factor = self._rate_factor
+            blocked = max(0.0, self._blocked_until - time.monotonic())
+
+        wait = self._requests.reserve(1, rate_factor)
+        if self._tokens is not None and tokens > 0:
+            wait = max(wait, self._tokens.reserve(tokens, rate_factor))
+        wait = max(wait, blocked)
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def report_throttled(self, retry_after: Optional[float] = None):
+        """
+        Records a 429 from the provider and backs off every caller.
+        """
+        with self._lock:
+            self._backoff = min(_MAX_BACKOFF, max(_BASE_BACKOFF, self._backoff * 2))
+            delay = retry_after if retry_after is not None else self._backoff
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self._rate_factor = max(_MIN_RATE_FACTOR, self._rate_factor * _THROTTLE_DECREASE)
+        print(f"Rate Limit: {self.name} throttled, backing off {delay:.1f}s.")
+
+    def report_ok(self):
+        """
+        Records a non-throttled response, easing the limiter back to full rate.
+        """
+        with self._lock:
+            self._backoff = 0.0
+            self._rate_factor = min(1.0, self._rate_factor + _RECOVERY_STEP)
+
+
+# --- Module Globals ---
+_LIMITERS: Dict[str, ProviderLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """
+    Returns the process-wide limiter for a provider, creating it on first use.
+    """
+    with _LIMITERS_LOCK:
+        if provider not in _LIMITERS:
+            default_rpm, default_tpm = PROVIDER_DEFAULTS.get(provider, (60, 0))
+            prefix = provider.upper()
+            _LIMITERS[provider] = ProviderLimiter(
+                provider,
+                requests_per_minute=max(1, config.env_int(f"{prefix}_RPM", default_rpm)),
+                tokens_per_minute=max(0, config.env_int(f"{prefix}_TPM", default_tpm)),
+            )
+        return _LIMITERS[provider]
+
+def reset_limiters():
+    """
+    Drops all limiters so the next get_limiter() re-reads configuration.
+    """
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token estimate (~4 characters per token) for budget accounting.
+    """
+    return len(text) // 4 + 1
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header given either as seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
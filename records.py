@@ -0,0 +1,212 @@
+import json
+import math
+import sys
+from collections.abc import Sequence
+from json.encoder import encode_basestring
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# --- Layout ---
+# Known keys are packed positionally, in the order the pipeline emits them;
+# anything else is kept in a small `extra` dict so nothing is lost.
+ARTICLE_FIELDS = ("title", "source", "published_at", "url", "text")
+ANALYSIS_FIELDS = ("gist", "sentiment", "tone", "confidence_score")
+VALIDATION_FIELDS = ("is_valid", "reasoning")
+ENTRY_FIELDS = ("article", "analysis", "validation", "cluster_id", "validation_policy", "latency_seconds")
+LATENCY_FIELDS = ("analysis", "validation")
+_SENTIMENT = ANALYSIS_FIELDS.index("sentiment")
+
+# Low-cardinality strings shared by thousands of records: stored once.
+_INTERNED = frozenset(("source", "sentiment", "tone", "validation_policy"))
+
+
+class _Missing:
+    """
+    Marks a known key absent from the packed mapping (distinct from a None value).
+    """
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+_MISSING = _Missing()
+
+
+def intern_label(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _pack(mapping: Dict, fields: Tuple[str, ...]) -> Tuple[tuple, Optional[Dict]]:
+    values = tuple(
+        intern_label(mapping.get(name, _MISSING)) if name in _INTERNED else mapping.get(name, _MISSING)
+        for name in fields
+    )
+    extra = {k: v for k, v in mapping.items() if k not in fields} or None
+    if extra and "topics" in extra:
+        extra["topics"] = [intern_label(t) for t in extra["topics"]]
+    return values, extra
+
+def _unpack(values: tuple, extra: Optional[Dict], fields: Tuple[str, ...]) -> Dict:
+    mapping = {name: value for name, value in zip(fields, values) if value is not _MISSING}
+    if extra:
+        mapping.update(extra)
+    return mapping
+
+_SCALAR_JSON = {None: "null", True: "true", False: "false"}
+
+def _value_json(value: Any, indent: Optional[int], level: int) -> str:
+    # Fast paths for the scalars records mostly hold; json.dumps for the rest
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is None or value is True or value is False:
+        return _SCALAR_JSON[value]
+    if type(value) is int or (type(value) is float and math.isfinite(value)):
+        return repr(value)
+    text = json.dumps(value, ensure_ascii=False, indent=indent)
+    # Nested containers: shift json's own line breaks to this depth
+    return text.replace("\n", "\n" + " " * (indent * level)) if indent and level else text
+
+def _object_json(pairs: List[Tuple[str, str]], indent: Optional[int], level: int) -> str:
+    """
+    A JSON object from (key, serialized value) pairs, laid out exactly as
+    json.dumps(..., indent=indent) would at nesting depth `level`.
+    """
+    if not pairs:
+        return "{}"
+    if indent is None:
+        return "{" + ", ".join(f"{encode_basestring(k)}: {v}" for k, v in pairs) + "}"
+    pad = " " * (indent * (level + 1))
+    body = ",\n".join(f"{pad}{encode_basestring(k)}: {v}" for k, v in pairs)
+    return "{\n" + body + "\n" + " " * (indent * level) + "}"
+
+def _packed_json(values: tuple, extra: Optional[Dict], fields: Tuple[str, ...], indent: Optional[int], level: int) -> str:
+    """
+    JSON text of _unpack(values, extra, fields), written from the packed values.
+    """
+    pairs = [(name, _value_json(value, indent, level + 1)) for name, value in zip(fields, values) if value is not _MISSING]
+    if extra:
+        pairs.extend((name, _value_json(value, indent, level + 1)) for name, value in extra.items())
+    return _object_json(pairs, indent, level)
+
+
+class ResultRecord:
+    """
+    One pipeline entry packed into a single slotted object: the article,
+    analysis and validation become tuples instead of dicts, labels are
+    interned, and latencies are plain attributes.
+
+    to_entry() rebuilds the entry dict with the same keys and values, in
+    the pipeline's key order (ENTRY_FIELDS, then any other keys). to_json()
+    writes the JSON text of that dict straight from the packed fields,
+    without building it.
+    """
+
+    __slots__ = (
+        "article", "article_extra", "analysis", "analysis_extra", "validation", "validation_extra",
+        "cluster_id", "validation_policy", "analysis_seconds", "validation_seconds", "entry_extra",
+    )
+
+    def __init__(self, entry: Dict):
+        self.article, self.article_extra = _pack(entry["article"], ARTICLE_FIELDS)
+        self.analysis, self.analysis_extra = _pack(entry["analysis"], ANALYSIS_FIELDS)
+        validation = entry.get("validation", _MISSING)
+        if validation is None or validation is _MISSING:
+            self.validation, self.validation_extra = validation, None
+        else:
+            self.validation, self.validation_extra = _pack(validation, VALIDATION_FIELDS)
+        self.cluster_id = entry.get("cluster_id", _MISSING)
+        self.validation_policy = intern_label(entry.get("validation_policy", _MISSING))
+        extra = {k: v for k, v in entry.items() if k not in ENTRY_FIELDS}
+        latency = entry.get("latency_seconds", _MISSING)
+        if isinstance(latency, dict) and tuple(latency) == LATENCY_FIELDS:
+            self.analysis_seconds, self.validation_seconds = latency["analysis"], latency["validation"]
+        else:
+            # Absent or unusual: kept as-is (and rebuilt after the known keys)
+            self.analysis_seconds = self.validation_seconds = _MISSING
+            if latency is not _MISSING:
+                extra["latency_seconds"] = latency
+        self.entry_extra = extra or None
+
+    def to_entry(self) -> Dict:
+        entry = {"article": _unpack(self.article, self.article_extra, ARTICLE_FIELDS)}
+        entry["analysis"] = _unpack(self.analysis, self.analysis_extra, ANALYSIS_FIELDS)
+        if self.validation is None or self.validation is _MISSING:
+            entry["validation"] = self.validation
+        else:
+            entry["validation"] = _unpack(self.validation, self.validation_extra, VALIDATION_FIELDS)
+        entry["cluster_id"] = self.cluster_id
+        entry["validation_policy"] = self.validation_policy
+        if self.analysis_seconds is not _MISSING:
+            entry["latency_seconds"] = {"analysis": self.analysis_seconds, "validation": self.validation_seconds}
+        if self.entry_extra:
+            entry.update(self.entry_extra)
+        return {k: v for k, v in entry.items() if v is not _MISSING}
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """
+        Same text as json.dumps(self.to_entry(), ensure_ascii=False, indent=indent).
+        """
+        pairs = [
+            ("article", _packed_json(self.article, self.article_extra, ARTICLE_FIELDS, indent, 1)),
+            ("analysis", _packed_json(self.analysis, self.analysis_extra, ANALYSIS_FIELDS, indent, 1)),
+        ]
+        if self.validation is None:
+            pairs.append(("validation", "null"))
+        elif self.validation is not _MISSING:
+            pairs.append(("validation", _packed_json(self.validation, self.validation_extra, VALIDATION_FIELDS, indent, 1)))
+        if self.cluster_id is not _MISSING:
+            pairs.append(("cluster_id", _value_json(self.cluster_id, indent, 1)))
+        if self.validation_policy is not _MISSING:
+            pairs.append(("validation_policy", _value_json(self.validation_policy, indent, 1)))
+        if self.analysis_seconds is not _MISSING:
+            latency = _object_json(
+                [("analysis", _value_json(self.analysis_seconds, indent, 2)),
+                 ("validation", _value_json(self.validation_seconds, indent, 2))],
+                indent, 1,
+            )
+            pairs.append(("latency_seconds", latency))
+        if self.entry_extra:
+            pairs.extend((name, _value_json(value, indent, 1)) for name, value in self.entry_extra.items())
+        return _object_json(pairs, indent, 0)
+
+    def article_json(self, indent: Optional[int] = None) -> str:
+        """
+        Same text as json.dumps(self.to_entry()["article"], ensure_ascii=False, indent=indent).
+        """
+        return _packed_json(self.article, self.article_extra, ARTICLE_FIELDS, indent, 0)
+
+
+class ResultBatch(Sequence):
+    """
+    In-memory results of a run, held as ResultRecords.
+
+    Reads as a sequence of ordinary entry dicts, each rebuilt on access,
+    so callers written for a list of entries keep working while only the
+    compact records stay resident.
+    """
+
+    def __init__(self, entries: Iterable[Dict] = ()):
+        self._records: List[ResultRecord] = []
+        for entry in entries:
+            self.append(entry)
+
+    def append(self, entry: Dict):
+        self._records.append(ResultRecord(entry))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [record.to_entry() for record in self._records[index]]
+        return self._records[index].to_entry()
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (record.to_entry() for record in self._records)
+
+    def records(self) -> Iterator[ResultRecord]:
+        return iter(self._records)
+
+    def sentiments(self) -> Iterator[Any]:
+        """
+        Every entry's analysis sentiment, without rebuilding the entries.
+        """
+        return (r.analysis[_SENTIMENT] for r in self._records)
@@ -0,0 +1,249 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from string import Template
+from typing import Dict, Iterable, List, Tuple
+
+import config
+from result_sink import render_article
+from run_ledger import article_key
+from validation_policy import SKIP
+
+# --- Configuration ---
+DEFAULT_REPORTS_PATH = Path("output") / "reports"
+# Articles per shard file; a busy day spills into <day>-p2.md, <day>-p3.md, ...
+DEFAULT_PAGE_SIZE = 200
+UNKNOWN_DAY = "unknown"
+SENTIMENTS = ("Positive", "Negative", "Neutral")
+
+# --- Templates ---
+_SHARD_HEADER = Template("# News Analysis Report: $day (page $page)\n")
+_INDEX = Template("""# News Analysis Report
+**Updated:** $updated
+**Articles Analyzed:** $total
+**Source:** NewsAPI
+
+## Summary
+- Positive: $positive articles
+- Negative: $negative articles
+- Neutral: $neutral articles
+
+## Validation
+- Correct: $valid
+- Flagged: $flagged
+- Not required (policy): $not_required
+- Skipped: $skipped
+
+## By Source
+| Source | Articles | Positive | Negative | Neutral | Flagged |
+|---|---|---|---|---|---|
+$source_rows
+
+## Daily Reports
+$day_links
+""")
+
+
+def _empty_aggregates() -> Dict:
+    return {
+        "total": 0,
+        "sentiment": dict.fromkeys(SENTIMENTS, 0),
+        "validation": {"valid": 0, "flagged": 0, "not_required": 0, "skipped": 0},
+        "sources": {},
+    }
+
+
+class ReportEngine:
+    """
+    Incrementally maintained Markdown reports over all accumulated results.
+
+    Running aggregates (sentiment, validation outcome, per-source counts)
+    and the set of reported articles live in SQLite. Adding entries only
+    appends their sections to per-day shard files and rewrites the small
+    index (whose size depends on sources and days, not articles), so a
+    refresh costs time proportional to the new articles.
+    """
+
+    def __init__(self, root: Path = DEFAULT_REPORTS_PATH, page_size: int = DEFAULT_PAGE_SIZE):
+        self.root = Path(root)
+        self.page_size = max(1, page_size)
+        (self.root / "days").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode: updates open their transaction explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(
+            str(self.root / "report_state.sqlite3"), check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS articles (
+                key TEXT PRIMARY KEY,
+                day TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS days (
+                day TEXT PRIMARY KEY,
+                articles INTEGER NOT NULL
+            );
+            """
+        )
+
+    @classmethod
+    def from_env(cls) -> "ReportEngine":
+        return cls(page_size=config.env_int("REPORT_PAGE_SIZE", DEFAULT_PAGE_SIZE))
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.md"
+
+    def shard_path(self, day: str, page: int = 1) -> Path:
+        return self.root / "days" / (f"{day}.md" if page == 1 else f"{day}-p{page}.md")
+
+    def aggregates(self) -> Dict:
+        with self._lock:
+            return self._read_aggregates()
+
+    def _read_aggregates(self) -> Dict:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'aggregates'").fetchone()
+        return json.loads(row[0]) if row else _empty_aggregates()
+
+    @contextmanager
+    def _transaction(self):
+        """
+        BEGIN IMMEDIATE takes the write lock before the aggregates are read,
+        so two concurrent adds (threads or processes) cannot both fold into
+        the same stale copy and lose each other's counts.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    # --- Updates ---
+
+    def add(self, entries: Iterable[Dict]) -> int:
+        """
+        Folds new entries into the aggregates and appends their sections to
+        the day shards. Articles already reported are skipped. Returns the
+        number of articles added.
+        """
+        sections: Dict[Tuple[str, int], List[str]] = {}
+
+        with self._lock:
+            with self._transaction():
+                aggregates = self._read_aggregates()
+                added = self._stage(entries, aggregates, sections)
+                if not added:
+                    return 0
+
+                # Shards are appended before the state commits: a crash in between
+                # may repeat these sections on the next refresh, but never drops them
+                for (day, page), chunks in sections.items():
+                    path = self.shard_path(day, page)
+                    is_new = not path.exists()
+                    with open(path, "a", encoding="utf-8") as f:
+                        if is_new:
+                            f.write(_SHARD_HEADER.substitute(day=day, page=page))
+                        f.write("\n" + "\n".join(chunks))
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('aggregates', ?)", (json.dumps(aggregates),)
+                )
+                days = self._conn.execute("SELECT day, articles FROM days ORDER BY day DESC").fetchall()
+                # Written while the write lock is held, so an older index never replaces a newer one
+                self._write_index(aggregates, days)
+        return added
+
+    def _stage(self, entries: Iterable[Dict], aggregates: Dict, sections: Dict[Tuple[str, int], List[str]]) -> int:
+        """
+        Records new articles in the open transaction and renders their sections. Caller holds the lock.
+        """
+        added = 0
+        for item in entries:
+            key = article_key(item["article"])
+            if self._conn.execute("SELECT 1 FROM articles WHERE key = ?", (key,)).fetchone():
+                continue
+            published_at = item["article"].get("published_at")
+            day = published_at[:10] if published_at else UNKNOWN_DAY
+
+            row = self._conn.execute("SELECT articles FROM days WHERE day = ?", (day,)).fetchone()
+            day_count = (row[0] if row else 0) + 1
+            self._conn.execute("INSERT OR REPLACE INTO days (day, articles) VALUES (?, ?)", (day, day_count))
+            self._conn.execute("INSERT INTO articles (key, day) VALUES (?, ?)", (key, day))
+
+            self._fold(aggregates, item)
+            page = (day_count - 1) // self.page_size + 1
+            sections.setdefault((day, page), []).append(render_article(day_count, item))
+            added += 1
+
+        return added
+
+    @staticmethod
+    def _fold(aggregates: Dict, item: Dict):
+        sentiment = item["analysis"]["sentiment"]
+        validation = item["validation"]
+        source = aggregates["sources"].setdefault(
+            item["article"].get("source") or "Unknown", {"articles": 0, **dict.fromkeys(SENTIMENTS, 0), "flagged": 0}
+        )
+
+        aggregates["total"] += 1
+        source["articles"] += 1
+        if sentiment in aggregates["sentiment"]:
+            aggregates["sentiment"][sentiment] += 1
+            source[sentiment] += 1
+        if not validation and item.get("validation_policy") == SKIP:
+            # Aggregates saved before validation policies existed lack this key
+            aggregates["validation"]["not_required"] = aggregates["validation"].get("not_required", 0) + 1
+        elif not validation:
+            aggregates["validation"]["skipped"] += 1
+        elif validation["is_valid"]:
+            aggregates["validation"]["valid"] += 1
+        else:
+            aggregates["validation"]["flagged"] += 1
+            source["flagged"] += 1
+
+    def _write_index(self, aggregates: Dict, days: List[Tuple[str, int]]):
+        source_rows = "\n".join(
+            f"| {name} | {s['articles']} | {s['Positive']} | {s['Negative']} | {s['Neutral']} | {s['flagged']} |"
+            for name, s in sorted(aggregates["sources"].items(), key=lambda kv: -kv[1]["articles"])
+        )
+        day_links = "\n".join(
+            f"- {day}: {count} articles — "
+            + ", ".join(
+                f"[page {page}](days/{self.shard_path(day, page).name})"
+                for page in range(1, (count - 1) // self.page_size + 2)
+            )
+            for day, count in days
+        )
+        content = _INDEX.substitute(
+            updated=datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
+            total=aggregates["total"],
+            positive=aggregates["sentiment"]["Positive"],
+            negative=aggregates["sentiment"]["Negative"],
+            neutral=aggregates["sentiment"]["Neutral"],
+            valid=aggregates["validation"]["valid"],
+            flagged=aggregates["validation"]["flagged"],
+            not_required=aggregates["validation"].get("not_required", 0),
+            skipped=aggregates["validation"]["skipped"],
+            source_rows=source_rows,
+            day_links=day_links,
+        )
+        # Atomic swap so a reader never sees a half-written index
+        tmp_path = self.index_path.with_suffix(".md.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, self.index_path)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
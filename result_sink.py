@@ -0,0 +1,217 @@
+import datetime
+import json
+import os
+import textwrap
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Union
+
+import config
+from records import ResultBatch, ResultRecord
+from validation_policy import SKIP
+
+# --- Configuration ---
+# Entries are flushed to the OS on every write (survives a process crash);
+# fsync (survives power loss) is batched every N entries and on close.
+DEFAULT_FSYNC_EVERY = 10
+
+EntrySource = Union[Path, Iterable[Dict]]
+
+
+class JsonlSink:
+    """
+    Append-only JSON Lines writer for aggregated pipeline entries.
+
+    Each entry (article/analysis/validation) is one line, written as soon as
+    it is produced, so a crash mid-run keeps everything finished so far.
+    """
+
+    def __init__(self, path: Path, fsync_every: int = DEFAULT_FSYNC_EVERY):
+        self.path = Path(path)
+        self.fsync_every = max(1, fsync_every)
+        self.count = 0
+        self._unsynced = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    @classmethod
+    def from_env(cls, path: Path) -> "JsonlSink":
+        return cls(path, fsync_every=config.env_int("RESULTS_FSYNC_EVERY", DEFAULT_FSYNC_EVERY))
+
+    def write(self, entry: Union[Dict, ResultRecord]):
+        # A packed record serializes itself, without rebuilding the entry dict
+        line = entry.to_json() if isinstance(entry, ResultRecord) else json.dumps(entry, ensure_ascii=False)
+        self._file.write(line + "\n")
+        self._file.flush()
+        self.count += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_entries(path: Path) -> Iterator[Dict]:
+    """
+    Streams entries back from a JSONL file, one line at a time.
+    A torn final line (crash mid-write) is skipped rather than fatal.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Warning: Skipping malformed line in {path}.")
+
+def _entries(source: EntrySource) -> Iterator[Dict]:
+    # A Path is re-read from disk on every pass; anything else is iterated as-is
+    return iter_entries(source) if isinstance(source, Path) else iter(source)
+
+def _article_texts(source: EntrySource) -> Iterator[str]:
+    # A ResultBatch writes its packed records directly, without rebuilding dicts
+    if isinstance(source, ResultBatch):
+        return (record.article_json(indent=2) for record in source.records())
+    return (json.dumps(item["article"], indent=2, ensure_ascii=False) for item in _entries(source))
+
+def _entry_texts(source: EntrySource) -> Iterator[str]:
+    if isinstance(source, ResultBatch):
+        return (record.to_json(indent=2) for record in source.records())
+    return (json.dumps(item, indent=2, ensure_ascii=False) for item in _entries(source))
+
+def _sentiments(source: EntrySource) -> Iterator:
+    if isinstance(source, ResultBatch):
+        return source.sentiments()
+    return (item["analysis"]["sentiment"] for item in _entries(source))
+
+def _write_json_array(texts: Iterable[str], path: Path):
+    """
+    Writes a JSON array one element at a time from each element's
+    indent=2 JSON text, byte-identical to json.dump(list, indent=2) but
+    without materializing the list.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        first = True
+        for text in texts:
+            f.write("\n" if first else ",\n")
+            f.write(textwrap.indent(text, "  "))
+            first = False
+        f.write("]" if first else "\n]")
+
+def _write_report(source: EntrySource, md_path: Path):
+    """
+    Renders the Markdown report in two streaming passes: stats, then details.
+    """
+    # Calculate Stats
+    total = 0
+    stats = {"Positive": 0, "Negative": 0, "Neutral": 0}
+    for sentiment in _sentiments(source):
+        total += 1
+        if sentiment in stats:
+            stats[sentiment] += 1
+
+    # Build Report Content
+    current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write("\n".join([
+            "# News Analysis Report",
+            f"**Date:** {current_time}",
+            f"**Articles Analyzed:** {total}",
+            "**Source:** NewsAPI",
+            "",
+            "## Summary",
+            f"- Positive: {stats['Positive']} articles",
+            f"- Negative: {stats['Negative']} articles",
+            f"- Neutral: {stats['Neutral']} articles",
+            "",
+            "## Detailed Analysis"
+        ]))
+
+        for i, item in enumerate(_entries(source), 1):
+            f.write("\n" + render_article(i, item))
+
+def render_article(i: int, item: Dict) -> str:
+    """
+    The Markdown section for one entry (shared with report_engine's shards).
+    """
+    art = item["article"]
+    anl = item["analysis"]
+    val = item["validation"]
+
+    lines = [
+        f"### Article {i}: \"{art['title']}\"",
+        f"- **Source:** {art['source']} ([Link]({art['url']}))",
+        f"- **Gist:** {anl['gist']}",
+        f"- **Tone:** {anl['tone']}",
+        f"- **LLM#1 Sentiment:** {anl['sentiment']} (Conf: {anl['confidence_score']})",
+    ]
+    if val:
+        icon = "✓" if val["is_valid"] else "⚠️"
+        status = "Correct" if val["is_valid"] else "Flagged"
+        lines.append(f"- **LLM#2 Validation:** {icon} {status}. {val['reasoning']}")
+    elif item.get("validation_policy") == SKIP:
+        lines.append("- **LLM#2 Validation:** ➖ Not required (confident analysis, validation policy)")
+    else:
+        lines.append("- **LLM#2 Validation:** ❓ Skipped (Timeout/Error)")
+    lines.append("")
+    return "\n".join(lines)
+
+def render_views(source: EntrySource, output_dir: Path = Path("output")) -> bool:
+    """
+    Derives the classic output files from a result stream:
+    1. Raw articles to raw_articles.json (REQUIRED BY PDF)
+    2. Full analysis to analysis_results.json
+    3. Human-readable report to final_report.md
+
+    Args:
+        source: A JSONL results file (streamed, memory stays flat) or an
+            in-memory iterable of entries that can be iterated repeatedly.
+        output_dir: Where the view files are written.
+
+    Returns:
+        True only if every view was written.
+    """
+    saved = True
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    raw_path = output_dir / "raw_articles.json"
+    try:
+        _write_json_array(_article_texts(source), raw_path)
+        print(f"💾 Raw articles saved to: {raw_path}")
+    except IOError as e:
+        print(f"❌ Error saving raw JSON: {e}")
+        saved = False
+
+    json_path = output_dir / "analysis_results.json"
+    try:
+        _write_json_array(_entry_texts(source), json_path)
+        print(f"💾 Analysis results saved to: {json_path}")
+    except IOError as e:
+        print(f"❌ Error saving analysis JSON: {e}")
+        saved = False
+
+    md_path = output_dir / "final_report.md"
+    try:
+        _write_report(source, md_path)
+        print(f"📄 Report generated at: {md_path}")
+    except IOError as e:
+        print(f"❌ Error saving Markdown: {e}")
+        saved = False
+
+    return saved
@@ -0,0 +1,209 @@
+import argparse
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from result_sink import iter_entries
+
+# --- Configuration ---
+DEFAULT_ARCHIVE_PATH = Path("output") / "archive"
+# Rows per record batch when writing; bounds memory for very large runs.
+BATCH_ROWS = 50_000
+UNKNOWN_DAY = "unknown"
+
+_DAY_DIR = re.compile(r"^day=(.+)$")
+
+# --- Module Globals ---
+# Optional dependency, imported by the first ResultArchive: only the archive
+# needs it, and loading it on every pipeline start costs tens of milliseconds.
+pa = None
+pc = None
+
+def _load_pyarrow():
+    global pa, pc
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.compute
+        except ImportError:
+            raise ImportError("The results archive needs pyarrow: pip install pyarrow") from None
+        pa, pc = pyarrow, pyarrow.compute
+
+
+def _schema():
+    return pa.schema([
+        ("run_id", pa.string()),
+        ("day", pa.string()),
+        ("published_at", pa.string()),
+        ("title", pa.string()),
+        ("source", pa.string()),
+        ("url", pa.string()),
+        ("sentiment", pa.string()),
+        ("tone", pa.string()),
+        ("confidence_score", pa.float64()),
+        ("is_valid", pa.bool_()),
+        ("cluster_id", pa.int64()),
+        ("analysis_seconds", pa.float64()),
+        ("validation_seconds", pa.float64()),
+    ])
+
+def flatten(entry: Dict, run_id: str) -> Dict:
+    """
+    One archive row per pipeline entry. `is_valid` is null when validation was skipped.
+    """
+    article, analysis = entry["article"], entry["analysis"]
+    validation = entry.get("validation") or {}
+    latency = entry.get("latency_seconds") or {}
+    published_at = article.get("published_at")
+    return {
+        "run_id": run_id,
+        "day": published_at[:10] if published_at else UNKNOWN_DAY,
+        "published_at": published_at,
+        "title": article.get("title"),
+        "source": article.get("source"),
+        "url": article.get("url"),
+        "sentiment": analysis.get("sentiment"),
+        "tone": analysis.get("tone"),
+        "confidence_score": analysis.get("confidence_score"),
+        "is_valid": validation.get("is_valid"),
+        "cluster_id": entry.get("cluster_id"),
+        "analysis_seconds": latency.get("analysis"),
+        "validation_seconds": latency.get("validation"),
+    }
+
+
+class ResultArchive:
+    """
+    Append-only columnar history of every run, as Arrow IPC files
+    partitioned by publication day: <root>/day=YYYY-MM-DD/<run-id>.arrow.
+
+    Files are uncompressed so reads are memory-mapped and zero-copy; a query
+    only touches the day partitions it asks for. Aggregates run on Arrow's
+    vectorized compute kernels.
+    """
+
+    def __init__(self, root: Path = DEFAULT_ARCHIVE_PATH):
+        _load_pyarrow()
+        self.root = Path(root)
+
+    # --- Writing ---
+
+    def append_run(self, entries: Iterable[Dict], run_id: str) -> int:
+        """
+        Flattens a run's entries into its day partitions. Returns rows written.
+        Re-archiving the same run_id replaces that run's files.
+        """
+        schema = _schema()
+        writers = {}
+        pending: Dict[str, List[Dict]] = defaultdict(list)
+        written = 0
+
+        def flush(day: str):
+            if day not in writers:
+                path = self.root / f"day={day}" / f"{run_id}.arrow"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                writers[day] = pa.ipc.new_file(str(path), schema)
+            writers[day].write_batch(pa.RecordBatch.from_pylist(pending.pop(day), schema=schema))
+
+        try:
+            for entry in entries:
+                row = flatten(entry, run_id)
+                pending[row["day"]].append(row)
+                written += 1
+                if len(pending[row["day"]]) >= BATCH_ROWS:
+                    flush(row["day"])
+            for day in list(pending):
+                flush(day)
+        finally:
+            for writer in writers.values():
+                writer.close()
+        return written
+
+    def append_stream(self, stream_path: Path, run_id: Optional[str] = None) -> int:
+        """
+        Archives a run's JSONL results stream (run id defaults to the file stem).
+        """
+        return self.append_run(iter_entries(stream_path), run_id or stream_path.stem)
+
+    # --- Reading ---
+
+    def days(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(m.group(1) for m in (_DAY_DIR.match(p.name) for p in self.root.iterdir()) if m)
+
+    def table(self, start: Optional[str] = None, end: Optional[str] = None, columns: Optional[Sequence[str]] = None):
+        """
+        Memory-mapped rows for days in [start, end] (inclusive ISO dates; None = open).
+        """
+        tables = []
+        for day in self.days():
+            if (start and day < start) or (end and day > end):
+                continue
+            for path in sorted((self.root / f"day={day}").glob("*.arrow")):
+                with pa.memory_map(str(path), "r") as source:
+                    table = pa.ipc.open_file(source).read_all()
+                tables.append(table.select(list(columns)) if columns else table)
+        if not tables:
+            schema = _schema()
+            return schema.empty_table().select(list(columns)) if columns else schema.empty_table()
+        return pa.concat_tables(tables)
+
+    # --- Queries ---
+
+    def sentiment_by(self, keys: Sequence[str] = ("source",), start: Optional[str] = None, end: Optional[str] = None):
+        """
+        Article count and mean confidence per key(s) and sentiment, e.g.
+        keys=("source",) or ("day",).
+        """
+        table = self.table(start, end, columns=[*keys, "sentiment", "confidence_score"])
+        grouped = table.group_by([*keys, "sentiment"]).aggregate([
+            ("sentiment", "count"),
+            ("confidence_score", "mean"),
+        ])
+        return pa.table({
+            **{key: grouped[key] for key in (*keys, "sentiment")},
+            "articles": grouped["sentiment_count"],
+            "mean_confidence": grouped["confidence_score_mean"],
+        }).sort_by([(key, "ascending") for key in (*keys, "sentiment")])
+
+    def disagreement_rate(self, keys: Sequence[str] = (), start: Optional[str] = None, end: Optional[str] = None):
+        """
+        Share of validated articles the validator flagged (is_valid = false),
+        overall or per key(s). Skipped validations are excluded.
+        """
+        table = self.table(start, end, columns=[*keys, "is_valid"])
+        table = table.filter(pc.is_valid(table["is_valid"]))
+        table = table.append_column("flagged", pc.cast(pc.invert(table["is_valid"]), pa.int64()))
+        grouped = table.group_by(list(keys)).aggregate([("flagged", "sum"), ("flagged", "count")])
+        rate = pc.divide(pc.cast(grouped["flagged_sum"], pa.float64()), grouped["flagged_count"])
+        return pa.table({
+            **{key: grouped[key] for key in keys},
+            "validated": grouped["flagged_count"],
+            "flagged": grouped["flagged_sum"],
+            "disagreement_rate": rate,
+        })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the columnar results archive.")
+    parser.add_argument("--archive", type=Path, default=DEFAULT_ARCHIVE_PATH)
+    parser.add_argument("--start", help="First day (YYYY-MM-DD).")
+    parser.add_argument("--end", help="Last day (YYYY-MM-DD).")
+    queries = parser.add_subparsers(dest="query", required=True)
+    sentiment_parser = queries.add_parser("sentiment", help="Sentiment counts per key.")
+    sentiment_parser.add_argument("--by", action="append", default=None, help="Group key (repeatable); default source.")
+    disagreement_parser = queries.add_parser("disagreement", help="Validator disagreement rate.")
+    disagreement_parser.add_argument("--by", action="append", default=[], help="Group key (repeatable).")
+    import_parser = queries.add_parser("import", help="Archive an existing results stream.")
+    import_parser.add_argument("stream", type=Path)
+    args = parser.parse_args()
+
+    archive = ResultArchive(args.archive)
+    if args.query == "sentiment":
+        print(archive.sentiment_by(args.by or ["source"], args.start, args.end))
+    elif args.query == "disagreement":
+        print(archive.disagreement_rate(args.by, args.start, args.end))
+    else:
+        print(f"🗄️  Archived {archive.append_stream(args.stream)} rows from {args.stream}")
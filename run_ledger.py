@@ -0,0 +1,145 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+# --- Stages ---
+FETCHED = "fetched"
+ANALYZED = "analyzed"
+VALIDATED = "validated"
+FAILED = "failed"
+
+
+def article_key(article: Dict) -> str:
+    """
+    Stable identity for an article within a run: its URL, or a text hash if it has none.
+    """
+    if article.get("url"):
+        return article["url"]
+    return "sha256:" + hashlib.sha256(article["text"].encode("utf-8")).hexdigest()
+
+
+class RunLedger:
+    """
+    Per-run record of each article's pipeline stage, stored in SQLite.
+
+    Every transition (fetched -> analyzed -> validated, or failed with a
+    reason) is committed as it happens, together with the payload produced so
+    far. A resumed run replays the ledger, reusing finished stages and
+    retrying only failed or missing work.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS articles (
+                key TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                stage TEXT NOT NULL,
+                article TEXT NOT NULL,
+                cluster_id INTEGER,
+                analysis TEXT,
+                validation TEXT,
+                decision TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL
+            );
+            """
+        )
+        if "decision" not in {row[1] for row in self._conn.execute("PRAGMA table_info(articles)")}:
+            # Ledger written before validation policy decisions were recorded
+            self._conn.execute("ALTER TABLE articles ADD COLUMN decision TEXT")
+        self._conn.commit()
+
+    # --- Run metadata ---
+
+    def set_meta(self, key: str, value):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+            self._conn.commit()
+
+    def get_meta(self, key: str, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    # --- Stage transitions ---
+
+    def _update(self, key: str, stage: str, **fields):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        values = list(fields.values())
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE articles SET stage = ?, updated_at = ?{', ' + columns if columns else ''} WHERE key = ?",
+                [stage, time.time(), *values, key],
+            )
+            self._conn.commit()
+
+    def record_fetched(self, article: Dict, position: int, cluster_id: Optional[int] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO articles (key, position, stage, article, cluster_id, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (article_key(article), position, FETCHED, json.dumps(article, ensure_ascii=False), cluster_id, time.time()),
+            )
+            self._conn.commit()
+
+    def record_analyzed(self, article: Dict, analysis: Dict):
+        self._update(article_key(article), ANALYZED, analysis=json.dumps(analysis, ensure_ascii=False), error=None)
+
+    def record_validated(self, article: Dict, validation: Dict, decision: Optional[str] = None):
+        self._update(
+            article_key(article), VALIDATED,
+            validation=json.dumps(validation, ensure_ascii=False), decision=decision, error=None,
+        )
+
+    def record_failed(self, article: Dict, reason: str):
+        self._update(article_key(article), FAILED, error=reason)
+
+    def record_validation_skipped(self, article: Dict, reason: str, decision: Optional[str] = None):
+        # Stays "analyzed" so a resume retries only the validation
+        self._update(article_key(article), ANALYZED, decision=decision, error=reason)
+
+    # --- Replay ---
+
+    def records(self) -> Iterator[Dict]:
+        """
+        Yields every recorded article in fetch order with its stage, payloads
+        and the validation policy decision made for it (None if none was).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, article, cluster_id, analysis, validation, decision, error "
+                "FROM articles ORDER BY position"
+            ).fetchall()
+        for stage, article, cluster_id, analysis, validation, decision, error in rows:
+            yield {
+                "stage": stage,
+                "article": json.loads(article),
+                "cluster_id": cluster_id,
+                "analysis": json.loads(analysis) if analysis else None,
+                "validation": json.loads(validation) if validation else None,
+                "decision": decision,
+                "error": error,
+            }
+
+    def stage_counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT stage, COUNT(*) FROM articles GROUP BY stage").fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
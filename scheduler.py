@@ -0,0 +1,183 @@
+import argparse
+import datetime
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from dotenv import load_dotenv
+
+import config
+import main
+import metrics
+import news_fetcher
+from checkpoints import CheckpointStore
+from enricher import Enricher
+from result_sink import JsonlSink, render_views
+from run_ledger import article_key
+
+
+class TopicSpec(NamedTuple):
+    topic: str
+    limit: int
+    # Articles admitted per round-robin turn: its share of the shared LLM quota
+    priority: int = 1
+
+
+def parse_topic(value: str) -> TopicSpec:
+    """
+    Parses "TOPIC[:LIMIT[:PRIORITY]]"; the topic itself may contain colons.
+    """
+    parts = value.split(":")
+    numbers: List[int] = []
+    while len(parts) > 1 and len(numbers) < 2 and parts[-1].strip().isdigit():
+        numbers.insert(0, int(parts.pop()))
+    limit = numbers[0] if numbers else 10
+    priority = numbers[1] if len(numbers) > 1 else 1
+    return TopicSpec(":".join(parts), limit, max(1, priority))
+
+def load_topics(path: Path) -> List[TopicSpec]:
+    """
+    Reads a JSON list of {"topic", "limit", "priority"} objects.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return [
+            TopicSpec(item["topic"], int(item.get("limit", 10)), max(1, int(item.get("priority", 1))))
+            for item in json.load(f)
+        ]
+
+
+class TopicMerger:
+    """
+    Merges the NewsAPI streams of several topics into one pipeline source.
+
+    Topics are interleaved by weighted round-robin: each turn admits up to
+    `priority` articles from every active topic. The pipeline only pulls
+    new articles as Gemini/Mistral capacity frees up, so admission order
+    is how the shared LLM quota is divided.
+
+    An article matching several topics is admitted once; its `topics`
+    list gains every topic that matched, and `membership` records the
+    complete topic -> article keys mapping for the run.
+    """
+
+    def __init__(self, specs: List[TopicSpec], checkpoints: Optional[CheckpointStore] = None):
+        self.specs = specs
+        self.checkpoints = checkpoints
+        self.membership: Dict[str, List[str]] = {spec.topic: [] for spec in specs}
+        self.coverage = {spec.topic: news_fetcher.FetchCoverage() for spec in specs}
+        self.cross_topic_duplicates = 0
+
+    def __iter__(self) -> Iterator[Tuple[Dict, None]]:
+        # Shared by reference with the admitted article, so later matches show up on it
+        admitted_topics: Dict[str, List[str]] = {}
+        streams = {}
+        for spec in self.specs:
+            since = self.checkpoints.get(spec.topic) if self.checkpoints is not None else None
+            streams[spec.topic] = news_fetcher.stream_articles(
+                spec.topic, spec.limit, since=since, coverage=self.coverage[spec.topic]
+            )
+
+        active = sorted(self.specs, key=lambda spec: -spec.priority)
+        while active:
+            for spec in list(active):
+                for _ in range(spec.priority):
+                    article = next(streams[spec.topic], None)
+                    if article is None:
+                        active.remove(spec)
+                        break
+
+                    key = article_key(article)
+                    self.membership[spec.topic].append(key)
+                    if key in admitted_topics:
+                        if spec.topic not in admitted_topics[key]:
+                            admitted_topics[key].append(spec.topic)
+                        self.cross_topic_duplicates += 1
+                        metrics.incr("scheduler.cross_topic_duplicates")
+                        continue
+
+                    topics = [spec.topic]
+                    admitted_topics[key] = topics
+                    yield {**article, "topics": topics}, None
+
+
+def run_scheduled(
+    specs: List[TopicSpec],
+    output_dir: Path = Path("output"),
+    checkpoints: Optional[CheckpointStore] = None,
+    enricher: Optional[Enricher] = None,
+    **options,
+) -> Optional[Path]:
+    """
+    Runs every topic through one pipeline in this process, so all topics
+    share the NewsAPI session, the Gemini model, the OpenRouter session,
+    the rate limiters, the caches and the worker pools.
+
+    Writes output/runs/<run-id>.jsonl (entries tagged with `topics`),
+    <run-id>.topics.json (full topic membership) and <run-id>.metrics.json,
+    commits every topic's checkpoint, then renders the usual views.
+    Accepts the same options as main.iter_pipeline.
+
+    Returns:
+        Path of the results stream, or None if nothing was produced.
+    """
+    runs_dir = output_dir / "runs"
+    run_id = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    stream_path = runs_dir / f"{run_id}.jsonl"
+    label = f"{len(specs)} topics"
+    print(f"🗂️  Scheduled run {run_id} | " + ", ".join(f"{s.topic} (limit {s.limit}, priority {s.priority})" for s in specs))
+
+    merger = TopicMerger(specs, checkpoints)
+    source = merger if enricher is None else ((a, None) for a in enricher.stream(a for a, _ in merger))
+    try:
+        with JsonlSink.from_env(stream_path) as sink:
+            for entry in main.iter_pipeline(
+                label, sum(s.limit for s in specs), checkpoints=checkpoints, source=source,
+                coverage=merger.coverage, **options
+            ):
+                sink.write(entry)
+    finally:
+        metrics_path = runs_dir / f"{run_id}.metrics.json"
+        metrics.REGISTRY.write_json(metrics_path)
+        print(f"📊 Metrics saved to: {metrics_path}")
+
+    print(f"🔗 {merger.cross_topic_duplicates} articles matched more than one topic and were analyzed once.")
+    with open(runs_dir / f"{run_id}.topics.json", "w", encoding="utf-8") as f:
+        json.dump(merger.membership, f, indent=2, ensure_ascii=False)
+
+    if sink.count == 0:
+        stream_path.unlink(missing_ok=True)
+        return None
+
+    print(f"💾 Results stream saved to: {stream_path}")
+    if checkpoints is not None:
+        checkpoints.commit()
+    if options.get("dedup") is not None:
+        options["dedup"].commit()
+
+    render_views(stream_path, output_dir)
+    return stream_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run many topics over shared clients and quotas.")
+    parser.add_argument("--topics-file", type=Path, help='JSON list of {"topic", "limit", "priority"}.')
+    parser.add_argument("--topic", action="append", default=[], metavar="TOPIC[:LIMIT[:PRIORITY]]")
+    args = parser.parse_args()
+
+    specs = (load_topics(args.topics_file) if args.topics_file else []) + [parse_topic(t) for t in args.topic]
+    if not specs:
+        parser.error("give at least one --topic or a --topics-file")
+
+    # Load environment variables
+    load_dotenv()
+
+    metrics_port = config.env_int("METRICS_PORT", 0)
+    if metrics_port:
+        metrics.REGISTRY.serve(metrics_port)
+        print(f"📈 Prometheus metrics at http://127.0.0.1:{metrics_port}/metrics")
+
+    run_scheduled(
+        specs,
+        checkpoints=CheckpointStore(),
+        **main.pipeline_options_from_env(),
+    )
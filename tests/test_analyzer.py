@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import MagicMock, patch
 from llm_analyzer import analyze_article, NewsAnalysis
@@ -17,12 +18,14 @@ def mock_env():
 @pytest.fixture(autouse=True)
 def reset_singleton():
     """
-    Crucial: Resets the global _MODEL singleton in llm_analyzer before each test.
+    Crucial: Resets the global per-template model cache in llm_analyzer before each test.
     Ensures that mocks do not leak between test cases.
     """
-    llm_analyzer._MODEL = None
+    llm_analyzer._MODELS.clear()
+    llm_analyzer._PREFIX_CACHED.clear()
     yield
-    llm_analyzer._MODEL = None
+    llm_analyzer._MODELS.clear()
+    llm_analyzer._PREFIX_CACHED.clear()
 
 # --- Test Cases ---
 
@@ -105,4 +108,169 @@ def test_analyze_article_api_failure(mock_configure, mock_model_class):
     # 3. Assertions
     assert result is None
     # Verify we actually tried to call it
-    mock_instance.generate_content.assert_called_once()
\ No newline at end of file
+    mock_instance.generate_content.assert_called_once()
+
+@patch("llm_analyzer.genai.GenerativeModel")
+@patch("llm_analyzer.genai.configure")
+def test_analyze_article_cache_hit_skips_api(mock_configure, mock_model_class, tmp_path):
+    """
+    Test Case 4: Persistent Cache
+    Goal: Verify a second analysis of the same text is served from cache without calling Gemini.
+    """
+    from llm_cache import ResultCache
+
+    mock_instance = MagicMock()
+    mock_instance.generate_content.return_value.text = (
+        '{"gist": "Cached gist.", "sentiment": "Neutral", "tone": "Analytical", "confidence_score": 0.8}'
+    )
+    mock_model_class.return_value = mock_instance
+    cache = ResultCache(tmp_path / "cache.sqlite3")
+
+    text = "This is a sufficiently long text that will be analyzed exactly once."
+    first = analyze_article(text, cache=cache)
+    second = analyze_article(text, cache=cache)
+
+    assert first == second
+    mock_instance.generate_content.assert_called_once()
+    assert cache.stats()["hits"] == {"analysis": 1}
+
+
+@patch("llm_analyzer.genai.GenerativeModel")
+@patch("llm_analyzer.genai.configure")
+def test_analyze_batch_retries_missing_items(mock_configure, mock_model_class):
+    """
+    Test Case 5: Batched Analysis
+    Goal: Verify one request covers the batch and only the article missing from the reply is retried alone.
+    """
+    batch_reply = MagicMock()
+    batch_reply.text = """[
+        {"id": 0, "gist": "First.", "sentiment": "Positive", "tone": "Upbeat", "confidence_score": 0.9},
+        {"id": 2, "gist": "Third.", "sentiment": "Negative", "tone": "Urgent", "confidence_score": 0.7}
+    ]"""
+    single_reply = MagicMock()
+    single_reply.text = '{"gist": "Second.", "sentiment": "Neutral", "tone": "Dry", "confidence_score": 0.6}'
+
+    mock_instance = MagicMock()
+    mock_instance.generate_content.side_effect = [batch_reply, single_reply]
+    mock_model_class.return_value = mock_instance
+
+    texts = [f"Article number {i} with enough text to pass the fifty character guard." for i in range(3)]
+    results = llm_analyzer.analyze_batch(texts)
+
+    assert [r.gist for r in results] == ["First.", "Second.", "Third."]
+    assert mock_instance.generate_content.call_count == 2
+    # The retry prompt carries only the missing article
+    retry_prompt = mock_instance.generate_content.call_args_list[1][0][0]
+    assert texts[1] in retry_prompt and texts[0] not in retry_prompt
+
+
+def test_plan_batches_respects_token_budget():
+    """
+    Test Case 6: Adaptive Batch Size
+    Goal: Verify short snippets share a batch while long texts are split off.
+    """
+    short = "x" * 200   # ~51 tokens + output overhead
+    long = "y" * 8000   # ~2001 tokens + output overhead
+
+    assert llm_analyzer.plan_batches([short] * 5, token_budget=1000) == [[0, 1, 2, 3, 4]]
+    assert llm_analyzer.plan_batches([short, long, short], token_budget=1000) == [[0], [1], [2]]
+
+class _Chunk:
+    """
+    Minimal stand-in for a streamed Gemini chunk; text=None simulates a safety block.
+    """
+    def __init__(self, text):
+        self._text = text
+        self.usage_metadata = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            raise ValueError("blocked")
+        return self._text
+
+def _stream_model(pieces, consumed):
+    async def chunks():
+        for piece in pieces:
+            consumed.append(piece)
+            yield _Chunk(piece)
+
+    async def generate_content_async(prompt, stream=False):
+        return chunks()
+
+    model = MagicMock()
+    model.generate_content_async = generate_content_async
+    return model
+
+def test_analyze_article_async_parses_split_stream_and_stops_early():
+    """
+    Test Case 7: Streamed Reply
+    Goal: Verify JSON split across chunks is parsed and reading stops once the object closes.
+    """
+    consumed = []
+    pieces = [
+        '```json\n{"gist": "Rates were cut {sharply}.", ',
+        '"sentiment": "Positive", "tone": "Upbeat", ',
+        '"confidence_score": 0.9}',
+        '\n```',
+        "trailing chunk that must never be read",
+    ]
+    with patch("llm_analyzer._get_model", return_value=_stream_model(pieces, consumed)):
+        text = "This is a sufficiently long text regarding the new finance bill in India."
+        result = asyncio.run(llm_analyzer.analyze_article_async(text))
+
+    assert result is not None
+    assert result.gist == "Rates were cut {sharply}."
+    assert result.sentiment == "Positive"
+    assert len(consumed) == 3
+
+@pytest.mark.parametrize("pieces", [
+    ["Sure! Here is the analysis: ", '{"gist": "x"}'],
+    ['{"gist": "x", "sentiment": "Bullish", ', '"tone": "x", "confidence_score": 0.5}'],
+    ['{"gist": "x", "sentiment": "Neutral", "tone": "x", "confidence_score": 7, ', '}'],
+    [None, '{"gist": "x"}'],
+])
+def test_analyze_article_async_fails_fast(pieces):
+    """
+    Test Case 8: Fail-Fast Rejection
+    Goal: Verify a preamble, bad label, out-of-range score or safety block aborts after the first chunk.
+    """
+    consumed = []
+    with patch("llm_analyzer._get_model", return_value=_stream_model(pieces, consumed)):
+        text = "This is a sufficiently long text regarding the new finance bill in India."
+        result = asyncio.run(llm_analyzer.analyze_article_async(text))
+
+    assert result is None
+    assert len(consumed) == 1
+
+@patch("llm_analyzer.genai.GenerativeModel")
+@patch("llm_analyzer.genai.configure")
+def test_concurrent_first_calls_create_one_context_cache(mock_configure, mock_model_class):
+    """
+    Test Case 9: Model Initialization Race
+    Goal: Verify threads asking for the same template at once share one model
+    and create its Gemini context cache exactly once.
+    """
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    env = {"GEMINI_API_KEY": "fake_test_key", "PROMPT_CONTEXT_CACHE": "1"}
+    start = threading.Barrier(8)
+
+    def slow_create(**kwargs):
+        time.sleep(0.05)  # Widens the window a racing thread would slip through
+        return MagicMock()
+
+    def get_model(_):
+        start.wait()
+        return llm_analyzer._get_model()
+
+    with patch("llm_analyzer.os.getenv", side_effect=lambda name, default=None: env.get(name, default)), \
+         patch("llm_analyzer.caching.CachedContent.create", side_effect=slow_create) as mock_create:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            models = list(pool.map(get_model, range(8)))
+
+    assert mock_create.call_count == 1
+    assert mock_configure.call_count == 1
+    assert all(model is models[0] for model in models)
@@ -0,0 +1,108 @@
+from checkpoints import CheckpointStore, compute_high_water_mark
+
+# --- Test Cases ---
+
+def test_high_water_mark_prefers_newest_success():
+    """
+    Test Case 1: Clean Run
+    Goal: Assert the mark is the newest processed article, URL included.
+    """
+    succeeded = [
+        {"published_at": "2024-01-01T10:00:00Z", "url": "a"},
+        {"published_at": "2024-01-01T12:00:00Z", "url": "b"},
+    ]
+    assert compute_high_water_mark(succeeded, []) == {"published_at": "2024-01-01T12:00:00Z", "url": "b"}
+
+
+def test_high_water_mark_stops_at_oldest_failure():
+    """
+    Test Case 2: Partial Failure
+    Goal: Assert a failed article holds the mark back so it is fetched again next run.
+    """
+    succeeded = [{"published_at": "2024-01-01T12:00:00Z", "url": "b"}]
+    failed = [{"published_at": "2024-01-01T11:00:00Z", "url": "x"}]
+    assert compute_high_water_mark(succeeded, failed) == {"published_at": "2024-01-01T11:00:00Z", "url": None}
+
+
+def test_truncated_fetch_walks_back_before_advancing():
+    """
+    Test Case 3: Limit-Truncated Fetch
+    Goal: Assert a fetch that stopped at its limit keeps the old lower bound
+    and records the unfetched gap, and the mark only advances to the newest
+    processed article once a later fetch of that gap runs out.
+    """
+    previous = {"published_at": "2024-01-01T00:00:00Z", "url": "old"}
+    succeeded = [
+        {"published_at": "2024-01-05T00:00:00Z", "url": "e"},
+        {"published_at": "2024-01-04T00:00:00Z", "url": "d"},
+    ]
+
+    truncated = compute_high_water_mark(
+        succeeded, [], previous=previous, exhausted=False, oldest="2024-01-04T00:00:00Z"
+    )
+    assert truncated == {
+        "published_at": "2024-01-01T00:00:00Z",
+        "url": "old",
+        "until": "2024-01-04T00:00:00Z",
+        "newest": {"published_at": "2024-01-05T00:00:00Z", "url": "e"},
+    }
+
+    # Still more left in the gap: the window shrinks, the target is kept
+    older = [{"published_at": "2024-01-03T00:00:00Z", "url": "c"}]
+    still_truncated = compute_high_water_mark(
+        older, [], previous=truncated, exhausted=False, oldest="2024-01-03T00:00:00Z"
+    )
+    assert still_truncated["published_at"] == "2024-01-01T00:00:00Z"
+    assert still_truncated["until"] == "2024-01-03T00:00:00Z"
+    assert still_truncated["newest"]["url"] == "e"
+
+    # The gap ran out: advance past everything processed
+    caught_up = compute_high_water_mark(
+        [{"published_at": "2024-01-02T00:00:00Z", "url": "b"}], [], previous=still_truncated, exhausted=True
+    )
+    assert caught_up == {"published_at": "2024-01-05T00:00:00Z", "url": "e"}
+
+
+def test_first_run_stopped_early_advances_without_backfill():
+    """
+    Test Case 4: Early-Stopped First Run
+    Goal: Assert a first run with no lower bound to walk back to advances to
+    its newest article, so later runs fetch new stories instead of walking
+    ever further into the past.
+    """
+    succeeded = [
+        {"published_at": "2024-01-05T00:00:00Z", "url": "e"},
+        {"published_at": "2024-01-04T00:00:00Z", "url": "d"},
+    ]
+    first_run = compute_high_water_mark(succeeded, [], previous=None, exhausted=False, oldest="2024-01-04T00:00:00Z")
+    assert first_run == {"published_at": "2024-01-05T00:00:00Z", "url": "e"}
+    next_run = compute_high_water_mark(
+        [{"published_at": "2024-01-06T00:00:00Z", "url": "f"}], [], previous=first_run, exhausted=True
+    )
+    assert next_run == {"published_at": "2024-01-06T00:00:00Z", "url": "f"}
+
+    # A mark already stored without a lower bound heals on the next run
+    stale = {"published_at": None, "url": None, "until": "2024-01-04T08:00:00Z"}
+    assert compute_high_water_mark(succeeded, [], previous=stale, exhausted=False, oldest="2024-01-04T00:00:00Z") == first_run
+
+
+def test_store_commits_only_on_request(tmp_path):
+    """
+    Test Case 5: Durable Advance
+    Goal: Assert staged marks are invisible until committed, persist across instances, and never regress.
+    """
+    path = tmp_path / "checkpoints.json"
+    store = CheckpointStore(path)
+    mark = {"published_at": "2024-01-01T12:00:00Z", "url": "b"}
+
+    store.stage("topic", mark)
+    assert store.get("topic") is None
+    assert not path.exists()
+
+    store.commit("topic")
+    reloaded = CheckpointStore(path)
+    assert reloaded.get("topic") == mark
+
+    reloaded.stage("topic", {"published_at": "2023-12-31T00:00:00Z", "url": "old"})
+    reloaded.commit("topic")
+    assert CheckpointStore(path).get("topic") == mark
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+# --- Fixtures ---
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    """
+    Every test starts with closed process-wide breakers.
+    """
+    circuit_breaker.reset_breakers()
+    yield
+    circuit_breaker.reset_breakers()
+
+def _outage(error):
+    return isinstance(error, TimeoutError)
+
+def _call(breaker, error=None):
+    with breaker.guard(_outage):
+        if error is not None:
+            raise error
+
+# --- Test Cases ---
+
+def test_opens_on_error_rate_then_recovers_through_half_open():
+    """
+    Test Case 1: State Machine
+    Goal: Verify the breaker opens once the error rate is reached over enough
+    calls, fails fast while open, and a half-open probe decides recovery.
+    """
+    breaker = CircuitBreaker("gemini", min_calls=4, error_rate=0.5, open_seconds=0.05)
+
+    _call(breaker)
+    _call(breaker)
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            _call(breaker, TimeoutError())
+    assert breaker.state == OPEN
+
+    start = time.perf_counter()
+    with pytest.raises(CircuitOpenError) as rejected:
+        _call(breaker)
+    assert time.perf_counter() - start < 0.01
+    assert rejected.value.provider == "gemini" and rejected.value.retry_after > 0
+
+    # Half-open: a failed probe re-opens, a successful one closes
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(TimeoutError):
+        _call(breaker, TimeoutError())
+    assert breaker.state == OPEN
+
+    assert circuit_breaker.wait_until_allowed([], max_wait=1) == 0
+    time.sleep(0.06)
+    breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()  # Only one probe in flight
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+def test_non_outage_errors_do_not_trip():
+    """
+    Test Case 2: Outage Classification
+    Goal: Verify errors that mean the provider answered (bad output,
+    throttling) count as successes, and old failures leave the window.
+    """
+    breaker = CircuitBreaker("openrouter", window_seconds=0.05, min_calls=3, error_rate=0.5)
+
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            _call(breaker, ValueError("unparseable reply"))
+    assert breaker.state == CLOSED
+
+    with pytest.raises(TimeoutError):
+        _call(breaker, TimeoutError())
+    time.sleep(0.06)
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            _call(breaker, TimeoutError())
+    # Everything before the sleep left the window: 2 calls are below min_calls
+    assert breaker.state == CLOSED
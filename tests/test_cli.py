@@ -0,0 +1,62 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import cli
+from benchmarks import startup_budget
+
+# --- Fixtures ---
+
+def _articles(n):
+    return [
+        {"title": f"Story {i}", "source": "Test", "published_at": f"2026-01-0{i + 1}T00:00:00Z",
+         "url": f"https://example.com/{i}", "text": f"Article body {i} " * 10}
+        for i in range(n)
+    ]
+
+def _model(payload):
+    model = MagicMock()
+    model.model_dump.return_value = payload
+    return model
+
+# --- Test Cases ---
+
+def test_light_commands_skip_provider_sdks():
+    """
+    Test Case 1: Lazy Imports
+    Goal: Assert fetch and report start without the Gemini SDK or pydantic,
+    validate without the Gemini SDK, and no command loads pyarrow unless the
+    results archive is enabled, in a fresh interpreter.
+    """
+    for command in ("fetch", "report", "validate", "run"):
+        _, modules, loaded = startup_budget.measure(command)
+        assert "cli" in modules
+        assert not set(loaded) & set(startup_budget.FORBIDDEN_MODULES[command]), command
+
+
+def test_stages_chain_through_files(tmp_path, monkeypatch):
+    """
+    Test Case 2: Stage Subcommands
+    Goal: Assert fetch -> analyze -> validate -> report hand results over
+    through JSONL files and end in the usual report views.
+    """
+    monkeypatch.chdir(tmp_path)
+    analysis = {"gist": "g", "sentiment": "neutral", "tone": "factual", "confidence_score": 0.9}
+    validation = {"is_valid": True, "reasoning": "ok"}
+    out = ["--output-dir", str(tmp_path)]
+
+    with patch("news_fetcher.stream_articles", return_value=iter(_articles(2))):
+        assert cli.main(out + ["fetch", "--topic", "x", "--limit", "2"]) == 0
+    # The second article fails analysis (keyed by text: calls run on a pool)
+    analyze = lambda text, cache=None: _model(analysis) if text.startswith("Article body 0") else None
+    with patch("llm_analyzer.analyze_article", side_effect=analyze):
+        assert cli.main(out + ["analyze"]) == 0
+    with patch("llm_validator.validate_analysis", return_value=_model(validation)) as mock_validate:
+        assert cli.main(out + ["validate"]) == 0
+    assert mock_validate.call_count == 1  # The failed analysis was dropped
+    assert cli.main(out + ["report", str(tmp_path / cli.VALIDATED_FILE)]) == 0
+
+    entries = json.loads((tmp_path / "analysis_results.json").read_text(encoding="utf-8"))
+    assert [e["article"]["title"] for e in entries] == ["Story 0"]
+    assert entries[0]["analysis"] == analysis and entries[0]["validation"] == validation
+    assert entries[0]["latency_seconds"]["validation"] is not None
+    assert (tmp_path / "final_report.md").exists()
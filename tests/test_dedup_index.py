@@ -0,0 +1,136 @@
+import pytest
+from dedup_index import DedupIndex, normalize_text, minhash
+
+# --- Fixtures ---
+
+@pytest.fixture
+def index(tmp_path):
+    """
+    A fresh on-disk dedup index per test.
+    """
+    idx = DedupIndex(tmp_path / "dedup.sqlite3")
+    yield idx
+    idx.close()
+
+STORY = (
+    "The Union Cabinet on Wednesday approved a new scheme to expand rural broadband "
+    "connectivity across twelve states, with funding of 4,000 crore over five years, "
+    "officials said after the meeting in New Delhi."
+)
+
+# --- Test Cases ---
+
+def test_exact_url_and_content_matches(index):
+    """
+    Test Case 1: Exact Stage
+    Goal: Assert the same URL, or the same text under a different URL, lands in the original cluster.
+    """
+    cluster_id, kind = index.assign("https://a.com/story", STORY)
+    assert kind is None
+
+    assert index.assign("https://a.com/story", "Completely different text.") == (cluster_id, "url")
+    assert index.assign("https://b.com/copy", STORY + " [+2716 chars]") == (cluster_id, "content")
+
+
+def test_near_duplicate_syndicated_copy(index):
+    """
+    Test Case 2: Near-Duplicate Stage
+    Goal: Assert a lightly edited syndicated copy is clustered, while an unrelated story is not.
+    """
+    cluster_id, _ = index.assign("https://wire.com/1", STORY)
+
+    edited = STORY.replace("officials said", "officials told reporters")
+    assert index.assign("https://paper.com/2", edited) == (cluster_id, "near")
+
+    other = "Monsoon rainfall in Kerala was forty percent above normal this week, flooding low lying districts near Kochi and Alappuzha."
+    other_cluster, kind = index.assign("https://paper.com/3", other)
+    assert kind is None and other_cluster != cluster_id
+
+
+def test_discard_makes_story_eligible_again(index):
+    """
+    Test Case 3: Failure Recovery
+    Goal: Assert a discarded cluster is no longer reported as a duplicate.
+    """
+    cluster_id, _ = index.assign("https://a.com/story", STORY)
+    index.discard(cluster_id)
+
+    _, kind = index.assign("https://a.com/story", STORY)
+    assert kind is None
+    assert len(index) == 1
+
+
+def test_staged_entries_wait_for_commit(tmp_path):
+    """
+    Test Case 4: Crash Safety
+    Goal: Assert a run's new entries stay invisible to later runs until it
+    commits them, so a crashed run's articles are analyzed again next time,
+    and that a resumed run can adopt and commit them.
+    """
+    path = tmp_path / "dedup.sqlite3"
+    crashed = DedupIndex(path)
+    cluster_id, _ = crashed.assign("https://a.com/story", STORY)
+    assert crashed.assign("https://a.com/story", STORY) == (cluster_id, "url")  # Within the run
+    crashed.close()
+
+    rerun = DedupIndex(path)
+    assert rerun.assign("https://a.com/story", STORY)[1] is None
+    rerun.close()
+
+    resumed = DedupIndex(path)
+    resumed.adopt(cluster_id)
+    resumed.commit()
+    resumed.close()
+
+    later = DedupIndex(path)
+    assert later.assign("https://b.com/copy", STORY) == (cluster_id, "content")
+    later.close()
+
+
+def test_abandoned_staged_entries_are_purged(tmp_path):
+    """
+    Test Case 5: Abandoned Runs
+    Goal: Assert entries staged by a run that never committed are deleted
+    (with their LSH bands) once older than the TTL, while recent staged and
+    committed entries are kept.
+    """
+    import sqlite3
+    import time
+
+    path = tmp_path / "dedup.sqlite3"
+    committed = DedupIndex(path)
+    committed.assign("https://a.com/kept", STORY)
+    committed.commit()
+    committed.close()
+
+    abandoned = DedupIndex(path)
+    old_story = "Parliament passed the revised data protection bill after a long debate on privacy safeguards."
+    assert abandoned.assign("https://b.com/old", old_story)[1] is None
+    abandoned.close()
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("UPDATE entries SET added_at = ? WHERE run IS NOT NULL", (time.time() - 7200,))
+
+    recent = DedupIndex(path)
+    new_story = "A different story about monsoon rainfall in Kerala and flood warnings for the coast."
+    assert recent.assign("https://c.com/new", new_story)[1] is None
+    recent.close()
+
+    reopened = DedupIndex(path, staged_ttl=3600)
+    assert len(reopened) == 2
+    with sqlite3.connect(str(path)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM bands WHERE entry_id NOT IN (SELECT id FROM entries)").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM entries WHERE run IS NOT NULL").fetchone()[0] == 1
+    reopened.close()
+
+
+def test_simhash_skips_short_text():
+    """
+    Test Case 6: Fingerprint Guard
+    Goal: Assert snippets too short to fingerprint reliably only use the exact
+    stages, and long bodies are fingerprinted by their lead only.
+    """
+    assert minhash(normalize_text("Skip to comments")) is None
+    assert minhash(normalize_text(STORY)) is not None
+
+    lead = " ".join(f"word{i}" for i in range(100))
+    assert minhash(lead + " and a long tail that is never shingled" * 50) == minhash(lead)
@@ -0,0 +1,129 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from enricher import BodyCache, Enricher, extract_text
+
+# --- Fixtures ---
+
+PAGE = """
+<html><head><title>t</title><script>var tracking = "not article text at all, ignore me";</script></head>
+<body>
+  <nav><p>Home | World | Business | Markets | Opinion | Subscribe to our newsletter</p></nav>
+  <article>
+    <h1>Government overhauls customs duty rules for exporters</h1>
+    <p>The Indian government today notified a major change in customs rules to help smaller businesses.</p>
+    <p>Exporters will now be able to claim duty benefits online within &amp; across ports, officials said.</p>
+    <p>Share</p>
+  </article>
+  <footer><p>Copyright 2026 Example Media. All rights reserved worldwide.</p></footer>
+</body></html>
+"""
+
+@pytest.fixture
+def server():
+    """
+    Local publisher: serves PAGE with an ETag (304 on a matching If-None-Match)
+    and records request count and peak concurrency.
+    """
+    state = {"requests": 0, "active": 0, "peak": 0, "delay": 0.0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                state["requests"] += 1
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(state["delay"])
+            with lock:
+                state["active"] -= 1
+
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = PAGE.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", state
+    httpd.shutdown()
+
+def _article(url):
+    return {"title": "t", "source": "s", "published_at": None, "url": url, "text": "Short snippet… [+952 chars]"}
+
+# --- Test Cases ---
+
+def test_extract_text_keeps_article_paragraphs_only():
+    """
+    Test Case 1: Extraction
+    Goal: Assert the <article> paragraphs are kept and scripts, nav, footer and short fragments dropped.
+    """
+    text = extract_text(PAGE)
+
+    assert text.startswith("Government overhauls customs duty rules")
+    assert "within & across ports" in text
+    assert "tracking" not in text and "Subscribe" not in text and "Copyright" not in text
+    assert "Share" not in text
+
+def test_extract_text_closes_implicit_paragraphs():
+    """
+    Test Case 2: Omitted End Tags
+    Goal: Assert paragraphs whose </p> or </li> is left out (valid HTML) are
+    still kept, including an unclosed last paragraph.
+    """
+    first = "The ministry published the revised tariff schedule."
+    second = "Importers have until March to adjust their filings."
+    assert extract_text(f"<article><p>{first}<p>{second}</p></article>") == f"{first}\n\n{second}"
+    assert extract_text(f"<ul><li>{first}<li>{second}</ul>") == f"{first}\n\n{second}"
+    assert extract_text(f"<body><p>{first}<p>{second}") == f"{first}\n\n{second}"
+
+
+def test_repeat_runs_use_cache_and_revalidate(server, tmp_path):
+    """
+    Test Case 3: Body Cache
+    Goal: Assert a fresh cached body costs no request, and a stale one is
+    revalidated with its ETag (304) instead of re-downloaded.
+    """
+    base_url, state = server
+    cache = BodyCache(tmp_path / "bodies.sqlite3")
+    url = f"{base_url}/story"
+
+    first = Enricher(cache=cache).enrich([_article(url)])[0]
+    assert first["text"].startswith("Government overhauls")
+    assert first["snippet"] == "Short snippet… [+952 chars]"
+
+    Enricher(cache=cache).enrich([_article(url)])
+    assert state["requests"] == 1
+
+    revalidated = Enricher(cache=cache, max_age_seconds=0).enrich([_article(url)])[0]
+    assert state["requests"] == 2
+    assert revalidated["text"] == first["text"]
+
+
+def test_per_host_limit_and_order(server):
+    """
+    Test Case 4: Politeness
+    Goal: Assert concurrency against one host never exceeds per_host, and output keeps input order.
+    """
+    base_url, state = server
+    state["delay"] = 0.05
+    urls = [f"{base_url}/story/{i}" for i in range(6)]
+
+    results = Enricher(workers=6, per_host=2).enrich([_article(url) for url in urls])
+
+    assert [r["url"] for r in results] == urls
+    assert state["peak"] <= 2
+    assert state["requests"] == 6
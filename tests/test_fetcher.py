@@ -1,5 +1,16 @@
 import pytest
-from news_fetcher import _normalize_article
+from unittest.mock import patch, MagicMock
+from news_fetcher import FetchCoverage, _normalize_article, stream_articles
+import news_fetcher
+
+@pytest.fixture(autouse=True)
+def reset_session():
+    """
+    Resets the shared NewsAPI session so each test sees its own patched session.
+    """
+    news_fetcher._SESSION = None
+    yield
+    news_fetcher._SESSION = None
 
 def test_normalize_removed_article():
     """
@@ -62,4 +73,111 @@ def test_normalize_valid_article():
     assert result["source"] == "BBC News"
     assert result["text"] == "Full content of the article goes here."
     assert result["url"] == "https://bbc.com/news"
-    assert "published_at" in result
\ No newline at end of file
+    assert "published_at" in result
+
+def _page(urls, total):
+    """
+    Builds a mocked NewsAPI response page with one article per URL.
+    """
+    response = MagicMock(status_code=200)
+    response.json.return_value = {
+        "totalResults": total,
+        "articles": [
+            {"source": {"name": "Wire"}, "title": f"Story {u}", "url": u,
+             "publishedAt": "2024-01-01T00:00:00Z", "content": f"Body of {u}"}
+            for u in urls
+        ],
+    }
+    return response
+
+
+@patch("news_fetcher.os.getenv", return_value="fake_newsapi_key")
+@patch("news_fetcher._create_retry_session")
+def test_stream_articles_walks_pages_until_limit(mock_session_factory, mock_getenv):
+    """
+    Test Case 4: Pagination
+    Goal: Assert the generator requests successive pages, skips repeated URLs, and stops at the limit.
+    """
+    session = MagicMock()
+    session.get.side_effect = [
+        _page(["u1", "u2"], total=10),
+        _page(["u2", "u3"], total=10),  # u2 shifted onto page 2 as new stories arrived
+        _page(["u4", "u5"], total=10),
+    ]
+    mock_session_factory.return_value = session
+
+    urls = [a["url"] for a in stream_articles("topic", limit=4, page_size=2)]
+
+    assert urls == ["u1", "u2", "u3", "u4"]
+    assert [c.kwargs["params"]["page"] for c in session.get.call_args_list] == [1, 2, 3]
+
+
+@patch("news_fetcher.os.getenv", return_value="fake_newsapi_key")
+@patch("news_fetcher._create_retry_session")
+def test_stream_articles_stops_when_results_run_out(mock_session_factory, mock_getenv):
+    """
+    Test Case 5: Exhaustion
+    Goal: Assert the generator stops after the last page reported by totalResults.
+    """
+    session = MagicMock()
+    session.get.side_effect = [_page(["a", "b"], total=3), _page(["c"], total=3)]
+    mock_session_factory.return_value = session
+
+    assert len(list(stream_articles("topic", limit=50, page_size=2))) == 3
+    assert session.get.call_count == 2
+
+
+@patch("news_fetcher.os.getenv", return_value="fake_newsapi_key")
+@patch("news_fetcher._create_retry_session")
+def test_stream_articles_resumes_from_checkpoint(mock_session_factory, mock_getenv):
+    """
+    Test Case 6: Incremental Fetching
+    Goal: Assert the checkpoint is sent as `from` (its gap bound as `to`), the
+    already-processed article is skipped, and only a walk that runs out counts as covered.
+    """
+    page = _page(["new", "done"], total=2)
+    page.json.return_value["articles"][0]["publishedAt"] = "2024-01-02T00:00:00Z"
+    session = MagicMock()
+    session.get.return_value = page
+    mock_session_factory.return_value = session
+
+    since = {"published_at": "2024-01-01T00:00:00Z", "url": "done"}
+    urls = [a["url"] for a in stream_articles("topic", limit=10, since=since)]
+
+    assert urls == ["new"]
+    assert session.get.call_args.kwargs["params"]["from"] == "2024-01-01T00:00:00Z"
+
+    # A gap left by an earlier truncated walk is fetched with `to`; only running out counts as covered
+    gap = {**since, "until": "2024-01-03T00:00:00Z"}
+    exhausted, truncated = FetchCoverage(), FetchCoverage()
+    list(stream_articles("topic", limit=10, since=gap, coverage=exhausted))
+    assert session.get.call_args.kwargs["params"]["to"] == "2024-01-03T00:00:00Z"
+    list(stream_articles("topic", limit=1, since=gap, coverage=truncated))
+    assert exhausted.exhausted and not truncated.exhausted
+
+
+@patch("news_fetcher.os.getenv", return_value="fake_newsapi_key")
+@patch("news_fetcher._create_retry_session")
+def test_stream_articles_retries_throttled_page(mock_session_factory, mock_getenv):
+    """
+    Test Case 7: Throttled Page
+    Goal: Assert a 429 mid-walk backs off and re-requests the same page
+    instead of ending the stream early.
+    """
+    import rate_limiter
+
+    throttled = MagicMock(status_code=429, headers={"Retry-After": "0"})
+    session = MagicMock()
+    session.get.side_effect = [_page(["a", "b"], total=4), throttled, _page(["c", "d"], total=4)]
+    mock_session_factory.return_value = session
+
+    rate_limiter.reset_limiters()
+    try:
+        coverage = FetchCoverage()
+        urls = [a["url"] for a in stream_articles("topic", limit=10, page_size=2, coverage=coverage)]
+    finally:
+        rate_limiter.reset_limiters()
+
+    assert urls == ["a", "b", "c", "d"]
+    assert [c.kwargs["params"]["page"] for c in session.get.call_args_list] == [1, 2, 2]
+    assert coverage.exhausted
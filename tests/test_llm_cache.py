@@ -0,0 +1,88 @@
+import pytest
+from unittest.mock import patch
+from llm_cache import ResultCache, make_key
+
+# --- Fixtures ---
+
+@pytest.fixture
+def cache(tmp_path):
+    """
+    A fresh on-disk cache per test, small enough to exercise eviction.
+    """
+    c = ResultCache(tmp_path / "cache.sqlite3", ttl_seconds=60, max_entries=2)
+    yield c
+    c.close()
+
+# --- Test Cases ---
+
+def test_make_key_separates_parts():
+    """
+    Test Case 1: Key Derivation
+    Goal: Assert keys change with model/prompt version and parts cannot run together.
+    """
+    base = make_key("text", "gemini-2.5-flash", "v1")
+    assert base == make_key("text", "gemini-2.5-flash", "v1")
+    assert base != make_key("text", "gemini-2.5-pro", "v1")
+    assert base != make_key("text", "gemini-2.5-flash", "v2")
+    assert make_key("ab", "c") != make_key("a", "bc")
+
+
+def test_cache_roundtrip_and_counters(cache):
+    """
+    Test Case 2: Hit/Miss Accounting
+    Goal: Assert a stored payload is returned intact and counted per namespace.
+    """
+    payload = {"is_valid": True, "reasoning": "ok"}
+
+    assert cache.get("validation", "k1") is None
+    cache.put("validation", "k1", payload)
+
+    assert cache.get("validation", "k1") == payload
+    assert cache.stats()["hits"] == {"validation": 1}
+    assert cache.stats()["misses"] == {"validation": 1}
+
+
+def test_cache_ttl_and_lru_eviction(cache):
+    """
+    Test Case 3: Eviction
+    Goal: Assert expired entries miss, and the least recently used entry is dropped at capacity.
+    """
+    with patch("llm_cache.time.time", return_value=1000.0):
+        cache.put("analysis", "old", {"v": 0})
+    with patch("llm_cache.time.time", return_value=1100.0):
+        assert cache.get("analysis", "old") is None  # 100s > 60s TTL
+
+    cache.put("analysis", "a", {"v": 1})
+    cache.put("analysis", "b", {"v": 2})
+    cache.get("analysis", "a")  # Touch "a" so "b" becomes least recently used
+    cache.put("analysis", "c", {"v": 3})
+
+    assert cache.get("analysis", "b") is None
+    assert cache.get("analysis", "a") == {"v": 1}
+    assert cache.get("analysis", "c") == {"v": 3}
+
+
+def test_cache_tracks_row_count_without_scanning(tmp_path):
+    """
+    Test Case 4: Row Count Tracking
+    Goal: Assert put() evicts from a count seeded at open, ignores overwrites, and never runs COUNT(*).
+    """
+    path = tmp_path / "cache.sqlite3"
+    first = ResultCache(path, ttl_seconds=60, max_entries=2)
+    first.put("analysis", "a", {"v": 1})
+    first.put("analysis", "a", {"v": 1.5})  # Overwrite: still one row
+    first.put("analysis", "b", {"v": 2})
+    assert first.stats()["evictions"] == 0
+    first.close()
+
+    reopened = ResultCache(path, ttl_seconds=60, max_entries=2)
+    statements = []
+    reopened._conn.set_trace_callback(statements.append)
+    reopened.get("analysis", "a")  # Touch "a" so "b" becomes least recently used
+    reopened.put("analysis", "c", {"v": 3})
+
+    assert reopened.stats()["evictions"] == 1
+    assert reopened.get("analysis", "a") == {"v": 1.5}
+    assert reopened.get("analysis", "b") is None
+    assert not any("COUNT(" in sql for sql in statements)
+    reopened.close()
@@ -0,0 +1,353 @@
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+import main
+
+# --- Fixtures ---
+
+@pytest.fixture
+def articles():
+    """
+    Five fetched articles whose analysis latency decreases with position,
+    so completion order is the reverse of input order.
+    """
+    return [
+        {"title": f"Article {i}", "source": "Test", "published_at": None,
+         "url": f"https://example.com/{i}", "text": f"text-{i}"}
+        for i in range(5)
+    ]
+
+# --- Test Cases ---
+
+def test_run_pipeline_preserves_input_order(articles):
+    """
+    Test Case 1: Concurrent Ordering
+    Goal: Assert results come back in fetch order even when later articles finish first.
+    """
+    def slow_analysis(text, cache=None):
+        idx = int(text.split("-")[1])
+        time.sleep(0.01 * (5 - idx))
+        analysis = MagicMock()
+        analysis.model_dump.return_value = {"gist": text, "sentiment": "Neutral", "tone": "Flat", "confidence_score": 0.5}
+        return analysis
+
+    validation = MagicMock(is_valid=True)
+    validation.model_dump.return_value = {"is_valid": True, "reasoning": "ok"}
+
+    with patch("main.news_fetcher.stream_articles", return_value=articles), \
+         patch("main.llm_analyzer.analyze_article", side_effect=slow_analysis), \
+         patch("main.llm_validator.validate_analysis", return_value=validation):
+        results = main.run_pipeline("topic", limit=5, analyze_workers=5, validate_workers=2)
+
+    assert [r["article"]["url"] for r in results] == [a["url"] for a in articles]
+    assert [r["analysis"]["gist"] for r in results] == [a["text"] for a in articles]
+
+
+def test_run_pipeline_skips_failed_analysis(articles):
+    """
+    Test Case 2: Partial Failure
+    Goal: Assert a failed Gemini call drops only that article and never reaches the validator.
+    """
+    def flaky_analysis(text, cache=None):
+        if text == "text-2":
+            return None
+        analysis = MagicMock()
+        analysis.model_dump.return_value = {"gist": text}
+        return analysis
+
+    with patch("main.news_fetcher.stream_articles", return_value=articles), \
+         patch("main.llm_analyzer.analyze_article", side_effect=flaky_analysis), \
+         patch("main.llm_validator.validate_analysis", return_value=None) as mock_validate:
+        results = main.run_pipeline("topic", limit=5, analyze_workers=3, validate_workers=3)
+
+    assert len(results) == 4
+    assert all(r["validation"] is None for r in results)
+    assert mock_validate.call_count == 4
+
+
+def test_run_pipeline_batched_analysis(articles):
+    """
+    Test Case 3: Batched Gemini Stage
+    Goal: Assert a token budget routes articles through analyze_batch and keeps order.
+    """
+    def batch_analysis(texts, cache=None, token_budget=0):
+        out = []
+        for text in texts:
+            analysis = MagicMock()
+            analysis.model_dump.return_value = {"gist": text}
+            out.append(analysis)
+        return out
+
+    with patch("main.news_fetcher.stream_articles", return_value=articles), \
+         patch("main.llm_analyzer.analyze_batch", side_effect=batch_analysis) as mock_batch, \
+         patch("main.llm_analyzer.analyze_article") as mock_single, \
+         patch("main.llm_validator.validate_analysis", return_value=None):
+        results = main.run_pipeline("topic", limit=5, batch_token_budget=10_000)
+
+    mock_batch.assert_called_once()
+    mock_single.assert_not_called()
+    assert [r["analysis"]["gist"] for r in results] == [a["text"] for a in articles]
+
+
+def test_run_pipeline_drops_duplicates(articles, tmp_path):
+    """
+    Test Case 4: Deduplication
+    Goal: Assert a repeated story is dropped before analysis and results carry their cluster IDs.
+    """
+    from dedup_index import DedupIndex
+
+    syndicated = dict(articles[0], url="https://mirror.example.com/0")
+    analysis = MagicMock()
+    analysis.model_dump.return_value = {"gist": "g"}
+
+    with patch("main.news_fetcher.stream_articles", return_value=articles + [syndicated]), \
+         patch("main.llm_analyzer.analyze_article", return_value=analysis) as mock_analyze, \
+         patch("main.llm_validator.validate_analysis", return_value=None):
+        results = main.run_pipeline("topic", limit=6, dedup=DedupIndex(tmp_path / "dedup.sqlite3"))
+
+    assert mock_analyze.call_count == 5
+    assert len({r["cluster_id"] for r in results}) == 5
+
+
+def test_run_and_save_commits_checkpoint_after_stream(articles, tmp_path):
+    """
+    Test Case 5: Durable Streaming Output
+    Goal: Assert every entry lands in the JSONL stream and the checkpoint and
+    dedup entries are committed afterwards.
+    """
+    from checkpoints import CheckpointStore
+    from dedup_index import DedupIndex
+    from result_sink import iter_entries
+
+    dated = [dict(a, published_at=f"2024-01-0{i + 1}T00:00:00Z") for i, a in enumerate(articles)]
+    analysis = MagicMock()
+    analysis.model_dump.return_value = {"gist": "g", "sentiment": "Neutral", "tone": "Flat", "confidence_score": 0.5}
+    checkpoints = CheckpointStore(tmp_path / "checkpoints.json")
+
+    def exhausted_stream(topic, limit, since=None, coverage=None):
+        coverage.exhausted = True
+        return iter(dated)
+
+    with patch("main.news_fetcher.stream_articles", side_effect=exhausted_stream), \
+         patch("main.llm_analyzer.analyze_article", return_value=analysis), \
+         patch("main.llm_validator.validate_analysis", return_value=None):
+        stream_path = main.run_and_save(
+            "topic", limit=5, output_dir=tmp_path, checkpoints=checkpoints, dedup=DedupIndex(tmp_path / "dedup.sqlite3")
+        )
+
+    assert [e["article"]["url"] for e in iter_entries(stream_path)] == [a["url"] for a in dated]
+    assert CheckpointStore(tmp_path / "checkpoints.json").get("topic")["published_at"] == "2024-01-05T00:00:00Z"
+    # Saved articles are now known to later runs
+    assert DedupIndex(tmp_path / "dedup.sqlite3").assign(dated[0]["url"], "other text")[1] == "url"
+    assert (tmp_path / "final_report.md").exists()
+
+
+def test_resume_reuses_finished_stages(articles, tmp_path):
+    """
+    Test Case 6: Resumable Runs
+    Goal: Assert a resumed run re-analyzes only failed articles and re-validates only skipped validations.
+    """
+    from run_ledger import RunLedger
+
+    def analysis_for(text, cache=None):
+        analysis = MagicMock()
+        analysis.model_dump.return_value = {"gist": text, "sentiment": "Neutral", "tone": "Flat", "confidence_score": 0.5}
+        return analysis
+
+    def first_run_analysis(text, cache=None):
+        return None if text == "text-1" else analysis_for(text)
+
+    def first_run_validation(text, analysis, cache=None):
+        if text == "text-2":
+            return None  # Timed out
+        validation = MagicMock(is_valid=True)
+        validation.model_dump.return_value = {"is_valid": True, "reasoning": "ok"}
+        return validation
+
+    with patch("main.news_fetcher.stream_articles", return_value=articles), \
+         patch("main.llm_analyzer.analyze_article", side_effect=first_run_analysis), \
+         patch("main.llm_validator.validate_analysis", side_effect=first_run_validation):
+        stream_path = main.run_and_save("topic", limit=5, output_dir=tmp_path)
+
+    run_id = stream_path.stem
+    counts = RunLedger(tmp_path / "runs" / f"{run_id}.ledger.sqlite3").stage_counts()
+    assert counts == {"validated": 3, "analyzed": 1, "failed": 1}
+
+    validation = MagicMock(is_valid=True)
+    validation.model_dump.return_value = {"is_valid": True, "reasoning": "ok"}
+    with patch("main.news_fetcher.stream_articles", return_value=articles) as mock_fetch, \
+         patch("main.llm_analyzer.analyze_article", side_effect=analysis_for) as mock_analyze, \
+         patch("main.llm_validator.validate_analysis", return_value=validation) as mock_validate:
+        main.run_and_save("ignored", limit=0, output_dir=tmp_path, run_id=run_id)
+
+    mock_fetch.assert_not_called()  # The first run finished fetching
+    assert [c.args[0] for c in mock_analyze.call_args_list] == ["text-1"]
+    assert sorted(c.args[0] for c in mock_validate.call_args_list) == ["text-1", "text-2"]
+    assert RunLedger(tmp_path / "runs" / f"{run_id}.ledger.sqlite3").stage_counts() == {"validated": 5}
+
+
+def test_triage_drops_junk_and_short_circuits_gemini(articles):
+    """
+    Test Case 7: Local Triage
+    Goal: Assert dropped articles never reach Gemini, and accepted ones skip Gemini
+    but are still validated.
+    """
+    from triage import Triager, TriageResult, DROP, ACCEPT, ANALYZE
+
+    verdicts = {
+        "text-0": TriageResult(0.1, "Neutral", 0.0, DROP),
+        "text-1": TriageResult(1.0, "Negative", 0.9, ACCEPT),
+    }
+    triager = Triager()
+    triager.classify = lambda texts: [verdicts.get(t, TriageResult(1.0, "Neutral", 0.0, ANALYZE)) for t in texts]
+
+    analysis = MagicMock()
+    analysis.model_dump.return_value = {"gist": "g", "sentiment": "Neutral", "tone": "Flat", "confidence_score": 0.5}
+
+    with patch("main.news_fetcher.stream_articles", return_value=articles), \
+         patch("main.llm_analyzer.analyze_article", return_value=analysis) as mock_analyze, \
+         patch("main.llm_validator.validate_analysis", return_value=None) as mock_validate:
+        results = main.run_pipeline("topic", limit=5, triage=triager)
+
+    assert [r["article"]["url"] for r in results] == [a["url"] for a in articles[1:]]
+    assert results[0]["analysis"]["sentiment"] == "Negative"
+    assert mock_analyze.call_count == 3
+    assert mock_validate.call_count == 4
+
+
+def test_validation_policy_skips_confident_and_escalates_flags(articles):
+    """
+    Test Case 8: Cascading Validation
+    Goal: Assert only low-confidence analyses reach Mistral, and a flagged
+    verdict is re-checked by the escalation model whose verdict is kept.
+    """
+    from llm_validator import ValidationResult
+    from validation_policy import ValidationPolicy, LOW_CONFIDENCE, SKIP
+
+    def analysis_for(text, cache=None):
+        analysis = MagicMock()
+        confidence = 0.5 if text in ("text-1", "text-3") else 0.95
+        analysis.model_dump.return_value = {"gist": text, "sentiment": "Neutral", "tone": "Flat", "confidence_score": confidence}
+        return analysis
+
+    def verdict(text, analysis, cache=None, model=None):
+        if model == "strong/model":
+            return ValidationResult(is_valid=True, reasoning="escalated")
+        return ValidationResult(is_valid=text != "text-3", reasoning="first pass")
+
+    policy = ValidationPolicy(confidence_threshold=0.8, sample_rate=0.0, escalation_model="strong/model")
+    with patch("main.news_fetcher.stream_articles", return_value=articles), \
+         patch("main.llm_analyzer.analyze_article", side_effect=analysis_for), \
+         patch("main.llm_validator.validate_analysis", side_effect=verdict) as mock_validate:
+        results = main.run_pipeline("topic", limit=5, policy=policy)
+
+    assert [r["validation_policy"] for r in results] == [SKIP, LOW_CONFIDENCE, SKIP, LOW_CONFIDENCE, SKIP]
+    assert [r["validation"] is not None for r in results] == [False, True, False, True, False]
+    assert results[3]["validation"]["reasoning"] == "escalated"
+    assert mock_validate.call_count == 3
+    assert policy.summary()["escalation_overturned"] == 1
+
+
+def test_open_breaker_parks_articles_for_retry_pass(articles):
+    """
+    Test Case 9: Circuit Breaker Parking
+    Goal: Assert articles refused by an open breaker are not dropped but
+    analyzed in a retry pass, after the rest of the run.
+    """
+    from circuit_breaker import CircuitOpenError
+
+    refused = set()
+
+    def analysis_for(text, cache=None):
+        if text in ("text-1", "text-2") and text not in refused:
+            refused.add(text)
+            raise CircuitOpenError("gemini", 0.0)
+        analysis = MagicMock()
+        analysis.model_dump.return_value = {"gist": text, "sentiment": "Neutral", "tone": "Flat", "confidence_score": 0.5}
+        return analysis
+
+    validation = MagicMock(is_valid=True)
+    validation.model_dump.return_value = {"is_valid": True, "reasoning": "ok"}
+
+    with patch("main.news_fetcher.stream_articles", return_value=articles), \
+         patch("main.llm_analyzer.analyze_article", side_effect=analysis_for) as mock_analyze, \
+         patch("main.llm_validator.validate_analysis", return_value=validation):
+        results = main.run_pipeline("topic", limit=5, analyze_workers=1, validate_workers=1)
+
+    assert [r["article"]["url"] for r in results] == [articles[i]["url"] for i in (0, 3, 4, 1, 2)]
+    assert all(r["validation"]["is_valid"] for r in results)
+    assert mock_analyze.call_count == 7
+
+
+def test_resume_keeps_validation_policy_decisions(articles, tmp_path):
+    """
+    Test Case 10: Resumed Policy Decisions
+    Goal: Assert a resumed run reports the policy decision recorded for each
+    article, without validating or re-rolling any of them again.
+    """
+    from llm_validator import ValidationResult
+    from result_sink import iter_entries
+    from validation_policy import ValidationPolicy, LOW_CONFIDENCE, SKIP
+
+    def analysis_for(text, cache=None):
+        analysis = MagicMock()
+        confidence = 0.5 if text in ("text-1", "text-3") else 0.95
+        analysis.model_dump.return_value = {"gist": text, "sentiment": "Neutral", "tone": "Flat", "confidence_score": confidence}
+        return analysis
+
+    policy = ValidationPolicy(confidence_threshold=0.8, sample_rate=0.0)
+    with patch("main.news_fetcher.stream_articles", return_value=articles), \
+         patch("main.llm_analyzer.analyze_article", side_effect=analysis_for), \
+         patch("main.llm_validator.validate_analysis", return_value=ValidationResult(is_valid=True, reasoning="ok")):
+        stream_path = main.run_and_save("topic", limit=5, output_dir=tmp_path, policy=policy)
+
+    expected = [SKIP, LOW_CONFIDENCE, SKIP, LOW_CONFIDENCE, SKIP]
+    assert [e["validation_policy"] for e in iter_entries(stream_path)] == expected
+
+    # Everything would be audited if the resume decided again
+    resumed_policy = ValidationPolicy(confidence_threshold=0.8, sample_rate=1.0)
+    with patch("main.llm_analyzer.analyze_article") as mock_analyze, \
+         patch("main.llm_validator.validate_analysis") as mock_validate:
+        resumed = main.run_and_save("ignored", limit=0, output_dir=tmp_path, run_id=stream_path.stem, policy=resumed_policy)
+
+    mock_analyze.assert_not_called()
+    mock_validate.assert_not_called()
+    assert [e["validation_policy"] for e in iter_entries(resumed)] == expected
+
+
+def test_resume_retries_validation_under_the_recorded_decision(articles, tmp_path):
+    """
+    Test Case 11: Resumed Validation Retries
+    Goal: Assert a validation that timed out before the crash is retried under
+    the decision recorded for it, not re-decided by the resumed run's policy.
+    """
+    from llm_validator import ValidationResult
+    from result_sink import iter_entries
+    from validation_policy import ValidationPolicy, SOURCE_RISK
+
+    def analysis_for(text, cache=None):
+        analysis = MagicMock()
+        analysis.model_dump.return_value = {"gist": text, "sentiment": "Neutral", "tone": "Flat", "confidence_score": 0.95}
+        return analysis
+
+    def first_run_validation(text, analysis, cache=None):
+        return None if text == "text-2" else ValidationResult(is_valid=True, reasoning="ok")
+
+    # Every confident "Test" article is validated for its source risk
+    risky = ValidationPolicy(confidence_threshold=0.8, sample_rate=0.0, source_risk={"Test": 1.0})
+    with patch("main.news_fetcher.stream_articles", return_value=articles), \
+         patch("main.llm_analyzer.analyze_article", side_effect=analysis_for), \
+         patch("main.llm_validator.validate_analysis", side_effect=first_run_validation):
+        stream_path = main.run_and_save("topic", limit=5, output_dir=tmp_path, policy=risky)
+
+    # The resumed run's policy would skip everything if it decided again
+    lenient = ValidationPolicy(confidence_threshold=0.8, sample_rate=0.0)
+    with patch("main.llm_validator.validate_analysis",
+               return_value=ValidationResult(is_valid=True, reasoning="retried")) as mock_validate:
+        resumed = main.run_and_save("ignored", limit=0, output_dir=tmp_path, run_id=stream_path.stem, policy=lenient)
+
+    assert [c.args[0] for c in mock_validate.call_args_list] == ["text-2"]
+    entries = list(iter_entries(resumed))
+    assert [e["validation_policy"] for e in entries] == [SOURCE_RISK] * 5
+    assert entries[2]["validation"]["reasoning"] == "retried"
+    assert lenient.summary()["skip"] == 0
@@ -0,0 +1,72 @@
+import urllib.request
+import pytest
+from metrics import MetricsRegistry
+
+# --- Fixtures ---
+
+@pytest.fixture
+def registry():
+    """
+    An isolated registry so tests never see the process-wide metrics.
+    """
+    return MetricsRegistry()
+
+# --- Test Cases ---
+
+def test_span_percentiles_and_errors(registry):
+    """
+    Test Case 1: Latency Histograms
+    Goal: Assert p50/p95/p99 are nearest-rank over observed latencies and failed spans count as errors.
+    """
+    for ms in range(1, 101):
+        registry.observe("gemini.generate", ms / 1000)
+
+    with pytest.raises(RuntimeError):
+        with registry.span("gemini.generate"):
+            raise RuntimeError("boom")
+
+    snapshot = registry.snapshot()["spans"]["gemini.generate"]
+    assert snapshot["count"] == 101
+    assert snapshot["errors"] == 1
+    assert registry.percentile("gemini.generate", 0.5) == pytest.approx(0.050, abs=0.002)
+    assert snapshot["p99"] >= 0.099
+
+
+def test_token_usage_and_cost(registry, monkeypatch):
+    """
+    Test Case 2: Token Accounting
+    Goal: Assert provider token counts accumulate, missing usage is ignored, and cost uses configured prices.
+    """
+    monkeypatch.setenv("GEMINI_PRICE_IN_PER_MTOK", "0.30")
+    monkeypatch.setenv("GEMINI_PRICE_OUT_PER_MTOK", "2.50")
+
+    registry.record_tokens("gemini", 1_000_000, 100_000)
+    registry.record_tokens("gemini", None, None)
+
+    usage = registry.snapshot()["tokens"]["gemini"]
+    assert usage["prompt"] == 1_000_000
+    assert usage["completion"] == 100_000
+    assert usage["calls"] == 2
+    assert usage["cost_usd"] == pytest.approx(0.55)
+
+
+def test_prometheus_endpoint(registry):
+    """
+    Test Case 3: Prometheus Export
+    Goal: Assert /metrics serves histogram buckets, counters and token totals in text format.
+    """
+    registry.observe("openrouter.chat", 0.3)
+    registry.incr("openrouter.timeouts", 2)
+    registry.record_tokens("openrouter", 120, 30)
+
+    server = registry.serve(0)
+    try:
+        port = server.server_address[1]
+        body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read().decode("utf-8")
+    finally:
+        server.shutdown()
+
+    assert 'celltron_span_duration_seconds_bucket{span="openrouter.chat",le="0.5"} 1' in body
+    assert 'celltron_span_duration_seconds_bucket{span="openrouter.chat",le="0.25"} 0' in body
+    assert 'celltron_events_total{event="openrouter.timeouts"} 2' in body
+    assert 'celltron_tokens_total{provider="openrouter",kind="prompt"} 120' in body
@@ -0,0 +1,98 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import llm_analyzer
+import metrics
+import prompts
+from llm_validator import validate_analysis
+
+# --- Fixtures ---
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    """
+    Clears metrics and the per-template Gemini models around each test.
+    """
+    metrics.REGISTRY.reset()
+    llm_analyzer._MODELS.clear()
+    llm_analyzer._PREFIX_CACHED.clear()
+    yield
+    llm_analyzer._MODELS.clear()
+    llm_analyzer._PREFIX_CACHED.clear()
+
+# --- Test Cases ---
+
+def test_render_compacts_payload_and_accounts_savings():
+    """
+    Test Case 1: Compact Rendering
+    Goal: Verify dict fields are embedded as compact JSON and each call records
+    the tokens saved against the old single-string prompt.
+    """
+    analysis = {"gist": "A summary.", "sentiment": "Neutral", "tone": "Flat", "confidence_score": 0.5}
+
+    prompt = prompts.VALIDATION.render(text="Article body.", analysis=analysis)
+    inline = metrics.REGISTRY.snapshot()["counters"]
+    metrics.REGISTRY.reset()
+    prompts.VALIDATION.render(prefix_cached=True, text="Article body.", analysis=analysis)
+    cached = metrics.REGISTRY.snapshot()["counters"]
+
+    assert prompts.compact_json(analysis) in prompt.user
+    assert json.loads(prompt.user.split("Analysis to Check:\n", 1)[1]) == analysis
+    assert inline["prompt.validation.calls"] == 1
+    assert inline["prompt.validation.tokens_sent"] == prompt.tokens()
+    # Compaction alone saves tokens; a server-cached prefix saves its tokens on top
+    assert inline["prompt.validation.tokens_saved"] > 0
+    assert cached["prompt.validation.tokens_saved"] - inline["prompt.validation.tokens_saved"] == (
+        prompts.rate_limiter.estimate_tokens(prompt.system)
+    )
+
+@patch("llm_analyzer.genai.GenerativeModel")
+@patch("llm_analyzer.genai.configure")
+def test_gemini_gets_system_instruction_once_per_template(mock_configure, mock_model_class):
+    """
+    Test Case 2: Gemini System Prefix
+    Goal: Verify the static instructions go into the model's system_instruction
+    and each call sends only the article content.
+    """
+    mock_instance = MagicMock()
+    mock_instance.generate_content.return_value.text = (
+        '{"gist": "g", "sentiment": "Positive", "tone": "t", "confidence_score": 0.9}'
+    )
+    mock_model_class.return_value = mock_instance
+    text = "This is a sufficiently long text regarding the new finance bill in India."
+
+    with patch("llm_analyzer.os.getenv", side_effect=lambda name, default=None: {"GEMINI_API_KEY": "k"}.get(name, default)):
+        llm_analyzer.analyze_article(text)
+        llm_analyzer.analyze_article(text + " Again.")
+
+    mock_model_class.assert_called_once_with(
+        llm_analyzer.DEFAULT_MODEL_NAME, system_instruction=prompts.ANALYSIS.system
+    )
+    sent = mock_instance.generate_content.call_args_list[0].args[0]
+    assert sent == f"Article Text:\n{text}"
+
+def test_validator_sends_static_instructions_as_system_message():
+    """
+    Test Case 3: OpenRouter System Prefix
+    Goal: Verify the validator puts the static instructions in a leading system
+    message and records provider-reported cached prompt tokens.
+    """
+    mock_response = MagicMock(status_code=200)
+    mock_response.json.return_value = {
+        "choices": [{"message": {"content": '{"is_valid": true, "reasoning": "ok"}'}}],
+        "usage": {"prompt_tokens": 90, "completion_tokens": 10, "prompt_tokens_details": {"cached_tokens": 40}},
+    }
+
+    with patch("llm_validator.os.getenv", return_value="fake_openrouter_key"), \
+         patch("llm_validator._get_session") as mock_get_session:
+        mock_get_session.return_value.post.return_value = mock_response
+        result = validate_analysis("Some article text.", {"gist": "g", "sentiment": "Neutral"})
+
+    assert result.is_valid is True
+    messages = mock_get_session.return_value.post.call_args.kwargs["json"]["messages"]
+    assert messages[0] == {"role": "system", "content": prompts.VALIDATION.system}
+    assert messages[1]["role"] == "user"
+    assert '{"gist":"g","sentiment":"Neutral"}' in messages[1]["content"]
+    assert metrics.REGISTRY.snapshot()["tokens"]["openrouter"]["cached"] == 40
@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import patch
+import rate_limiter
+from rate_limiter import TokenBucket, ProviderLimiter, parse_retry_after
+
+# --- Fixtures ---
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    """
+    Ensures each test builds fresh limiters from the current environment.
+    """
+    rate_limiter.reset_limiters()
+    yield
+    rate_limiter.reset_limiters()
+
+# --- Test Cases ---
+
+def test_token_bucket_waits_once_budget_is_spent():
+    """
+    Test Case 1: Budget Enforcement
+    Goal: Assert a 60 RPM bucket serves its burst instantly, then asks the next caller to wait ~1s.
+    """
+    bucket = TokenBucket(rate_per_minute=60)
+
+    waits = [bucket.reserve() for _ in range(60)]
+    assert all(w == 0.0 for w in waits)
+
+    next_wait = bucket.reserve()
+    assert 0.9 < next_wait <= 1.0
+
+
+def test_provider_limiter_backs_off_on_retry_after():
+    """
+    Test Case 2: Adaptive Backoff
+    Goal: Assert a 429 with Retry-After pauses the next acquire and halves the effective rate.
+    """
+    limiter = ProviderLimiter("test", requests_per_minute=600)
+
+    limiter.report_throttled(retry_after=5)
+    with patch("rate_limiter.time.sleep") as mock_sleep:
+        waited = limiter.acquire()
+
+    assert 4.9 < waited <= 5.0
+    mock_sleep.assert_called_once()
+    assert limiter._rate_factor == 0.5
+
+    limiter.report_ok()
+    assert limiter._rate_factor == pytest.approx(0.55)
+
+
+def test_parse_retry_after_formats():
+    """
+    Test Case 3: Header Parsing
+    Goal: Assert both delta-seconds and missing/garbage Retry-After values are handled.
+    """
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not-a-date") is None
+
+
+def test_get_limiter_reads_env_overrides(monkeypatch):
+    """
+    Test Case 4: Configuration
+    Goal: Assert <PROVIDER>_RPM overrides defaults and limiters are shared per provider.
+    """
+    monkeypatch.setenv("GEMINI_RPM", "120")
+
+    limiter = rate_limiter.get_limiter("gemini")
+
+    assert limiter._requests.rate_per_minute == 120
+    assert rate_limiter.get_limiter("gemini") is limiter
@@ -0,0 +1,120 @@
+import json
+import tracemalloc
+
+import result_sink
+from records import ResultBatch, ResultRecord
+
+# --- Fixtures ---
+
+def _entry(i, validation=True):
+    # Round-trip through JSON so labels are fresh strings, as after parsing an LLM reply
+    return json.loads(json.dumps({
+        "article": {
+            "title": f"Headline {i}", "source": "Reuters", "published_at": "2025-01-01T00:00:00Z",
+            "url": f"https://example.com/{i}", "text": f"Body of article {i} — naïve café.",
+            "snippet": "extra field",
+        },
+        "analysis": {"gist": f"Gist {i}", "sentiment": "positive", "tone": "analytical",
+                     "confidence_score": 0.9, "topics": ["markets", "energy"]},
+        "validation": {"is_valid": True, "reasoning": "Consistent."} if validation else None,
+        "cluster_id": i,
+        "validation_policy": "audit",
+        "latency_seconds": {"analysis": 0.5, "validation": 0.25 if validation else None},
+    }))
+
+# --- Test Cases ---
+
+def test_record_round_trips_entry():
+    """
+    Test Case 1: Lossless Packing
+    Goal: Verify a record rebuilds the exact entry: extra keys, None
+    validation, partial analyses and entries missing the optional keys
+    (as the work queue and CLI write them) keep their shape.
+    """
+    for entry in (_entry(1), _entry(2, validation=False)):
+        assert ResultRecord(entry).to_entry() == entry
+
+    partial = {"article": {"title": "t"}, "analysis": {"gist": "g"}}
+    assert ResultRecord(partial).to_entry() == partial
+
+    queued = {"analysis": {"gist": "g"}, "article": {"title": "t"}, "validation": None, "cluster_id": 3}
+    assert ResultRecord(queued).to_entry() == queued
+    odd_latency = {**_entry(3), "latency_seconds": {"analysis": 0.5}}
+    assert ResultRecord(odd_latency).to_entry() == odd_latency
+
+def test_record_writes_json_directly(tmp_path):
+    """
+    Test Case 2: Direct Serialization
+    Goal: Verify to_json (compact and indented) and article_json write the
+    same text json.dumps gives for the rebuilt dicts, and that JsonlSink
+    writes a record exactly as it writes the entry dict.
+    """
+    quoted = _entry(4)
+    quoted["article"]["text"] = 'He said "no" —\nthen left.\t\\ ☃'
+    shapes = [
+        _entry(1), _entry(2, validation=False), quoted,
+        {"article": {"title": "t"}, "analysis": {"gist": "g"}},
+        {"analysis": {"gist": "g"}, "article": {"title": "t"}, "validation": None, "cluster_id": 3},
+        {**_entry(5), "latency_seconds": {"analysis": 0.5}, "trace": {"spans": [1, {"a": None}]}},
+    ]
+    for entry in shapes:
+        record = ResultRecord(entry)
+        for indent in (None, 2):
+            assert record.to_json(indent) == json.dumps(record.to_entry(), ensure_ascii=False, indent=indent)
+            assert record.article_json(indent) == json.dumps(entry["article"], ensure_ascii=False, indent=indent)
+    # Entries already in the pipeline's key order come out unchanged
+    assert ResultRecord(quoted).to_json() == json.dumps(quoted, ensure_ascii=False)
+
+    with result_sink.JsonlSink(tmp_path / "dicts.jsonl") as dicts, \
+         result_sink.JsonlSink(tmp_path / "records.jsonl") as records:
+        for entry in shapes[:3]:
+            dicts.write(entry)
+            records.write(ResultRecord(entry))
+    assert (tmp_path / "records.jsonl").read_text() == (tmp_path / "dicts.jsonl").read_text()
+
+def test_batch_reads_like_a_list_with_less_memory():
+    """
+    Test Case 3: Compact Batch
+    Goal: Verify a ResultBatch behaves as a sequence of entries, shares label
+    strings across records and holds far less memory than the plain dicts.
+    """
+    count = 2000
+
+    tracemalloc.start()
+    as_dicts = [_entry(i) for i in range(count)]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    batch = ResultBatch(_entry(i) for i in range(count))
+    batch_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(batch) == count
+    assert batch[5] == as_dicts[5] and batch[-1] == as_dicts[-1]
+    assert batch[:2] == as_dicts[:2]
+    assert list(batch) == as_dicts
+
+    records = list(batch.records())
+    first, last = records[0], records[-1]
+    assert first.analysis[1] is last.analysis[1]  # sentiment
+    assert first.article[1] is last.article[1]  # source
+
+    assert batch_bytes < 0.7 * dict_bytes
+
+def test_views_from_batch_match_views_from_entries(tmp_path):
+    """
+    Test Case 4: Batch Views
+    Goal: Verify render_views writes the same files from a ResultBatch (whose
+    JSON views are serialized straight from the records) as from the plain
+    entries.
+    """
+    entries = [_entry(i, validation=i % 2 == 0) for i in range(5)]
+    assert result_sink.render_views(entries, tmp_path / "dicts")
+    assert result_sink.render_views(ResultBatch(entries), tmp_path / "batch")
+
+    for name in ("raw_articles.json", "analysis_results.json"):
+        assert (tmp_path / "batch" / name).read_text() == (tmp_path / "dicts" / name).read_text()
+    # The report differs only in its timestamp line
+    strip = lambda p: [l for l in p.read_text().splitlines() if not l.startswith("**Date:**")]
+    assert strip(tmp_path / "batch" / "final_report.md") == strip(tmp_path / "dicts" / "final_report.md")
@@ -0,0 +1,85 @@
+from report_engine import ReportEngine
+
+# --- Fixtures ---
+
+def _entry(i, day, sentiment="Positive", is_valid=True, source="Reuters"):
+    return {
+        "article": {"title": f"Article {i}", "source": source, "url": f"https://example.com/{i}",
+                    "published_at": f"{day}T08:00:00Z", "text": "..."},
+        "analysis": {"gist": f"gist {i}", "sentiment": sentiment, "tone": "Flat", "confidence_score": 0.9},
+        "validation": None if is_valid is None else {"is_valid": is_valid, "reasoning": "r"},
+        "cluster_id": i,
+    }
+
+# --- Test Cases ---
+
+def test_refresh_appends_only_new_articles(tmp_path):
+    """
+    Test Case 1: Incremental Refresh
+    Goal: Assert a second refresh appends only unseen articles to the day shard
+    and folds them into the running aggregates.
+    """
+    engine = ReportEngine(tmp_path / "reports")
+    assert engine.add([_entry(0, "2026-01-15"), _entry(1, "2026-01-15", "Negative", False)]) == 2
+    shard = engine.shard_path("2026-01-15").read_text()
+
+    assert engine.add([_entry(1, "2026-01-15"), _entry(2, "2026-01-15", "Neutral", None, "Mint")]) == 1
+    updated = engine.shard_path("2026-01-15").read_text()
+
+    assert updated.startswith(shard)
+    assert updated.count("### Article") == 3
+    aggregates = engine.aggregates()
+    assert aggregates["total"] == 3
+    assert aggregates["sentiment"] == {"Positive": 1, "Negative": 1, "Neutral": 1}
+    assert aggregates["validation"] == {"valid": 1, "flagged": 1, "not_required": 0, "skipped": 1}
+    assert aggregates["sources"]["Reuters"]["flagged"] == 1
+
+
+def test_state_survives_restart_and_days_paginate(tmp_path):
+    """
+    Test Case 2: Shards and Persistence
+    Goal: Assert a busy day spills into page files, the index links every shard,
+    and a new engine instance resumes the same aggregates.
+    """
+    engine = ReportEngine(tmp_path / "reports", page_size=2)
+    engine.add([_entry(i, "2026-01-16") for i in range(3)] + [_entry(9, "2026-01-15")])
+    engine.close()
+
+    reopened = ReportEngine(tmp_path / "reports", page_size=2)
+    reopened.add([_entry(3, "2026-01-16")])
+
+    assert reopened.shard_path("2026-01-16", 2).read_text().count("### Article") == 2
+    index = reopened.index_path.read_text()
+    assert "**Articles Analyzed:** 5" in index
+    assert "- 2026-01-16: 4 articles — [page 1](days/2026-01-16.md), [page 2](days/2026-01-16-p2.md)" in index
+    assert index.index("2026-01-16") < index.index("- 2026-01-15")
+
+
+def test_concurrent_adds_keep_every_count(tmp_path):
+    """
+    Test Case 3: Concurrent Refreshes
+    Goal: Assert adds racing on one engine and on a second engine over the same
+    state (as a second process would) never lose each other's aggregate counts.
+    """
+    import threading
+
+    engines = [ReportEngine(tmp_path / "reports"), ReportEngine(tmp_path / "reports")]
+    start = threading.Barrier(8)
+
+    def add_batch(worker):
+        start.wait()
+        for i in range(5):
+            article = worker * 100 + i
+            engines[worker % 2].add([_entry(article, "2026-01-17", "Negative" if article % 2 else "Positive")])
+
+    threads = [threading.Thread(target=add_batch, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    aggregates = engines[0].aggregates()
+    assert aggregates["total"] == 40
+    assert aggregates["sentiment"]["Positive"] + aggregates["sentiment"]["Negative"] == 40
+    assert aggregates["sources"]["Reuters"]["articles"] == 40
+    assert "**Articles Analyzed:** 40" in engines[0].index_path.read_text()
@@ -0,0 +1,62 @@
+import json
+import pytest
+from result_sink import JsonlSink, iter_entries, render_views
+
+# --- Fixtures ---
+
+@pytest.fixture
+def entries():
+    """
+    Two aggregated pipeline entries, one with a skipped validation.
+    """
+    return [
+        {
+            "article": {"title": "Budget passed", "source": "BBC", "url": "https://bbc.com/1", "text": "t1"},
+            "analysis": {"gist": "g1", "sentiment": "Positive", "tone": "Upbeat", "confidence_score": 0.9},
+            "validation": {"is_valid": True, "reasoning": "Matches."},
+        },
+        {
+            "article": {"title": "Flood warning", "source": "CNN", "url": "https://cnn.com/2", "text": "t2"},
+            "analysis": {"gist": "g2", "sentiment": "Negative", "tone": "Urgent", "confidence_score": 0.8},
+            "validation": None,
+        },
+    ]
+
+# --- Test Cases ---
+
+def test_sink_survives_torn_final_line(tmp_path, entries):
+    """
+    Test Case 1: Crash Safety
+    Goal: Assert completed lines are readable even if the last write was cut off mid-line.
+    """
+    path = tmp_path / "run.jsonl"
+    with JsonlSink(path, fsync_every=1) as sink:
+        for entry in entries:
+            sink.write(entry)
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"article": {"title": "half')  # Simulated crash
+
+    assert list(iter_entries(path)) == entries
+
+
+def test_render_views_match_whole_list_dump(tmp_path, entries):
+    """
+    Test Case 2: Derived Views
+    Goal: Assert streamed JSON views are identical to json.dump(indent=2) of the full list.
+    """
+    path = tmp_path / "run.jsonl"
+    with JsonlSink(path) as sink:
+        for entry in entries:
+            sink.write(entry)
+
+    assert render_views(path, tmp_path / "out") is True
+
+    out = tmp_path / "out"
+    assert (out / "analysis_results.json").read_text(encoding="utf-8") == json.dumps(entries, indent=2, ensure_ascii=False)
+    assert json.loads((out / "raw_articles.json").read_text(encoding="utf-8")) == [e["article"] for e in entries]
+
+    report = (out / "final_report.md").read_text(encoding="utf-8")
+    assert "**Articles Analyzed:** 2" in report
+    assert "- Positive: 1 articles" in report
+    assert "❓ Skipped (Timeout/Error)" in report
@@ -0,0 +1,65 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from results_archive import ResultArchive
+
+# --- Fixtures ---
+
+def _entry(i, source, day, sentiment, is_valid):
+    return {
+        "article": {"title": f"Article {i}", "source": source, "url": f"https://example.com/{i}",
+                    "published_at": f"{day}T08:00:00Z", "text": "..."},
+        "analysis": {"gist": "g", "sentiment": sentiment, "tone": "Flat", "confidence_score": 0.5 + i / 100},
+        "validation": None if is_valid is None else {"is_valid": is_valid, "reasoning": "r"},
+        "cluster_id": i,
+        "latency_seconds": {"analysis": 0.2, "validation": 0.1},
+    }
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = ResultArchive(tmp_path / "archive")
+    archive.append_run([
+        _entry(0, "Reuters", "2026-01-15", "Positive", True),
+        _entry(1, "Reuters", "2026-01-15", "Negative", False),
+        _entry(2, "Mint", "2026-01-16", "Positive", None),
+    ], "run-a")
+    archive.append_run([_entry(3, "Mint", "2026-01-16", "Positive", False)], "run-b")
+    return archive
+
+# --- Test Cases ---
+
+def test_runs_append_into_day_partitions(archive):
+    """
+    Test Case 1: Partitioned Append
+    Goal: Assert each run adds its own file under the article's publication day
+    and day filters prune partitions.
+    """
+    assert archive.days() == ["2026-01-15", "2026-01-16"]
+    assert sorted(p.name for p in (archive.root / "day=2026-01-16").iterdir()) == ["run-a.arrow", "run-b.arrow"]
+    assert archive.table().num_rows == 4
+    assert archive.table(start="2026-01-16").column("cluster_id").to_pylist() == [2, 3]
+
+
+def test_sentiment_by_source(archive):
+    """
+    Test Case 2: Grouped Aggregate
+    Goal: Assert sentiment counts per source span every run.
+    """
+    rows = archive.sentiment_by(["source"]).to_pylist()
+
+    assert [(r["source"], r["sentiment"], r["articles"]) for r in rows] == [
+        ("Mint", "Positive", 2), ("Reuters", "Negative", 1), ("Reuters", "Positive", 1),
+    ]
+
+
+def test_disagreement_rate_ignores_skipped_validations(archive):
+    """
+    Test Case 3: Validator Disagreement
+    Goal: Assert the rate is flagged / validated, with skipped validations excluded.
+    """
+    overall = archive.disagreement_rate().to_pylist()[0]
+    assert (overall["validated"], overall["flagged"]) == (3, 2)
+
+    by_source = {r["source"]: r["disagreement_rate"] for r in archive.disagreement_rate(["source"]).to_pylist()}
+    assert by_source == {"Reuters": 0.5, "Mint": 1.0}
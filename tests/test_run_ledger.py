@@ -0,0 +1,45 @@
+import pytest
+from run_ledger import RunLedger, article_key
+
+# --- Fixtures ---
+
+@pytest.fixture
+def ledger(tmp_path):
+    """
+    A fresh ledger per test.
+    """
+    led = RunLedger(tmp_path / "run.ledger.sqlite3")
+    yield led
+    led.close()
+
+# --- Test Cases ---
+
+def test_stage_transitions_are_replayed_in_order(ledger):
+    """
+    Test Case 1: Stage Tracking
+    Goal: Assert each article's latest stage, payloads and failure reason are replayed in fetch order.
+    """
+    a = {"url": "https://a.com", "text": "first"}
+    b = {"url": "https://b.com", "text": "second"}
+    ledger.record_fetched(b, position=1)
+    ledger.record_fetched(a, position=0)
+
+    ledger.record_analyzed(a, {"gist": "g"})
+    ledger.record_validated(a, {"is_valid": True, "reasoning": "ok"}, decision="audit")
+    ledger.record_failed(b, "analysis error: quota")
+
+    records = list(ledger.records())
+    assert [r["article"]["url"] for r in records] == ["https://a.com", "https://b.com"]
+    assert records[0]["stage"] == "validated" and records[0]["analysis"] == {"gist": "g"}
+    assert records[0]["decision"] == "audit" and records[1]["decision"] is None
+    assert records[1]["stage"] == "failed" and records[1]["error"] == "analysis error: quota"
+
+
+def test_article_key_falls_back_to_text_hash():
+    """
+    Test Case 2: Identity
+    Goal: Assert articles without a URL still get a stable key.
+    """
+    assert article_key({"url": "https://a.com", "text": "x"}) == "https://a.com"
+    assert article_key({"url": None, "text": "x"}) == article_key({"url": None, "text": "x"})
+    assert article_key({"url": None, "text": "x"}).startswith("sha256:")
@@ -0,0 +1,84 @@
+import json
+from unittest.mock import patch, MagicMock
+
+from checkpoints import CheckpointStore
+from scheduler import TopicMerger, TopicSpec, parse_topic, run_scheduled
+
+# --- Fixtures ---
+
+def _articles(topic, n, shared=()):
+    out = [
+        {"title": f"{topic} {i}", "source": "Test", "published_at": f"2026-01-0{i + 1}T00:00:00Z",
+         "url": f"https://example.com/{topic}/{i}", "text": f"{topic} text {i}"}
+        for i in range(n)
+    ]
+    return out + [dict(a) for a in shared]
+
+def _streams(by_topic):
+    def stream(topic, limit, since=None, coverage=None):
+        # Each fake feed runs out within its limit
+        if coverage is not None:
+            coverage.exhausted = True
+        return iter(by_topic[topic][:limit])
+    return stream
+
+# --- Test Cases ---
+
+def test_parse_topic():
+    """
+    Test Case 1: CLI Specs
+    Goal: Assert limit and priority are optional and colons inside the topic survive.
+    """
+    assert parse_topic('"Indian Government":12:3') == TopicSpec('"Indian Government"', 12, 3)
+    assert parse_topic("AI:5") == TopicSpec("AI", 5, 1)
+    assert parse_topic("Topic: with colon") == TopicSpec("Topic: with colon", 10, 1)
+
+
+def test_weighted_round_robin_and_cross_topic_dedup():
+    """
+    Test Case 2: Fair Admission
+    Goal: Assert topics are interleaved by priority and an article matching two
+    topics is admitted once, tagged with both.
+    """
+    shared = _articles("shared", 1)
+    by_topic = {"a": _articles("a", 4), "b": _articles("b", 1, shared)}
+
+    with patch("scheduler.news_fetcher.stream_articles", side_effect=_streams(by_topic)):
+        merger = TopicMerger([TopicSpec("b", 5, 1), TopicSpec("a", 5, 2)])
+        admitted = [article for article, _ in merger]
+
+    assert [a["title"] for a in admitted] == ["a 0", "a 1", "b 0", "a 2", "a 3", "shared 0"]
+    by_topic["a"].append(dict(shared[0]))
+
+    with patch("scheduler.news_fetcher.stream_articles", side_effect=_streams(by_topic)):
+        merger = TopicMerger([TopicSpec("a", 10, 1), TopicSpec("b", 10, 1)])
+        admitted = [article for article, _ in merger]
+
+    assert [a["title"] for a in admitted].count("shared 0") == 1
+    assert next(a for a in admitted if a["title"] == "shared 0")["topics"] == ["b", "a"]
+    assert merger.cross_topic_duplicates == 1
+    assert "https://example.com/shared/0" in merger.membership["a"]
+
+
+def test_run_scheduled_stages_checkpoint_per_topic(tmp_path):
+    """
+    Test Case 3: Shared Pipeline
+    Goal: Assert one scheduled run analyzes every topic's articles and commits a checkpoint for each topic.
+    """
+    by_topic = {"a": _articles("a", 2), "b": _articles("b", 3)}
+    analysis = MagicMock()
+    analysis.model_dump.return_value = {"gist": "g", "sentiment": "Neutral", "tone": "Flat", "confidence_score": 0.5}
+    checkpoints = CheckpointStore(tmp_path / "checkpoints.json")
+
+    with patch("scheduler.news_fetcher.stream_articles", side_effect=_streams(by_topic)), \
+         patch("main.llm_analyzer.analyze_article", return_value=analysis) as mock_analyze, \
+         patch("main.llm_validator.validate_analysis", return_value=None):
+        stream_path = run_scheduled(
+            [TopicSpec("a", 2), TopicSpec("b", 3)], output_dir=tmp_path / "output", checkpoints=checkpoints
+        )
+
+    assert mock_analyze.call_count == 5
+    assert sum(1 for _ in open(stream_path)) == 5
+    saved = json.loads((tmp_path / "checkpoints.json").read_text())
+    assert saved["a"]["published_at"] == "2026-01-02T00:00:00Z"
+    assert saved["b"]["published_at"] == "2026-01-03T00:00:00Z"
@@ -0,0 +1,59 @@
+from llm_analyzer import NewsAnalysis
+from triage import Triager, score, DROP, ANALYZE, ACCEPT
+
+# --- Fixtures ---
+
+REPOST = (
+    "Skip to comments.\r\nIndia antitrust watchdog grows impatient over Apples efforts to delay "
+    "investigation9to5Mac ^\r\n | January 15, 2026\r\n | Marcus Mendes \r\nPosted on 01/16/2026 "
+    "5:50:07 AM PST by House A… [+1981 chars]"
+)
+NEWS = (
+    "Indias Russian oil imports fell to their lowest level in two years in December, as Western "
+    "sanctions pushed refiners to tap alternatives, lifting OPECs share of imports to an 11-month "
+    "high, trade dat… [+2351 chars]"
+)
+NEUTRAL = (
+    "Anthropic has appointed Irina Ghose, a former Microsoft India managing director, to lead its "
+    "India business as the U.S. AI startup prepares to open an office in Bengaluru. The move "
+    "underscores how In… [+4458 chars]"
+)
+
+# --- Test Cases ---
+
+def test_drops_boilerplate_and_stubs():
+    """
+    Test Case 1: Junk Filter
+    Goal: Assert forum reposts and near-empty stubs are dropped while real snippets are kept.
+    """
+    results = Triager().classify([REPOST, "Read more… [+1200 chars]", NEWS, NEUTRAL])
+
+    assert [r.verdict for r in results] == [DROP, DROP, ANALYZE, ANALYZE]
+
+
+def test_accepts_confident_local_sentiment_when_enabled():
+    """
+    Test Case 2: Short-Circuit
+    Goal: Assert a one-sided snippet is accepted above the threshold and yields a
+    NewsAnalysis-shaped result, while neutral text still goes to Gemini.
+    """
+    triager = Triager(accept_confidence=0.6)
+    news, neutral = triager.classify([NEWS, NEUTRAL])
+
+    assert news.verdict == ACCEPT and news.sentiment == "Negative"
+    assert neutral.verdict == ANALYZE
+
+    analysis = NewsAnalysis.model_validate(Triager.local_analysis(NEWS, news))
+    assert analysis.sentiment == "Negative"
+    assert "[+" not in analysis.gist
+    assert Triager.local_analysis(NEUTRAL, neutral) is None
+
+
+def test_single_hit_is_never_confident():
+    """
+    Test Case 3: Conservative Confidence
+    Goal: Assert one lexicon hit cannot clear a meaningful acceptance threshold.
+    """
+    text = "The committee met on Tuesday to discuss the rise in the number of applications received this year."
+
+    assert score(text)["confidence"] < 0.3
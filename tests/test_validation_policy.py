@@ -0,0 +1,58 @@
+from validation_policy import ValidationPolicy, LOW_CONFIDENCE, SOURCE_RISK, AUDIT, SKIP
+
+# --- Fixtures ---
+
+CONFIDENT = {"confidence_score": 0.95}
+UNSURE = {"confidence_score": 0.4}
+
+# --- Test Cases ---
+
+def test_decide_by_confidence_source_risk_and_sampling():
+    """
+    Test Case 1: Decisions
+    Goal: Verify low confidence is always validated, risky sources are
+    validated by their risk score, and other confident analyses are skipped.
+    """
+    policy = ValidationPolicy(confidence_threshold=0.8, sample_rate=0.0, source_risk={"Tabloid": 1.0}, seed=1)
+
+    assert policy.decide({"source": "Wire"}, UNSURE) == LOW_CONFIDENCE
+    assert policy.decide({"source": "Tabloid"}, CONFIDENT) == SOURCE_RISK
+    assert policy.decide({"source": "Wire"}, CONFIDENT) == SKIP
+
+    sampled = ValidationPolicy(sample_rate=0.25, seed=7)
+    decisions = [sampled.decide({"source": "Wire"}, CONFIDENT) for _ in range(2000)]
+    assert 0.2 < decisions.count(AUDIT) / len(decisions) < 0.3
+    assert set(decisions) == {AUDIT, SKIP}
+
+def test_audits_estimate_missed_flags():
+    """
+    Test Case 2: Audit Estimate
+    Goal: Verify the flag rate among audit verdicts is extrapolated to the
+    skipped analyses, ignoring audits that produced no verdict.
+    """
+    policy = ValidationPolicy(sample_rate=0.5, seed=3)
+    decisions = [policy.decide({"source": "Wire"}, CONFIDENT) for _ in range(100)]
+    audits = decisions.count(AUDIT)
+
+    for n in range(audits - 1):  # The last audit timed out: no verdict
+        policy.record(AUDIT, is_valid=n % 4 != 0)
+
+    summary = policy.summary()
+    flagged = len(range(0, audits - 1, 4))
+    assert summary["audit_verdicts"] == audits - 1
+    assert summary["skipped_disagreement_rate"] == flagged / (audits - 1)
+    assert summary["estimated_missed_flags"] == round(flagged / (audits - 1) * decisions.count(SKIP), 1)
+    assert summary["validated"] == audits
+
+def test_audit_and_source_risk_draw_independently():
+    """
+    Test Case 3: Independent Draws
+    Goal: Verify a risky source is validated at sample_rate + (1 - sample_rate) * risk,
+    not max(sample_rate, risk) as a shared random draw would give.
+    """
+    policy = ValidationPolicy(sample_rate=0.5, source_risk={"Tabloid": 0.5}, seed=11)
+    decisions = [policy.decide({"source": "Tabloid"}, CONFIDENT) for _ in range(4000)]
+
+    assert 0.45 < decisions.count(AUDIT) / len(decisions) < 0.55
+    assert 0.2 < decisions.count(SOURCE_RISK) / len(decisions) < 0.3
+    assert 0.7 < (len(decisions) - decisions.count(SKIP)) / len(decisions) < 0.8
@@ -2,6 +2,7 @@ import pytest
 import requests
 from unittest.mock import patch, MagicMock
 from llm_validator import validate_analysis, ValidationResult
+import llm_validator
 
 # --- Fixtures ---
 
@@ -13,9 +14,25 @@ def mock_env():
     with patch("llm_validator.os.getenv", return_value="fake_openrouter_key"):
         yield
 
+@pytest.fixture(autouse=True)
+def reset_session():
+    """
+    Resets the shared OpenRouter session so pooled-session state never leaks between tests.
+    """
+    llm_validator._SESSION = None
+    yield
+    llm_validator._SESSION = None
+
+@pytest.fixture
+def mock_post():
+    """
+    Mocks POST on the shared pooled session.
+    """
+    with patch("llm_validator._get_session") as mock_get_session:
+        yield mock_get_session.return_value.post
+
 # --- Test Cases ---
 
-@patch("llm_validator.requests.post")
 def test_validate_analysis_timeout(mock_post):
     """
     Test Case 1: API Resilience
@@ -37,7 +54,6 @@ def test_validate_analysis_timeout(mock_post):
     mock_post.assert_called_once()
 
 
-@patch("llm_validator.requests.post")
 def test_validate_analysis_success(mock_post):
     """
     Test Case 2: Happy Path
@@ -70,4 +86,194 @@ def test_validate_analysis_success(mock_post):
     assert result is not None
     assert isinstance(result, ValidationResult)
     assert result.is_valid is True
-    assert result.reasoning == "The sentiment matches the text perfectly."
\ No newline at end of file
+    assert result.reasoning == "The sentiment matches the text perfectly."
+
+
+def test_session_is_pooled_and_shared():
+    """
+    Test Case 3: Connection Reuse
+    Goal: Assert every call shares one keep-alive session whose adapter retries POSTs on 5xx.
+    """
+    session = llm_validator._get_session()
+
+    assert llm_validator._get_session() is session
+    adapter = session.get_adapter("https://openrouter.ai/api/v1/chat/completions")
+    assert adapter._pool_maxsize == llm_validator.DEFAULT_POOL_SIZE
+    assert "POST" in adapter.max_retries.allowed_methods
+    assert 503 in adapter.max_retries.status_forcelist
+
+
+def test_slow_call_is_hedged_to_fallback_model():
+    """
+    Test Case 4: Hedged Requests
+    Goal: Assert that a call outliving the hedge delay fires a duplicate to the
+    fallback model and returns whichever answer arrives first.
+    """
+    import threading
+    import metrics
+
+    # 1. Setup: primary hangs until the hedge has answered
+    env = {
+        "OPENROUTER_API_KEY": "fake_openrouter_key",
+        "VALIDATOR_HEDGE": "1",
+        "VALIDATOR_FALLBACK_MODEL": "fallback/model",
+        "VALIDATOR_HEDGE_DELAY": "0.05",
+    }
+    released = threading.Event()
+
+    def fake_request(url, headers, payload, prompt):
+        if payload["model"] == "fallback/model":
+            released.set()
+            return ValidationResult(is_valid=True, reasoning="hedge")
+        released.wait(timeout=5)
+        return ValidationResult(is_valid=False, reasoning="primary")
+
+    metrics.REGISTRY.reset()
+    with patch("llm_validator.os.getenv", side_effect=lambda name, default=None: env.get(name, default)), \
+         patch("llm_validator._request_validation", side_effect=fake_request):
+        # 2. Execute
+        result = validate_analysis("Some article text.", {"gist": "g", "sentiment": "Neutral"})
+
+    # 3. Assertions
+    assert result.reasoning == "hedge"
+    counters = metrics.REGISTRY.snapshot()["counters"]
+    assert {k: v for k, v in counters.items() if k.startswith("openrouter.")} == {
+        "openrouter.hedged": 1,
+        "openrouter.hedge_wins": 1,
+    }
+
+
+def test_exhausted_5xx_retries_open_the_breaker():
+    """
+    Test Case 5: Outage Detection Through Retries
+    Goal: Assert that a server answering 503 every time, seen through the real
+    retrying session (which raises RetryError, not HTTPError), trips the breaker.
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import circuit_breaker
+    import http_client
+
+    class _Unavailable(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Unavailable)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    env = {
+        "OPENROUTER_API_KEY": "fake_openrouter_key",
+        "OPENROUTER_BASE_URL": f"http://127.0.0.1:{server.server_address[1]}",
+    }
+    circuit_breaker.reset_breakers()
+    circuit_breaker._BREAKERS["openrouter"] = circuit_breaker.CircuitBreaker("openrouter", min_calls=3)
+    # The production session, minus the multi-second backoff between retries
+    llm_validator._SESSION = http_client.create_retry_session(
+        allowed_methods=("POST",), backoff_factor=0, retry_reads=False
+    )
+
+    try:
+        with patch("llm_validator.os.getenv", side_effect=lambda name, default=None: env.get(name, default)):
+            for _ in range(3):
+                assert validate_analysis("Some article text.", {"gist": "g", "sentiment": "Neutral"}) is None
+        assert circuit_breaker.get_breaker("openrouter").state == circuit_breaker.OPEN
+    finally:
+        server.shutdown()
+        circuit_breaker.reset_breakers()
+
+
+def test_hedge_p95_ignores_throttling_and_is_cached(mock_post):
+    """
+    Test Case 6: Hedge Delay Inputs
+    Goal: Assert that 429 round trips are not timed as openrouter.chat calls,
+    and that the hedge p95 is reused until enough new calls were timed.
+    """
+    import metrics
+    import rate_limiter
+
+    # 1. Setup: one throttled answer, then a valid one
+    throttled = MagicMock(status_code=429, headers={"Retry-After": "0"})
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"choices": [{"message": {"content": '{"is_valid": true, "reasoning": "ok"}'}}]}
+    mock_post.side_effect = [throttled, ok]
+    metrics.REGISTRY.reset()
+    rate_limiter.reset_limiters()
+    llm_validator._HEDGE_P95 = None
+
+    try:
+        # 2. Execute: the throttled attempt is re-sent, but only the answer is timed
+        assert validate_analysis("Some article text.", {"gist": "g", "sentiment": "Neutral"}).is_valid is True
+        assert mock_post.call_count == 2
+        assert metrics.REGISTRY.span_count("openrouter.chat") == 1
+
+        # 3. The p95 is computed once, then cached until HEDGE_REFRESH_EVERY more samples
+        for _ in range(llm_validator.HEDGE_MIN_SAMPLES):
+            metrics.observe("openrouter.chat", 1.0)
+        assert llm_validator.hedge_delay() == 1.0
+        for _ in range(llm_validator.HEDGE_REFRESH_EVERY - 1):
+            metrics.observe("openrouter.chat", 4.0)
+        with patch.object(metrics.REGISTRY, "percentile", side_effect=AssertionError("recomputed")):
+            assert llm_validator.hedge_delay() == 1.0
+        metrics.observe("openrouter.chat", 4.0)
+        assert llm_validator.hedge_delay() == 4.0
+    finally:
+        rate_limiter.reset_limiters()
+        metrics.REGISTRY.reset()
+        llm_validator._HEDGE_P95 = None
+
+
+def test_read_timeout_is_not_retried():
+    """
+    Test Case 7: Read Timeouts
+    Goal: Assert that a call outliving REQUEST_TIMEOUT on the real session is
+    sent once and reported as a timeout, not retried into a ConnectionError.
+    """
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import circuit_breaker
+    import metrics
+
+    calls = []
+
+    class _Stalled(BaseHTTPRequestHandler):
+        def do_POST(self):
+            calls.append(self.path)
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(0.6)
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stalled)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    env = {
+        "OPENROUTER_API_KEY": "fake_openrouter_key",
+        "OPENROUTER_BASE_URL": f"http://127.0.0.1:{server.server_address[1]}",
+    }
+    circuit_breaker.reset_breakers()
+    metrics.REGISTRY.reset()
+
+    try:
+        with patch("llm_validator.os.getenv", side_effect=lambda name, default=None: env.get(name, default)), \
+             patch("llm_validator.REQUEST_TIMEOUT", 0.2):
+            with pytest.raises(requests.exceptions.Timeout):
+                llm_validator._request_validation(
+                    f"{env['OPENROUTER_BASE_URL']}/chat/completions", {}, {"model": "m"},
+                    llm_validator.prompts.Prompt(system="s", user="u"),
+                )
+            assert validate_analysis("Some article text.", {"gist": "g", "sentiment": "Neutral"}) is None
+        assert len(calls) == 2  # One attempt per call
+        assert metrics.REGISTRY.snapshot()["counters"]["openrouter.timeouts"] == 1
+    finally:
+        server.shutdown()
+        circuit_breaker.reset_breakers()
+        metrics.REGISTRY.reset()
@@ -0,0 +1,140 @@
+import threading
+import time
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from work_queue import WorkQueue, run_worker, ANALYZE, VALIDATE, DONE, FAILED
+
+# --- Fixtures ---
+
+@pytest.fixture
+def queue(tmp_path):
+    q = WorkQueue(tmp_path / "queue.sqlite3", max_attempts=2)
+    yield q
+    q.close()
+
+def _article(i):
+    return {"title": f"Article {i}", "source": "Test", "published_at": None,
+            "url": f"https://example.com/{i}", "text": f"text-{i}"}
+
+# --- Test Cases ---
+
+def test_expired_lease_is_reclaimed_and_stale_completion_rejected(queue):
+    """
+    Test Case 1: Dead Worker
+    Goal: Assert a claimed job is invisible to others until its lease lapses,
+    then the new owner's result wins and the old owner's late write is rejected.
+    """
+    assert queue.enqueue(ANALYZE, "a", {"article": _article(0)})
+    assert not queue.enqueue(ANALYZE, "a", {"article": _article(0)})
+
+    first = queue.claim("w1", lease_seconds=0.05)
+    assert queue.claim("w2") is None
+
+    time.sleep(0.1)
+    second = queue.claim("w2")
+    assert second.id == first.id and second.attempts == 2
+    assert not queue.heartbeat(first, "w1")
+
+    assert queue.complete(second, "w2", {"analysis": {"gist": "new"}})
+    assert not queue.complete(first, "w1", {"analysis": {"gist": "stale"}})
+    assert queue.stats() == {ANALYZE: {DONE: 1}}
+
+
+def test_completion_enqueues_next_stage_and_failures_are_bounded(queue):
+    """
+    Test Case 2: Stage Hand-off and Retry Budget
+    Goal: Assert completing an analyze job atomically creates its validate job,
+    and a job failing max_attempts times is parked as failed.
+    """
+    queue.enqueue(ANALYZE, "a", {"article": _article(0)})
+    queue.enqueue(ANALYZE, "b", {"article": _article(1)})
+
+    job = queue.claim("w1", kinds=(ANALYZE,))
+    queue.complete(job, "w1", {"analysis": {}}, follow_up=(VALIDATE, job.key, {"article": _article(0), "analysis": {}}))
+    assert queue.claim("w1", kinds=(VALIDATE,)).key == "a"
+
+    for _ in range(2):
+        job = queue.claim("w1", kinds=(ANALYZE,))
+        queue.fail(job, "w1", "boom")
+    assert queue.claim("w1", kinds=(ANALYZE,)) is None
+    assert queue.stats()[ANALYZE] == {DONE: 1, FAILED: 1}
+
+
+def test_concurrent_workers_process_each_job_once(queue):
+    """
+    Test Case 3: Horizontal Scaling
+    Goal: Assert several workers drain the queue with every article analyzed and
+    validated exactly once, and entries come back in enqueue order.
+    """
+    for i in range(12):
+        queue.enqueue(ANALYZE, f"https://example.com/{i}", {"article": _article(i), "cluster_id": i})
+
+    calls = []
+    calls_lock = threading.Lock()
+
+    def fake_analysis(text, cache=None):
+        with calls_lock:
+            calls.append(text)
+        analysis = MagicMock()
+        analysis.model_dump.return_value = {"gist": text}
+        return analysis
+
+    with patch("work_queue.llm_analyzer.analyze_article", side_effect=fake_analysis), \
+         patch("work_queue.llm_validator.validate_analysis", return_value=None):
+        workers = [
+            threading.Thread(target=run_worker, args=(queue, f"w{n}"), kwargs={"exit_when_idle": True})
+            for n in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    assert sorted(calls) == sorted(f"text-{i}" for i in range(12))
+    entries = list(queue.entries())
+    assert [e["analysis"]["gist"] for e in entries] == [f"text-{i}" for i in range(12)]
+    assert [e["cluster_id"] for e in entries] == list(range(12))
+
+
+def test_unprocessable_and_exhausted_jobs_fail_and_free_their_cluster(queue):
+    """
+    Test Case 4: Terminal Failures
+    Goal: Assert a too-short article is failed after a single attempt rather
+    than retried, and every job failed for good discards its dedup cluster.
+    """
+    short = {**_article(0), "text": "too short"}
+    long = {**_article(1), "text": "A long enough article body that the analyzer would normally accept."}
+    queue.enqueue(ANALYZE, "short", {"article": short, "cluster_id": 10})
+    queue.enqueue(ANALYZE, "long", {"article": long, "cluster_id": 11})
+    dedup = MagicMock()
+
+    with patch("work_queue.llm_analyzer.analyze_article", return_value=None) as mock_analyze:
+        run_worker(queue, "w1", exit_when_idle=True, dedup=dedup)
+
+    # The short text once; the long one until max_attempts (2) is spent
+    assert [c.args[0] for c in mock_analyze.call_args_list].count("too short") == 1
+    assert mock_analyze.call_count == 3
+    assert queue.stats() == {ANALYZE: {FAILED: 2}}
+    assert sorted(c.args[0] for c in dedup.discard.call_args_list) == [10, 11]
+
+
+def test_lease_lapsed_on_final_attempt_frees_its_cluster(queue):
+    """
+    Test Case 5: Hung Final Attempt
+    Goal: Assert a job whose lease lapses on its last attempt is failed by the
+    next worker's claim, and that worker discards the job's dedup cluster.
+    """
+    queue.enqueue(ANALYZE, "hung", {"article": _article(0), "cluster_id": 20})
+    for _ in range(2):  # max_attempts, each lease left to lapse
+        assert queue.claim("w1", lease_seconds=0.05).key == "hung"
+        time.sleep(0.1)
+    dedup = MagicMock()
+
+    with patch("work_queue.llm_analyzer.analyze_article") as mock_analyze:
+        assert run_worker(queue, "w2", exit_when_idle=True, dedup=dedup) == 0
+
+    mock_analyze.assert_not_called()
+    assert queue.stats() == {ANALYZE: {FAILED: 1}}
+    dedup.discard.assert_called_once_with(20)
@@ -0,0 +1,138 @@
+import math
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+import config
+
+# --- Configuration ---
+# Articles scoring below this quality are dropped before any LLM call.
+DEFAULT_MIN_QUALITY = 0.5
+# Local sentiment at or above this confidence skips Gemini. 0 disables
+# acceptance (every kept article still goes to Gemini).
+DEFAULT_ACCEPT_CONFIDENCE = 0.0
+# Word count at which a snippet is considered long enough to judge.
+MIN_WORDS = 15
+# Quality lost per boilerplate phrase found (forum reposts, nav text).
+BOILERPLATE_PENALTY = 0.25
+
+# --- Verdicts ---
+DROP = "drop"
+ANALYZE = "analyze"
+ACCEPT = "accept"
+
+_TRUNCATION_MARKER = re.compile(r"(…|\.\.\.)?\s*\[\+\d+ chars\]")
+_BOILERPLATE = re.compile(
+    r"skip to (main )?(content|comments)|posted on .{0,40}? by |read more|subscribe( now)?|sign up|"
+    r"click here|advertisement|accept (all )?cookies|javascript (is )?(disabled|required)",
+    re.IGNORECASE,
+)
+_WORD = re.compile(r"[A-Za-z][A-Za-z'’-]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Headline-register lexicon: word -> weight. Kept deliberately small; it only
+# has to be right when it is confident, everything else goes to Gemini.
+_LEXICON: Dict[str, float] = {
+    **dict.fromkeys((
+        "gain", "gains", "growth", "grow", "grows", "rise", "rises", "rising", "rose", "surge", "surges",
+        "jump", "jumps", "rally", "record", "boost", "boosts", "win", "wins", "won", "profit", "profits",
+        "approve", "approves", "approved", "launch", "launches", "expand", "expands", "strong", "stronger",
+        "improve", "improves", "improved", "success", "successful", "benefit", "benefits", "easier",
+        "upgrade", "upgraded", "invest", "investment", "breakthrough", "welcome", "welcomes", "recovery",
+    ), 1.0),
+    **dict.fromkeys((
+        "fall", "falls", "fell", "slip", "slips", "slipped", "decline", "declines", "loss", "losses",
+        "cut", "cuts", "crisis", "sanction", "sanctions", "warning", "warns", "delay", "delays", "probe",
+        "antitrust", "fine", "fined", "ban", "bans", "banned", "protest", "protests", "death", "dead",
+        "killed", "attack", "fraud", "lawsuit", "lowest", "drop", "drops", "plunge", "plunges", "concern",
+        "concerns", "slump", "weak", "weaker", "downgrade", "downgraded", "strike", "crash", "shortage",
+    ), -1.0),
+}
+
+
+class TriageResult(NamedTuple):
+    quality: float
+    sentiment: str
+    confidence: float
+    verdict: str
+
+
+def _clean(text: str) -> str:
+    return _TRUNCATION_MARKER.sub("", text).strip()
+
+def score(text: str) -> Dict:
+    """
+    Quality and lexicon sentiment for one text.
+
+    Quality is the share of word-like tokens, scaled down for snippets
+    shorter than MIN_WORDS and penalized per boilerplate phrase, in [0, 1].
+    Confidence combines how one-sided the lexicon hits are with how many
+    there are, so a single "rise" never reaches a high confidence.
+    """
+    cleaned = _clean(text)
+    tokens = cleaned.split()
+    words = _WORD.findall(cleaned)
+    if not tokens:
+        return {"quality": 0.0, "sentiment": "Neutral", "confidence": 0.0}
+
+    quality = len(words) / len(tokens) * min(1.0, len(words) / MIN_WORDS)
+    quality -= BOILERPLATE_PENALTY * len(_BOILERPLATE.findall(cleaned))
+
+    weights = [_LEXICON[w] for w in (word.lower() for word in words) if w in _LEXICON]
+    net = sum(weights)
+    if not weights or net == 0:
+        sentiment, confidence = "Neutral", 0.0
+    else:
+        sentiment = "Positive" if net > 0 else "Negative"
+        confidence = abs(net) / len(weights) * (1 - math.exp(-len(weights) / 3))
+
+    return {"quality": round(max(0.0, min(1.0, quality)), 3), "sentiment": sentiment, "confidence": round(confidence, 3)}
+
+
+class Triager:
+    """
+    CPU-only pre-classifier run between fetching and Gemini.
+
+    Drops boilerplate and near-empty stubs, and (when enabled) accepts a
+    confident local sentiment in place of a Gemini call. Pure Python regex
+    and dict lookups: tens of thousands of snippets per second.
+    """
+
+    def __init__(self, min_quality: float = DEFAULT_MIN_QUALITY, accept_confidence: float = DEFAULT_ACCEPT_CONFIDENCE):
+        self.min_quality = min_quality
+        self.accept_confidence = accept_confidence
+
+    @classmethod
+    def from_env(cls) -> "Triager":
+        return cls(
+            min_quality=config.env_float("TRIAGE_MIN_QUALITY", DEFAULT_MIN_QUALITY),
+            accept_confidence=config.env_float("TRIAGE_ACCEPT_CONFIDENCE", DEFAULT_ACCEPT_CONFIDENCE),
+        )
+
+    def classify(self, texts: List[str]) -> List[TriageResult]:
+        results = []
+        for text in texts:
+            scores = score(text)
+            if scores["quality"] < self.min_quality:
+                verdict = DROP
+            elif self.accept_confidence > 0 and scores["confidence"] >= self.accept_confidence:
+                verdict = ACCEPT
+            else:
+                verdict = ANALYZE
+            results.append(TriageResult(verdict=verdict, **scores))
+        return results
+
+    @staticmethod
+    def local_analysis(text: str, result: TriageResult) -> Optional[Dict]:
+        """
+        An analysis dict (NewsAnalysis shape) for an accepted article, or None otherwise.
+        """
+        if result.verdict != ACCEPT:
+            return None
+        cleaned = _clean(text)
+        gist = _SENTENCE_END.split(cleaned, maxsplit=1)[0]
+        return {
+            "gist": gist[:200],
+            "sentiment": result.sentiment,
+            "tone": "Unassessed (local triage)",
+            "confidence_score": result.confidence,
+        }
@@ -0,0 +1,135 @@
+import json
+import os
+import random
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import config
+import metrics
+
+# --- Configuration ---
+# Analyses below this Gemini confidence are always validated.
+DEFAULT_CONFIDENCE_THRESHOLD = 0.8
+# Share of confident analyses validated anyway, as an unbiased audit of what skipping misses.
+DEFAULT_SAMPLE_RATE = 0.1
+# Validation probability for sources missing from the risk table.
+DEFAULT_SOURCE_RISK = 0.0
+
+# --- Decisions ---
+LOW_CONFIDENCE = "low_confidence"
+SOURCE_RISK = "source_risk"
+AUDIT = "audit"
+SKIP = "skip"
+
+
+def load_source_risk(path: Path) -> Dict[str, float]:
+    """
+    Reads a JSON object of {source name: risk in [0, 1]}.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return {source: max(0.0, min(1.0, float(risk))) for source, risk in json.load(f).items()}
+
+
+class ValidationPolicy:
+    """
+    Decides which Gemini analyses are worth a Mistral call.
+
+    Every analysis below `confidence_threshold` is validated. A confident
+    one is validated with probability `sample_rate` (an audit sample) or,
+    failing that, by an independent draw against its source's risk score;
+    otherwise validation is skipped. A confident analysis is thus validated
+    with probability sample_rate + (1 - sample_rate) * risk. Audit samples
+    are drawn the same way for every source, so their flag rate estimates
+    how often the skipped analyses would have been flagged.
+
+    With an `escalation_model`, a flagged verdict is re-checked by that
+    (stronger) model, whose verdict is final.
+    """
+
+    def __init__(
+        self,
+        confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        source_risk: Optional[Dict[str, float]] = None,
+        default_risk: float = DEFAULT_SOURCE_RISK,
+        escalation_model: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
+        self.confidence_threshold = confidence_threshold
+        self.sample_rate = sample_rate
+        self.source_risk = source_risk or {}
+        self.default_risk = default_risk
+        self.escalation_model = escalation_model
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(
+            (LOW_CONFIDENCE, SOURCE_RISK, AUDIT, SKIP, "audit_verdicts", "audit_flagged", "escalated", "escalation_overturned"),
+            0,
+        )
+
+    @classmethod
+    def from_env(cls) -> "ValidationPolicy":
+        risk_file = os.getenv("VALIDATION_SOURCE_RISK_FILE")
+        return cls(
+            confidence_threshold=config.env_float("VALIDATION_CONFIDENCE_THRESHOLD", DEFAULT_CONFIDENCE_THRESHOLD),
+            sample_rate=config.env_float("VALIDATION_SAMPLE_RATE", DEFAULT_SAMPLE_RATE),
+            source_risk=load_source_risk(Path(risk_file)) if risk_file else None,
+            default_risk=config.env_float("VALIDATION_DEFAULT_RISK", DEFAULT_SOURCE_RISK),
+            escalation_model=os.getenv("VALIDATOR_ESCALATION_MODEL") or None,
+        )
+
+    def decide(self, article: Dict, analysis: Dict) -> str:
+        """
+        One of LOW_CONFIDENCE, AUDIT or SOURCE_RISK (validate) or SKIP.
+        """
+        if analysis.get("confidence_score", 0.0) < self.confidence_threshold:
+            decision = LOW_CONFIDENCE
+        else:
+            risk = self.source_risk.get(article.get("source"), self.default_risk)
+            # Separate draws: sharing one would make the validation rate max(sample_rate, risk)
+            with self._lock:
+                audit_roll, risk_roll = self._rng.random(), self._rng.random()
+            if audit_roll < self.sample_rate:
+                decision = AUDIT
+            elif risk_roll < risk:
+                decision = SOURCE_RISK
+            else:
+                decision = SKIP
+
+        self._count(decision)
+        return decision
+
+    def record(self, decision: str, is_valid: bool, escalated: bool = False, overturned: bool = False):
+        """
+        Folds in a finished validation made under `decision`; is_valid is the final verdict.
+        """
+        if decision == AUDIT:
+            self._count("audit_verdicts")
+            if not is_valid:
+                self._count("audit_flagged")
+        if escalated:
+            self._count("escalated")
+        if overturned:
+            self._count("escalation_overturned")
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+        metrics.incr(f"validation_policy.{name}")
+
+    def summary(self) -> Dict:
+        """
+        Decision counts plus the audit-based estimate of flags missed by skipping.
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        # Audits that timed out have no verdict and are left out of the rate
+        audited = counts["audit_verdicts"]
+        rate = counts["audit_flagged"] / audited if audited else None
+        return {
+            **counts,
+            "validated": counts[LOW_CONFIDENCE] + counts[SOURCE_RISK] + counts[AUDIT],
+            "skipped_disagreement_rate": rate,
+            "estimated_missed_flags": round(rate * counts[SKIP], 1) if rate is not None else None,
+        }
@@ -0,0 +1,474 @@
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+import config
+import llm_analyzer
+import llm_validator
+import metrics
+import news_fetcher
+from checkpoints import CheckpointStore, compute_high_water_mark
+from circuit_breaker import CircuitOpenError
+from dedup_index import DedupIndex
+from llm_cache import ResultCache
+from result_sink import JsonlSink, render_views
+from run_ledger import article_key
+
+# --- Configuration ---
+DEFAULT_QUEUE_PATH = Path("output") / "queue" / "work_queue.sqlite3"
+# A job whose lease lapses (worker died or hung) becomes claimable again.
+DEFAULT_LEASE_SECONDS = 60
+# Attempts before a job is parked as failed instead of retried.
+DEFAULT_MAX_ATTEMPTS = 3
+# Seconds an idle worker sleeps before polling for new work.
+POLL_INTERVAL = 1.0
+
+# --- Job kinds and states ---
+ANALYZE = "analyze"
+VALIDATE = "validate"
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class UnprocessableJob(Exception):
+    """
+    Raised for a job that can never succeed (e.g. text too short to
+    analyze), so it is failed at once instead of retried.
+    """
+
+
+class Job(NamedTuple):
+    id: int
+    kind: str
+    key: str
+    payload: Dict
+    attempts: int
+
+
+class WorkQueue:
+    """
+    Durable job queue in SQLite, shared by any number of worker processes.
+
+    Claims are leases: a worker owns a job until its lease expires, and
+    renews it with heartbeats while working. A dead worker's jobs are
+    reclaimed by others once the lease lapses; a late completion from the
+    former owner is rejected, so each job's result is written exactly once.
+    (key, kind) is unique, so re-enqueueing the same article is a no-op.
+
+    Workers on several hosts may share the file only on a filesystem with
+    working POSIX locks, and need roughly synchronized clocks for leases.
+    """
+
+    def __init__(self, path: Path = DEFAULT_QUEUE_PATH, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                result TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                UNIQUE (kind, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (kind, state, id)")
+
+    @contextmanager
+    def _transaction(self):
+        """
+        BEGIN IMMEDIATE takes the write lock up front, so two processes can
+        never both read a job as claimable and then both claim it.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    # --- Producers ---
+
+    def enqueue(self, kind: str, key: str, payload: Dict) -> bool:
+        """
+        Adds a pending job. Returns False if (kind, key) is already queued.
+        """
+        with self._lock, self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (kind, key, payload, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, key, json.dumps(payload, ensure_ascii=False), PENDING, time.time()),
+            )
+            return cursor.rowcount == 1
+
+    # --- Workers ---
+
+    def claim(self, worker_id: str, kinds: Sequence[str] = (ANALYZE, VALIDATE),
+              lease_seconds: float = DEFAULT_LEASE_SECONDS,
+              expired: Optional[List[Job]] = None) -> Optional[Job]:
+        """
+        Leases the oldest claimable job of the given kinds: pending, or
+        leased to a worker whose lease has expired. None if there is none.
+
+        A job whose lease lapsed on its final attempt is failed along the way
+        and appended to `expired`, so the caller can clean up after it.
+        """
+        now = time.time()
+        marks = ", ".join("?" for _ in kinds)
+        with self._lock, self._transaction() as conn:
+            while True:
+                row = conn.execute(
+                    f"SELECT id, kind, key, payload, attempts FROM jobs "
+                    f"WHERE kind IN ({marks}) AND (state = ? OR (state = ? AND lease_expires < ?)) "
+                    f"ORDER BY id LIMIT 1",
+                    (*kinds, PENDING, LEASED, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                job_id, kind, key, payload, attempts = row
+                if attempts < self.max_attempts:
+                    break
+                # Its last lease lapsed too: the job keeps killing or hanging workers
+                conn.execute(
+                    "UPDATE jobs SET state = ?, error = ?, lease_owner = NULL, updated_at = ? WHERE id = ?",
+                    (FAILED, "lease expired on final attempt", now, job_id),
+                )
+                if expired is not None:
+                    expired.append(Job(job_id, kind, key, json.loads(payload), attempts))
+
+            conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ?, updated_at = ? "
+                "WHERE id = ?",
+                (LEASED, worker_id, now + lease_seconds, now, job_id),
+            )
+        return Job(job_id, kind, key, json.loads(payload), attempts + 1)
+
+    def heartbeat(self, job: Job, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """
+        Extends the lease. False means the lease was lost to another worker.
+        """
+        now = time.time()
+        with self._lock, self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND state = ? AND lease_owner = ?",
+                (now + lease_seconds, now, job.id, LEASED, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job: Job, worker_id: str, result: Dict,
+                 follow_up: Optional[Tuple[str, str, Dict]] = None) -> bool:
+        """
+        Stores the result, and enqueues the follow-up (kind, key, payload) job
+        in the same transaction so a crash can never lose the next stage.
+        Rejected (False) if this worker no longer holds the lease.
+        """
+        now = time.time()
+        with self._lock, self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET state = ?, result = ?, error = NULL, lease_owner = NULL, updated_at = ? "
+                "WHERE id = ? AND state = ? AND lease_owner = ?",
+                (DONE, json.dumps(result, ensure_ascii=False), now, job.id, LEASED, worker_id),
+            )
+            if cursor.rowcount != 1:
+                return False
+            if follow_up is not None:
+                kind, key, payload = follow_up
+                conn.execute(
+                    "INSERT OR IGNORE INTO jobs (kind, key, payload, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (kind, key, json.dumps(payload, ensure_ascii=False), PENDING, now),
+                )
+            return True
+
+    def fail(self, job: Job, worker_id: str, error: str, retryable: bool = True) -> Optional[str]:
+        """
+        Returns the job to the queue, or parks it as failed after max_attempts
+        (or at once if it is not `retryable`). Returns the state it was left
+        in (PENDING or FAILED), or None if this worker no longer holds the lease.
+        """
+        state = FAILED if not retryable or job.attempts >= self.max_attempts else PENDING
+        with self._lock, self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, lease_owner = NULL, updated_at = ? "
+                "WHERE id = ? AND state = ? AND lease_owner = ?",
+                (state, error, time.time(), job.id, LEASED, worker_id),
+            )
+            return state if cursor.rowcount == 1 else None
+
+    def release(self, job: Job, worker_id: str, error: str) -> bool:
+        """
+        Returns the job to the queue without spending an attempt, for work
+        that was never tried (e.g. the provider's circuit breaker is open).
+        """
+        with self._lock, self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts - 1, error = ?, lease_owner = NULL, updated_at = ? "
+                "WHERE id = ? AND state = ? AND lease_owner = ?",
+                (PENDING, error, time.time(), job.id, LEASED, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    # --- Inspection ---
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT kind, state, COUNT(*) FROM jobs GROUP BY kind, state").fetchall()
+        stats: Dict[str, Dict[str, int]] = {}
+        for kind, state, count in rows:
+            stats.setdefault(kind, {})[state] = count
+        return stats
+
+    def entries(self) -> Iterator[Dict]:
+        """
+        Yields a pipeline entry for every fully processed article, in enqueue order.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT v.payload, v.result FROM jobs a JOIN jobs v ON v.kind = ? AND v.key = a.key "
+                "WHERE a.kind = ? AND v.state = ? ORDER BY a.id",
+                (VALIDATE, ANALYZE, DONE),
+            ).fetchall()
+        for payload, result in rows:
+            payload = json.loads(payload)
+            yield {
+                "article": payload["article"],
+                "analysis": payload["analysis"],
+                "validation": json.loads(result)["validation"],
+                "cluster_id": payload.get("cluster_id"),
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --- Modes ---
+
+def enqueue_topic(
+    queue: WorkQueue,
+    topic: str,
+    limit: int,
+    checkpoints: Optional[CheckpointStore] = None,
+    dedup: Optional[DedupIndex] = None,
+) -> int:
+    """
+    Fetches a topic and enqueues one analyze job per new article.
+
+    The queue is durable, so the topic checkpoint and dedup entries are
+    committed as soon as the articles are enqueued. Returns the number of jobs added.
+    """
+    since = checkpoints.get(topic) if checkpoints is not None else None
+    coverage = news_fetcher.FetchCoverage()
+    added = 0
+    enqueued = []
+    oldest = None
+    for article in news_fetcher.stream_articles(topic, limit, since=since, coverage=coverage):
+        if article.get("published_at") and (oldest is None or article["published_at"] < oldest):
+            oldest = article["published_at"]
+        cluster_id = None
+        if dedup is not None:
+            cluster_id, duplicate_kind = dedup.assign(article["url"], article["text"])
+            if duplicate_kind:
+                continue
+        if queue.enqueue(ANALYZE, article_key(article), {"article": article, "cluster_id": cluster_id}):
+            added += 1
+            enqueued.append(article)
+
+    if checkpoints is not None:
+        checkpoints.stage(topic, compute_high_water_mark(
+            enqueued, [], previous=since, exhausted=coverage.exhausted, oldest=oldest
+        ))
+        checkpoints.commit(topic)
+    if dedup is not None:
+        dedup.commit()
+    return added
+
+def _process(job: Job, cache: Optional[ResultCache]) -> Tuple[Optional[Dict], Optional[Tuple[str, str, Dict]]]:
+    """
+    Runs one job. Returns (result, follow_up), or (None, None) if it should
+    be retried; raises UnprocessableJob if retrying cannot help.
+    """
+    article = job.payload["article"]
+    if job.kind == ANALYZE:
+        with metrics.span("stage.analyze"):
+            analysis_model = llm_analyzer.analyze_article(article["text"], cache=cache)
+        if not analysis_model:
+            if len(article["text"] or "") < llm_analyzer.MIN_TEXT_CHARS:
+                # Skipped by the analyzer's guard clause: the same on every attempt
+                raise UnprocessableJob(f"text too short ({len(article['text'] or '')} chars)")
+            return None, None
+        analysis = analysis_model.model_dump()
+        return {"analysis": analysis}, (VALIDATE, job.key, {**job.payload, "analysis": analysis})
+
+    with metrics.span("stage.validate"):
+        validation_model = llm_validator.validate_analysis(article["text"], job.payload["analysis"], cache=cache)
+    # A skipped validation still finishes the article, as in the in-process pipeline
+    return {"validation": validation_model.model_dump() if validation_model else None}, None
+
+def run_worker(
+    queue: WorkQueue,
+    worker_id: Optional[str] = None,
+    kinds: Sequence[str] = (ANALYZE, VALIDATE),
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    cache: Optional[ResultCache] = None,
+    exit_when_idle: bool = False,
+    dedup: Optional[DedupIndex] = None,
+) -> int:
+    """
+    Claims and processes jobs until stopped (or until the queue is drained,
+    with `exit_when_idle`). A background thread renews the lease every
+    third of `lease_seconds` while a job runs. Returns jobs completed.
+
+    When a job is failed for good, its article's cluster is discarded from
+    `dedup`, so a later enqueue can pick the story up again.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    completed = 0
+
+    while True:
+        expired: List[Job] = []
+        job = queue.claim(worker_id, kinds, lease_seconds, expired=expired)
+        for lapsed in expired:
+            metrics.incr(f"queue.{lapsed.kind}_failed")
+            title_snippet = lapsed.payload["article"]["title"][:50] + "..."
+            print(f"[job {lapsed.id}] {title_snippet} | {lapsed.kind}: FAILED (lease expired on attempt {lapsed.attempts})")
+            cluster_id = lapsed.payload.get("cluster_id")
+            if dedup is not None and cluster_id is not None:
+                dedup.discard(cluster_id)
+        if job is None:
+            if exit_when_idle:
+                return completed
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(lease_seconds / 3):
+                if not queue.heartbeat(job, worker_id, lease_seconds):
+                    print(f"   Lease lost on job {job.id}; its result will be discarded.")
+                    return
+
+        heartbeat = threading.Thread(target=beat, name=f"heartbeat-{job.id}", daemon=True)
+        heartbeat.start()
+        parked = None
+        retryable = True
+        try:
+            result, follow_up = _process(job, cache)
+        except CircuitOpenError as e:
+            result, follow_up, parked = None, None, e
+        except UnprocessableJob as e:
+            result, follow_up, retryable = None, None, False
+            error = f"{job.kind} skipped: {e}"
+        except Exception as e:
+            result, follow_up = None, None
+            error = f"{job.kind} error: {e}"
+        else:
+            error = f"{job.kind} returned no result"
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        title_snippet = job.payload["article"]["title"][:50] + "..."
+        if parked is not None:
+            # Nothing was sent: hand the job back and wait out the breaker
+            queue.release(job, worker_id, str(parked))
+            metrics.incr(f"queue.{job.kind}_parked")
+            print(f"[job {job.id}] {title_snippet} | {job.kind}: PARKED ({parked})")
+            time.sleep(max(parked.retry_after, POLL_INTERVAL))
+        elif result is None:
+            state = queue.fail(job, worker_id, error, retryable=retryable)
+            metrics.incr(f"queue.{job.kind}_failed")
+            print(f"[job {job.id}] {title_snippet} | {job.kind}: FAILED (attempt {job.attempts})")
+            cluster_id = job.payload.get("cluster_id")
+            if state == FAILED and dedup is not None and cluster_id is not None:
+                # Let a later enqueue pick this story up again
+                dedup.discard(cluster_id)
+        elif queue.complete(job, worker_id, result, follow_up):
+            completed += 1
+            metrics.incr(f"queue.{job.kind}_done")
+            print(f"[job {job.id}] {title_snippet} | {job.kind}: DONE")
+        else:
+            metrics.incr("queue.stale_completions")
+
+def export(queue: WorkQueue, output_dir: Path = Path("output")) -> Optional[Path]:
+    """
+    Writes every finished article to output/runs/queue.jsonl and renders the usual views.
+    """
+    stream_path = output_dir / "runs" / "queue.jsonl"
+    stream_path.unlink(missing_ok=True)
+    with JsonlSink.from_env(stream_path) as sink:
+        for entry in queue.entries():
+            sink.write(entry)
+    if sink.count == 0:
+        stream_path.unlink(missing_ok=True)
+        return None
+    render_views(stream_path, output_dir)
+    return stream_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Durable work queue for large backfills.")
+    parser.add_argument("--queue", type=Path, default=DEFAULT_QUEUE_PATH)
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    enqueue_parser = modes.add_parser("enqueue", help="Fetch a topic into the queue.")
+    enqueue_parser.add_argument("--topic", default='"Indian Government"')
+    enqueue_parser.add_argument("--limit", type=int, default=12)
+
+    worker_parser = modes.add_parser("worker", help="Process jobs; start as many as you like.")
+    worker_parser.add_argument("--id", help="Worker id (default host:pid:thread).")
+    worker_parser.add_argument("--kind", choices=(ANALYZE, VALIDATE), action="append", help="Only claim these job kinds.")
+    worker_parser.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS)
+    worker_parser.add_argument("--exit-when-idle", action="store_true")
+
+    modes.add_parser("export", help="Write finished articles to the output views.")
+    modes.add_parser("status", help="Show job counts by kind and state.")
+    args = parser.parse_args()
+
+    # Load environment variables
+    load_dotenv()
+    queue = WorkQueue(args.queue, max_attempts=config.env_int("QUEUE_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))
+
+    if args.mode == "enqueue":
+        added = enqueue_topic(queue, args.topic, args.limit, CheckpointStore(), DedupIndex())
+        print(f"📥 Enqueued {added} articles for '{args.topic}'.")
+    elif args.mode == "worker":
+        done = run_worker(
+            queue,
+            worker_id=args.id,
+            kinds=args.kind or (ANALYZE, VALIDATE),
+            lease_seconds=args.lease,
+            cache=ResultCache.from_env(),
+            exit_when_idle=args.exit_when_idle,
+            dedup=DedupIndex(),
+        )
+        print(f"🏁 Worker finished {done} jobs.")
+    elif args.mode == "export":
+        path = export(queue)
+        print(f"💾 Exported to: {path}" if path else "❌ Nothing finished yet.")
+    else:
+        print(json.dumps(queue.stats(), indent=2))